@@ -1,5 +1,8 @@
 from __future__ import annotations
 import collections
+import datetime
+import json
+import textwrap
 import typing
 from pathlib import Path
 
@@ -7,9 +10,23 @@ import click
 import toml
 from click import Context
 
-from qaspen_migrations.migrations.applyer import MigrationsApplyer
+from qaspen_migrations.migrations.applyer import (
+    MigrationPlanApplyer,
+    MigrationsApplyer,
+)
+from qaspen_migrations.migrations.checker import SchemaChecker
+from qaspen_migrations.migrations.fanout import (
+    MigrationsFanOut,
+    MigrationTarget,
+)
 from qaspen_migrations.migrations.maker import MigrationMaker
+from qaspen_migrations.migrations.plan import MigrationPlan
+from qaspen_migrations.migrations.previewer import MigrationsPreviewer
+from qaspen_migrations.migrations.progress import ProgressMonitor
+from qaspen_migrations.migrations.provisioner import DatabaseProvisioner
+from qaspen_migrations.migrations.verifier import MigrationsVerifier
 from qaspen_migrations.migrations.versioner import MigrationsVersioner
+from qaspen_migrations.migrations.watchdog import LockWatchdog
 from qaspen_migrations.settings import (
     QASPEN_MIGRATIONS_TOML_KEY,
     QaspenMigrationsSettings,
@@ -26,6 +43,20 @@ from qaspen_migrations.utils.loaders import (
 )
 
 
+if typing.TYPE_CHECKING:
+    from qaspen import BaseTable
+    from qaspen.abc.db_engine import BaseEngine
+
+    from qaspen_migrations.migrations.progress import StatementProgress
+    from qaspen_migrations.operations.base import BaseOperation
+    from qaspen_migrations.schema import ColumnInfo
+
+
+STATEMENT_PREVIEW_WIDTH: typing.Final = 60
+TEXT_DIFF_FORMAT: typing.Final = "text"
+JSON_DIFF_FORMAT: typing.Final = "json"
+
+
 @click.group()
 @click.option(
     "-c",
@@ -34,14 +65,23 @@ from qaspen_migrations.utils.loaders import (
     show_default=True,
     help="Config file.",
 )
+@click.option(
+    "--uvloop/--no-uvloop",
+    "use_uvloop",
+    default=None,
+    help="Run commands on uvloop if it's installed, overrides config value.",
+)
 @click.pass_context
-def cli(ctx: Context, config: str) -> None:
+def cli(ctx: Context, config: str, use_uvloop: bool | None) -> None:
     ctx.ensure_object(dict)
     config_path = Path(config)
     if ctx.invoked_subcommand == "init":
         ctx.obj["config_path"] = config_path
     else:
         ctx.obj["config"] = load_config(config_path)
+        ctx.obj["use_uvloop"] = (
+            ctx.obj["config"].use_uvloop if use_uvloop is None else use_uvloop
+        )
 
 
 @cli.command(help="Initialize config file and generate migrations directory.")
@@ -101,36 +141,499 @@ def init(
     click.secho(f"Successful wrote a config to {config_path}", fg="green")
 
 
+def confirm_column_rename(
+    table: type[BaseTable],
+    from_column_info: ColumnInfo,
+    to_column_info: ColumnInfo,
+) -> bool:
+    return click.confirm(
+        f"Was {table.schemed_original_table_name()}."
+        f"{from_column_info.db_column_name} renamed to "
+        f"{to_column_info.db_column_name}?",
+    )
+
+
+def echo_operation(operation: BaseOperation) -> None:
+    operation_call, _, operation_arguments = repr(operation).partition("\n")
+    click.echo(f"{operation_call}\n{textwrap.dedent(operation_arguments)}")
+
+
+def echo_operations_preview(operations: list[BaseOperation]) -> None:
+    previewed_at: typing.Final = datetime.datetime.now(
+        tz=datetime.UTC,
+    ).astimezone()
+    if not operations:
+        click.secho(
+            f"[{previewed_at:%H:%M:%S}] Tables match the latest migration.",
+            fg="green",
+        )
+        return
+
+    click.secho(
+        f"[{previewed_at:%H:%M:%S}] "
+        f"{len(operations)} operations to migrate:",
+        fg="yellow",
+    )
+    for operation in operations:
+        echo_operation(operation)
+
+
+def echo_preview_error(exception: Exception) -> None:
+    click.secho(f"{type(exception).__name__}: {exception}", fg="red")
+
+
 @cli.command(help="Make migrations for provided tables.")
+@click.option(
+    "--full-inspection",
+    is_flag=True,
+    default=False,
+    help="Inspect all tables, even ones unchanged since latest migration.",
+)
+@click.option(
+    "-i",
+    "--interactive",
+    is_flag=True,
+    default=False,
+    help="Ask whether dropped and added columns are actually renamed.",
+)
+@click.option(
+    "-w",
+    "--watch",
+    is_flag=True,
+    default=False,
+    help="Keep running and print pending operations whenever tables change.",
+)
 @click.pass_context
 @as_coroutine
-async def makemigrations(ctx: Context) -> None:
+async def makemigrations(
+    ctx: Context,
+    full_inspection: bool,
+    interactive: bool,
+    watch: bool,
+) -> None:
     migrations_config = ctx.obj["config"]
     assert isinstance(migrations_config, QaspenMigrationsSettings)
+    if watch and interactive:
+        raise click.UsageError(
+            "Renames can't be confirmed in watch mode, "
+            "use --interactive without --watch.",
+        )
+
+    engine: typing.Final = load_engine(migrations_config.engine_path)
+    tables_loader: typing.Final = TableLoader(
+        migrations_config.tables,
+        migrations_config.migrations_path,
+    )
+    migration_maker: typing.Final = MigrationMaker(
+        engine=engine,
+        migrations_path=migrations_config.migrations_path,
+        tables=tables_loader.load_tables(),
+        migrations_format=migrations_config.migrations_format,
+        use_fingerprints=not full_inspection,
+        rename_confirmer=confirm_column_rename if interactive else None,
+        database_state_cache={} if watch else None,
+    )
+    if not watch:
+        await migration_maker.make_migrations()
+        return
 
-    await MigrationMaker(
+    try:
+        await MigrationsPreviewer(migration_maker, tables_loader).watch(
+            echo_operations_preview,
+            echo_preview_error,
+        )
+    finally:
+        await engine.stop_connection_pool()
+
+
+@cli.command(help="Show changes next migration would contain.")
+@click.option(
+    "--format",
+    "diff_format",
+    type=click.Choice([TEXT_DIFF_FORMAT, JSON_DIFF_FORMAT]),
+    default=TEXT_DIFF_FORMAT,
+    show_default=True,
+    help="Output format, json prints one record per line.",
+)
+@click.option(
+    "--full-inspection",
+    is_flag=True,
+    default=False,
+    help="Inspect all tables, even ones unchanged since latest migration.",
+)
+@click.pass_context
+@as_coroutine
+async def diff(ctx: Context, diff_format: str, full_inspection: bool) -> None:
+    migrations_config = ctx.obj["config"]
+    assert isinstance(migrations_config, QaspenMigrationsSettings)
+
+    tables_diff_stream: typing.Final = MigrationMaker(
         engine=load_engine(migrations_config.engine_path),
         migrations_path=migrations_config.migrations_path,
-        tables=TableLoader(migrations_config.tables).load_tables(),
-    ).make_migrations()
+        tables=TableLoader(
+            migrations_config.tables,
+            migrations_config.migrations_path,
+        ).load_tables(),
+        use_fingerprints=not full_inspection,
+    ).stream_tables_diff()
+    # Records are printed as soon as every table is compared,
+    # nothing is accumulated and no migration is written.
+    async for table_diff, to_migrate, to_rollback in tables_diff_stream:
+        if diff_format == TEXT_DIFF_FORMAT:
+            click.secho(
+                f"Table {table_diff.table.schemed_original_table_name()}:",
+                fg="yellow",
+            )
+            for operation in to_migrate:
+                echo_operation(operation)
+            continue
 
+        click.echo(
+            json.dumps({"record": "table_diff", **table_diff.to_json_dict()}),
+        )
+        for operations_direction, operations in (
+            ("migrate", to_migrate),
+            ("rollback", to_rollback),
+        ):
+            for operation in operations:
+                click.echo(
+                    json.dumps(
+                        {
+                            "record": "operation",
+                            "direction": operations_direction,
+                            **operation.to_json_dict(),
+                        },
+                    ),
+                )
 
-@cli.command(help="Apply migrations.")
+
+@cli.command(help="Make a migration merging all migrations heads.")
 @click.pass_context
 @as_coroutine
-async def migrate(ctx: Context) -> None:
+async def merge(ctx: Context) -> None:
     migrations_config = ctx.obj["config"]
     assert isinstance(migrations_config, QaspenMigrationsSettings)
 
-    await MigrationsApplyer(
+    merge_migration_version: typing.Final = await MigrationMaker(
         engine=load_engine(migrations_config.engine_path),
-        migrations_versioner=MigrationsVersioner(
-            MigrationLoader(
-                load_engine(migrations_config.engine_path).engine_type,
+        migrations_path=migrations_config.migrations_path,
+        tables=[],
+        migrations_format=migrations_config.migrations_format,
+    ).make_merge_migration()
+    click.secho(
+        f"Successfully created merge migration {merge_migration_version}",
+        fg="green",
+    )
+
+
+@cli.command(help="Check that database schema matches provided tables.")
+@click.pass_context
+@as_coroutine
+async def check(ctx: Context) -> None:
+    migrations_config = ctx.obj["config"]
+    assert isinstance(migrations_config, QaspenMigrationsSettings)
+
+    mismatched_tables: typing.Final = await SchemaChecker(
+        engine=load_engine(migrations_config.engine_path),
+        tables=TableLoader(
+            migrations_config.tables,
+            migrations_config.migrations_path,
+        ).load_tables(),
+    ).find_mismatched_tables()
+
+    if not mismatched_tables:
+        click.secho("Database schema is up to date.", fg="green")
+        return
+
+    for mismatched_table in mismatched_tables:
+        click.secho(f"Table {mismatched_table} has changed.", fg="red")
+    ctx.exit(1)
+
+
+def echo_statement_progress(statement_progress: StatementProgress) -> None:
+    elapsed: typing.Final = datetime.timedelta(
+        seconds=int(statement_progress.elapsed.total_seconds()),
+    )
+    progress_parts: typing.Final = [
+        f"{statement_progress.migration_version}:",
+        textwrap.shorten(statement_progress.query, STATEMENT_PREVIEW_WIDTH),
+        f"[{statement_progress.phase or 'running'}]",
+        f"elapsed {elapsed}",
+    ]
+    done_fraction: typing.Final = statement_progress.done_fraction
+    if done_fraction is not None:
+        progress_parts.append(
+            f"{statement_progress.blocks_done}/"
+            f"{statement_progress.blocks_total} blocks "
+            f"({done_fraction:.1%})",
+        )
+    estimated_phase_finish: typing.Final = (
+        statement_progress.estimated_phase_finish
+    )
+    if estimated_phase_finish is not None:
+        progress_parts.append(
+            f"phase ETA {estimated_phase_finish.astimezone():%H:%M:%S}",
+        )
+
+    click.secho(" ".join(progress_parts), fg="yellow")
+
+
+async def migrate_targets(
+    target_engines: list[BaseEngine[typing.Any, typing.Any, typing.Any]],
+    table_schemas: tuple[str | None, ...],
+    migrations_versioner: MigrationsVersioner,
+    concurrency: int,
+    parallelism: int,
+) -> bool:
+    targets_results: typing.Final = await MigrationsFanOut(
+        targets=[
+            MigrationTarget(target_engine, table_schema)
+            for target_engine in target_engines
+            for table_schema in table_schemas
+        ],
+        migrations_versioner=migrations_versioner,
+        concurrency=concurrency,
+        parallelism=parallelism,
+    ).apply_changes()
+    for target_engine in target_engines:
+        await target_engine.stop_connection_pool()
+
+    for target_result in targets_results:
+        if target_result.is_failed:
+            click.secho(
+                f"{target_result.target.name}: failed with "
+                f"{target_result.error!r}",
+                fg="red",
+            )
+        else:
+            click.secho(
+                f"{target_result.target.name}: applied "
+                f"{len(target_result.applied_versions)} migrations",
+                fg="green",
+            )
+
+    return not any(
+        target_result.is_failed for target_result in targets_results
+    )
+
+
+@cli.command(help="Apply migrations.")
+@click.option(
+    "-s",
+    "--schema",
+    "schemas",
+    multiple=True,
+    help="Apply migrations to this schema, can be passed multiple times.",
+)
+@click.option(
+    "-d",
+    "--dsn",
+    "dsns",
+    multiple=True,
+    help="Apply migrations to this database, can be passed multiple times.",
+)
+@click.option(
+    "--concurrency",
+    default=10,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="How many schemas or databases are migrated at the same time.",
+)
+@click.option(
+    "--parallelism",
+    default=None,
+    type=click.IntRange(min=1),
+    help=(
+        "How many connections run non-transactional operations "
+        "at the same time, overrides config value."
+    ),
+)
+@click.option(
+    "--plan-out",
+    default=None,
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Save compiled pending migrations to a plan file instead.",
+)
+@click.option(
+    "--plan-in",
+    default=None,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Apply migrations from a plan file, migrations are not loaded.",
+)
+@click.option(
+    "--progress",
+    is_flag=True,
+    default=False,
+    help="Report phase and phase ETA of long-running statements.",
+)
+@click.option(
+    "--from-scratch",
+    is_flag=True,
+    default=False,
+    help=(
+        "Create empty database schema from tables directly "
+        "instead of replaying every migration."
+    ),
+)
+@click.option(
+    "--max-blocked-sessions",
+    default=None,
+    type=click.IntRange(min=0),
+    help="Cancel migration when it blocks more sessions than this.",
+)
+@click.option(
+    "--max-blocked-seconds",
+    default=None,
+    type=click.FloatRange(min=0),
+    help="Cancel migration when it blocks any session longer than this.",
+)
+@click.pass_context
+@as_coroutine
+async def migrate(
+    ctx: Context,
+    schemas: tuple[str, ...],
+    dsns: tuple[str, ...],
+    concurrency: int,
+    parallelism: int | None,
+    plan_out: Path | None,
+    plan_in: Path | None,
+    progress: bool,
+    from_scratch: bool,
+    max_blocked_sessions: int | None,
+    max_blocked_seconds: float | None,
+) -> None:
+    migrations_config = ctx.obj["config"]
+    assert isinstance(migrations_config, QaspenMigrationsSettings)
+    if parallelism is None:
+        parallelism = migrations_config.parallelism
+    is_lock_watched: typing.Final = (
+        max_blocked_sessions is not None or max_blocked_seconds is not None
+    )
+    is_single_target_only: typing.Final = any(
+        (plan_out, plan_in, progress, from_scratch, is_lock_watched),
+    )
+    if is_single_target_only and (schemas or dsns):
+        raise click.UsageError(
+            "Migration plans, progress, snapshots and blocked sessions "
+            "limits can't be used with --schema or --dsn.",
+        )
+    if plan_in and (plan_out or from_scratch):
+        raise click.UsageError(
+            "--plan-in can't be used with --plan-out or --from-scratch.",
+        )
+
+    engine: typing.Final = load_engine(migrations_config.engine_path)
+    progress_monitor: typing.Final = (
+        ProgressMonitor(
+            engine=engine,
+            progress_callback=echo_statement_progress,
+        )
+        if progress
+        else None
+    )
+    lock_watchdog: typing.Final = (
+        LockWatchdog(
+            engine=engine,
+            max_blocked_sessions=max_blocked_sessions,
+            max_blocked_seconds=max_blocked_seconds,
+        )
+        if is_lock_watched
+        else None
+    )
+    if plan_in is not None:
+        applied_versions: typing.Final = await MigrationPlanApplyer(
+            engine=engine,
+            migrations_loader=MigrationLoader(
+                engine.engine_type,
                 migrations_config.migrations_path,
             ),
+            parallelism=parallelism,
+            progress_monitor=progress_monitor,
+            lock_watchdog=lock_watchdog,
+        ).apply_plan(MigrationPlan.load(plan_in))
+        click.secho(
+            f"Applied {len(applied_versions)} migrations from {plan_in}",
+            fg="green",
+        )
+        return
+
+    migrations_versioner: typing.Final = MigrationsVersioner(
+        MigrationLoader(
+            engine.engine_type,
+            migrations_config.migrations_path,
         ),
-    ).apply_changes()
+    )
+    snapshot_tables: typing.Final = (
+        TableLoader(
+            migrations_config.tables,
+            migrations_config.migrations_path,
+        ).load_tables()
+        if from_scratch
+        else None
+    )
+    if plan_out is not None:
+        migration_plan: typing.Final = await MigrationsApplyer(
+            engine=engine,
+            migrations_versioner=migrations_versioner,
+        ).plan_changes(snapshot_tables)
+        migration_plan.save(plan_out)
+        click.secho(
+            f"Saved plan of {len(migration_plan.migrations)} migrations "
+            f"from version {migration_plan.from_version} "
+            f"to version {migration_plan.to_version} to {plan_out}",
+            fg="green",
+        )
+        return
+
+    if not schemas and not dsns:
+        await MigrationsApplyer(
+            engine=engine,
+            migrations_versioner=migrations_versioner,
+            parallelism=parallelism,
+            progress_monitor=progress_monitor,
+            lock_watchdog=lock_watchdog,
+        ).apply_changes(snapshot_tables)
+        return
+
+    if not await migrate_targets(
+        [type(engine)(connection_url=dsn) for dsn in dsns] or [engine],
+        schemas or (None,),
+        migrations_versioner,
+        concurrency,
+        parallelism,
+    ):
+        ctx.exit(1)
+
+
+@cli.command(help="Verify applied migrations were not changed locally.")
+@click.pass_context
+@as_coroutine
+async def verify(ctx: Context) -> None:
+    migrations_config = ctx.obj["config"]
+    assert isinstance(migrations_config, QaspenMigrationsSettings)
+
+    engine: typing.Final = load_engine(migrations_config.engine_path)
+    try:
+        migrations_drift: typing.Final = await MigrationsVerifier(
+            engine,
+            MigrationLoader(
+                engine.engine_type,
+                migrations_config.migrations_path,
+            ),
+        ).verify()
+    finally:
+        await engine.stop_connection_pool()
+
+    if not migrations_drift:
+        click.secho("Applied migrations match local files.", fg="green")
+        return
+
+    for migration_drift in migrations_drift:
+        click.secho(
+            f"Migration {migration_drift.version} is {migration_drift.drift}.",
+            fg="red",
+        )
+    ctx.exit(1)
 
 
 @cli.command(help="Rollback migrations to certain version.")
@@ -138,9 +641,124 @@ async def migrate(ctx: Context) -> None:
     "to-version",
     nargs=1,
 )
+@click.option(
+    "--parallelism",
+    default=None,
+    type=click.IntRange(min=1),
+    help=(
+        "How many connections run non-transactional operations "
+        "at the same time, overrides config value."
+    ),
+)
 @click.pass_context
-def rollback(ctx: Context) -> None:
+@as_coroutine
+async def rollback(
+    ctx: Context,
+    to_version: str,
+    parallelism: int | None,
+) -> None:
     migrations_config = ctx.obj["config"]
     assert isinstance(migrations_config, QaspenMigrationsSettings)
 
-    print("Rollback!")  # noqa: T201
+    engine: typing.Final = load_engine(migrations_config.engine_path)
+    migrations_applyer: typing.Final = MigrationsApplyer(
+        engine=engine,
+        migrations_versioner=MigrationsVersioner(
+            MigrationLoader(
+                engine.engine_type,
+                migrations_config.migrations_path,
+            ),
+        ),
+        parallelism=parallelism or migrations_config.parallelism,
+    )
+    migrations_to_rollback: typing.Final = (
+        await migrations_applyer.plan_rollback(to_version)
+    )
+    if not migrations_to_rollback:
+        click.secho(f"Database is already at version {to_version}.")
+        return
+
+    for migration_to_rollback in migrations_to_rollback:
+        click.secho(
+            f"Rollback {migration_to_rollback.version} "
+            f"created at {migration_to_rollback.created_datetime}",
+            fg="yellow",
+        )
+
+    await migrations_applyer.rollback_changes(
+        migrations_to_rollback,
+        to_version,
+    )
+    click.secho(
+        f"Rolled back {len(migrations_to_rollback)} migrations "
+        f"to version {to_version}.",
+        fg="green",
+    )
+
+
+@cli.command(help="Create test databases from a migrated template database.")
+@click.option(
+    "-w",
+    "--workers",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="How many worker databases to create.",
+)
+@click.option(
+    "--prefix",
+    default=None,
+    help="Worker databases names prefix, '<database>_test_' by default.",
+)
+@click.option(
+    "--check/--no-check",
+    "check_round_trip",
+    default=True,
+    show_default=True,
+    help=(
+        "Check migrate, rollback and migrate round trip on the template, "
+        "migrations are rolled back to the root one, "
+        "its own rollback is not checked."
+    ),
+)
+@click.pass_context
+@as_coroutine
+async def provision(
+    ctx: Context,
+    workers: int,
+    prefix: str | None,
+    check_round_trip: bool,
+) -> None:
+    migrations_config = ctx.obj["config"]
+    assert isinstance(migrations_config, QaspenMigrationsSettings)
+
+    engine: typing.Final = load_engine(migrations_config.engine_path)
+    database_provisioner: typing.Final = DatabaseProvisioner(
+        engine=engine,
+        migrations_versioner=MigrationsVersioner(
+            MigrationLoader(
+                engine.engine_type,
+                migrations_config.migrations_path,
+            ),
+        ),
+        parallelism=migrations_config.parallelism,
+    )
+    if await database_provisioner.provision_template(check_round_trip):
+        click.secho(
+            f"Migrated template {database_provisioner.template_name}.",
+            fg="green",
+        )
+    else:
+        click.secho(
+            f"Template {database_provisioner.template_name} is up to date.",
+        )
+
+    workers_names: typing.Final = [
+        f"{prefix or f'{engine.database}_test_'}{worker_number}"
+        for worker_number in range(1, workers + 1)
+    ]
+    await database_provisioner.create_workers(workers_names)
+    click.secho(
+        f"Created worker databases: {', '.join(workers_names)}.",
+        fg="green",
+    )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 import abc
 import dataclasses
+import enum
 import typing
 
 
@@ -10,42 +11,142 @@ if typing.TYPE_CHECKING:
     )
 
 
+TableDDLElementType = typing.TypeVar(
+    "TableDDLElementType",
+    bound="BaseTableDDLElement",
+)
+
+
+class TypeChangePathEnum(enum.StrEnum):
+    METADATA_ONLY = "metadata_only"
+    REWRITE = "rewrite"
+
+
+class CopyFormatEnum(enum.StrEnum):
+    CSV = "csv"
+    BINARY = "binary"
+
+
 class BaseDDLElement(abc.ABC):
     @abc.abstractmethod
     def to_database_expression(self) -> str:
         raise NotImplementedError
 
+    @property
+    def is_transactional(self) -> bool:
+        return True
+
+    @property
+    def dependency_key(self) -> str | None:
+        # Elements with the same key must keep their order,
+        # `None` means the element conflicts with every other one.
+        return None
+
+    def to_cleanup_expression(self) -> str | None:
+        # Removes leftovers of an interrupted non-transactional
+        # element, so it can be run once again from the start.
+        return None
+
+    def to_completion_check_expression(self) -> str | None:
+        # Query returning whether an interrupted non-transactional
+        # element has finished anyway, then it's not run again.
+        return None
+
 
 @dataclasses.dataclass(slots=True, frozen=True)
-class BaseCreateTableDDLElement(BaseDDLElement):
+class BaseTableDDLElement(BaseDDLElement):
     table_name_with_schema: str
+
+    @property
+    def dependency_key(self) -> str | None:
+        return self.table_name_with_schema
+
+    def with_table_schema(
+        self: TableDDLElementType,
+        table_schema: str,
+    ) -> TableDDLElementType:
+        table_name: typing.Final = self.table_name_with_schema.split(".")[-1]
+        return dataclasses.replace(
+            self,
+            table_name_with_schema=f"{table_schema}.{table_name}",
+        )
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class BaseCreateTableDDLElement(BaseTableDDLElement):
     to_add_columns: list[ColumnInfo]
 
 
 @dataclasses.dataclass(slots=True, frozen=True)
-class BaseDropTableDDLElement(BaseDDLElement):
-    table_name_with_schema: str
+class BaseDropTableDDLElement(BaseTableDDLElement):
+    pass
 
 
 @dataclasses.dataclass(slots=True, frozen=True)
-class BaseAlterColumnDDLElement(BaseDDLElement):
-    table_name_with_schema: str
+class BaseAlterColumnDDLElement(BaseTableDDLElement):
     from_column_info: ColumnInfo
     to_column_info: ColumnInfo
 
 
 @dataclasses.dataclass(slots=True, frozen=True)
-class BaseAddColumnDDLElement(BaseDDLElement):
-    table_name_with_schema: str
+class BaseAddColumnDDLElement(BaseTableDDLElement):
     column_info: ColumnInfo
 
 
 @dataclasses.dataclass(slots=True, frozen=True)
-class BaseDropColumnDDLElement(BaseDDLElement):
-    table_name_with_schema: str
+class BaseDropColumnDDLElement(BaseTableDDLElement):
     column_name: str
 
 
+@dataclasses.dataclass(slots=True, frozen=True)
+class BaseRenameColumnDDLElement(BaseTableDDLElement):
+    from_column_name: str
+    to_column_name: str
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class BaseCopyFromDDLElement(BaseTableDDLElement):
+    # Path to the data file, relative ones are
+    # resolved against the migration directory.
+    source_path: str
+    column_names: list[str]
+    source_format: CopyFormatEnum = CopyFormatEnum.CSV
+    # Drop table indexes before loading and build them
+    # once afterwards instead of updating them per row.
+    defer_indexes: bool = False
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class BaseIndexDDLElement(BaseTableDDLElement):
+    index_name: str
+
+    @property
+    def is_transactional(self) -> bool:
+        # Indexes are built and dropped concurrently,
+        # so writes to the table are not blocked meanwhile.
+        return False
+
+    @property
+    def index_name_with_schema(self) -> str:
+        table_schema: typing.Final = self.table_name_with_schema.rpartition(
+            ".",
+        )[0]
+        if not table_schema:
+            return self.index_name
+        return f"{table_schema}.{self.index_name}"
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class BaseCreateIndexDDLElement(BaseIndexDDLElement):
+    column_names: list[str]
+    is_unique: bool = False
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class BaseDropIndexDDLElement(BaseIndexDDLElement):
+    pass
+
+
 @dataclasses.dataclass(slots=True, frozen=True)
 class BaseColumnDDlElement(BaseDDLElement):
     column_info: ColumnInfo
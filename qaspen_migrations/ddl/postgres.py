@@ -1,12 +1,43 @@
+from __future__ import annotations
 import typing
 
+from qaspen import columns
+
 from qaspen_migrations.ddl.base import (
     BaseAddColumnDDLElement,
     BaseAlterColumnDDLElement,
     BaseColumnDDlElement,
+    BaseCopyFromDDLElement,
+    BaseCreateIndexDDLElement,
     BaseCreateTableDDLElement,
     BaseDropColumnDDLElement,
+    BaseDropIndexDDLElement,
     BaseDropTableDDLElement,
+    BaseRenameColumnDDLElement,
+    CopyFormatEnum,
+    TypeChangePathEnum,
+)
+
+
+COLUMN_TYPE_FIELDS: typing.Final = (
+    "main_column_type",
+    "inner_column_type",
+    "max_length",
+    "precision",
+    "scale",
+)
+# Types within a family are converted with assignment casts,
+# which reject values that don't fit instead of truncating them.
+TYPE_FAMILIES: typing.Final = (
+    frozenset((columns.VarCharColumn, columns.CharColumn, columns.TextColumn)),
+    frozenset((columns.NumericColumn, columns.DecimalColumn)),
+    frozenset(
+        (columns.SmallIntColumn, columns.IntegerColumn, columns.BigIntColumn),
+    ),
+    frozenset((columns.RealColumn, columns.DoublePrecisionColumn)),
+)
+NUMERIC_COLUMN_TYPES: typing.Final = frozenset(
+    (columns.NumericColumn, columns.DecimalColumn),
 )
 
 
@@ -51,14 +82,96 @@ class AlterColumn(BaseAlterColumnDDLElement):
         )
 
     def __generate_alter_data_type(self) -> str:
-        return (
+        alter_data_type: typing.Final = (
             f"ALTER COLUMN {self.to_column_info.db_column_name} "
             f"TYPE {Column(self.to_column_info).full_sql_type}"
         )
+        if (
+            self.type_change_path == TypeChangePathEnum.METADATA_ONLY
+            or self.is_type_family_kept
+        ):
+            return alter_data_type
+
+        return (
+            f"{alter_data_type} "
+            f"USING {self.to_column_info.db_column_name}"
+            f"::{Column(self.to_column_info).full_sql_type}"
+        )
+
+    @property
+    def is_type_changed(self) -> bool:
+        return any(
+            getattr(self.from_column_info, type_field_name)
+            != getattr(self.to_column_info, type_field_name)
+            for type_field_name in COLUMN_TYPE_FIELDS
+        )
+
+    @property
+    def is_type_family_kept(self) -> bool:
+        if self.from_column_info.is_array != self.to_column_info.is_array:
+            return False
+
+        from_column_type: typing.Final = (
+            self.from_column_info.inner_column_type
+            or self.from_column_info.main_column_type
+        )
+        to_column_type: typing.Final = (
+            self.to_column_info.inner_column_type
+            or self.to_column_info.main_column_type
+        )
+        return any(
+            from_column_type in type_family and to_column_type in type_family
+            for type_family in TYPE_FAMILIES
+        )
+
+    @property
+    def type_change_path(self) -> TypeChangePathEnum | None:
+        if not self.is_type_changed:
+            return None
+
+        from_column_info: typing.Final = self.from_column_info
+        to_column_info: typing.Final = self.to_column_info
+        if from_column_info.is_array or to_column_info.is_array:
+            return TypeChangePathEnum.REWRITE
+
+        type_change: typing.Final = (
+            from_column_info.main_column_type,
+            to_column_info.main_column_type,
+        )
+        is_metadata_only: bool
+        if type_change == (columns.VarCharColumn, columns.VarCharColumn):
+            is_metadata_only = to_column_info.max_length is None or (
+                from_column_info.max_length is not None
+                and to_column_info.max_length >= from_column_info.max_length
+            )
+        elif set(type_change) <= NUMERIC_COLUMN_TYPES:
+            is_metadata_only = to_column_info.precision is None or (
+                from_column_info.precision is not None
+                and to_column_info.scale == from_column_info.scale
+                and to_column_info.precision >= from_column_info.precision
+            )
+        elif type_change == (columns.TextColumn, columns.VarCharColumn):
+            is_metadata_only = to_column_info.max_length is None
+        else:
+            is_metadata_only = type_change == (
+                columns.VarCharColumn,
+                columns.TextColumn,
+            )
+
+        return (
+            TypeChangePathEnum.METADATA_ONLY
+            if is_metadata_only
+            else TypeChangePathEnum.REWRITE
+        )
 
     def to_database_expression(self) -> str:
         alter_statements: typing.Final = []
 
+        # Type is changed first, so new default
+        # is checked against the new type.
+        if self.is_type_changed:
+            alter_statements.append(self.__generate_alter_data_type())
+
         if (
             self.to_column_info.database_default
             != self.from_column_info.database_default
@@ -68,16 +181,15 @@ class AlterColumn(BaseAlterColumnDDLElement):
         if self.to_column_info.is_null != self.from_column_info.is_null:
             alter_statements.append(self.__generate_alter_is_null())
 
-        if (
-            self.to_column_info.main_column_type
-            != self.from_column_info.main_column_type
-            or self.to_column_info.inner_column_type
-            != self.from_column_info.inner_column_type
-        ):
-            alter_statements.append(self.__generate_alter_data_type())
+        type_change_comment: typing.Final = (
+            f"-- type change path: {self.type_change_path}\n"
+            if self.type_change_path is not None
+            else ""
+        )
         return (
+            f"{type_change_comment}"
             f"ALTER TABLE {self.table_name_with_schema}\n"
-            f"{' '.join(alter_statements)}"
+            f"{', '.join(alter_statements)};"
         )
 
 
@@ -92,11 +204,66 @@ class AddColumn(BaseAddColumnDDLElement):
 class DropColumn(BaseDropColumnDDLElement):
     def to_database_expression(self) -> str:
         return (
-            f"ALTER TABLE {self.table_name_with_schema}"
+            f"ALTER TABLE {self.table_name_with_schema} "
             f"DROP COLUMN {self.column_name};"
         )
 
 
+class RenameColumn(BaseRenameColumnDDLElement):
+    def to_database_expression(self) -> str:
+        return (
+            f"ALTER TABLE {self.table_name_with_schema} "
+            f"RENAME COLUMN {self.from_column_name} TO {self.to_column_name};"
+        )
+
+
+class CopyFrom(BaseCopyFromDDLElement):
+    def to_database_expression(self) -> str:
+        copy_options: typing.Final = [f"FORMAT {self.source_format}"]
+        # CSV files are expected to start with a header row.
+        if self.source_format == CopyFormatEnum.CSV:
+            copy_options.append("HEADER true")
+
+        return (
+            f"COPY {self.table_name_with_schema} "
+            f"({', '.join(self.column_names)}) "
+            f"FROM STDIN WITH ({', '.join(copy_options)});"
+        )
+
+
+class CreateIndex(BaseCreateIndexDDLElement):
+    def to_database_expression(self) -> str:
+        unique_expression: typing.Final = "UNIQUE " if self.is_unique else ""
+        return (
+            f"CREATE {unique_expression}INDEX CONCURRENTLY IF NOT EXISTS "
+            f"{self.index_name} ON {self.table_name_with_schema} "
+            f"({', '.join(self.column_names)});"
+        )
+
+    def to_cleanup_expression(self) -> str | None:
+        # Failed concurrent build leaves an invalid index behind,
+        # `IF NOT EXISTS` would silently keep it otherwise.
+        return (
+            "DROP INDEX CONCURRENTLY IF EXISTS "
+            f"{self.index_name_with_schema};"
+        )
+
+    def to_completion_check_expression(self) -> str | None:
+        # Only a finished concurrent build marks the index valid.
+        return (
+            "SELECT EXISTS (SELECT 1 FROM pg_index WHERE indexrelid = "
+            f"to_regclass('{self.index_name_with_schema}') AND indisvalid);"
+        )
+
+
+class DropIndex(BaseDropIndexDDLElement):
+    def to_database_expression(self) -> str:
+        return (
+            "DROP INDEX CONCURRENTLY IF EXISTS "
+            f"{self.index_name_with_schema};"
+        )
+
+
 class Column(BaseColumnDDlElement):
     @property
     def column_name(self) -> str:
@@ -136,12 +303,12 @@ class Column(BaseColumnDDlElement):
         if self.column_info.max_length is not None:
             resulting_args.append(str(self.column_info.max_length))
 
-        if self.column_info.scale is not None:
-            resulting_args.append(str(self.column_info.scale))
-
         if self.column_info.precision is not None:
             resulting_args.append(str(self.column_info.precision))
 
+        if self.column_info.scale is not None:
+            resulting_args.append(str(self.column_info.scale))
+
         return f"({', '.join(resulting_args)})" if resulting_args else ""
 
     def to_database_expression(self) -> str:
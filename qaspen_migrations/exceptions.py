@@ -20,3 +20,7 @@ class MigrationCorruptionError(QaspenMigrationError):
 
 class MigrationVersionError(QaspenMigrationError):
     """Raises when current migration version is inconsistent."""
+
+
+class MigrationLockError(QaspenMigrationError):
+    """Raises when migration is cancelled for blocking other queries."""
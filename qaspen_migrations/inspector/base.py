@@ -1,6 +1,7 @@
 from __future__ import annotations
 import abc
 import dataclasses
+import hashlib
 import typing
 
 from qaspen.abc.db_engine import BaseEngine
@@ -27,6 +28,8 @@ class BaseInspector(
 ):
     engine: Engine
     tables: list[type[BaseTable]]
+    # Long running processes reuse the pool between inspections.
+    keep_connection_pool: bool = False
     inspect_info_query: str = dataclasses.field(init=False)
 
     @abc.abstractmethod
@@ -37,27 +40,53 @@ class BaseInspector(
         raise NotImplementedError
 
     @abc.abstractmethod
-    def build_inspect_info_query(self, table: type[BaseTable]) -> str:
+    def build_inspect_info_query(self) -> str:
         raise NotImplementedError
 
-    async def inspect_database(
+    @abc.abstractmethod
+    def iter_tables_columns(
         self,
-    ) -> list[TableDump]:
-        database_dump: typing.Final = []
-        for table in self.tables:
-            table_dump = TableDump(table=table)
-            inspect_result = await self.engine.execute(
-                self.build_inspect_info_query(table),
-                [],
-            )
+    ) -> typing.AsyncIterator[tuple[int, dict[str, typing.Any] | None]]:
+        # Yields position of a table in `tables` along with each of its
+        # columns, or with `None` if it has none, grouped by tables.
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def column_info_to_fingerprint_row(self, column_info: ColumnInfo) -> str:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def build_fingerprint_query(self) -> str:
+        raise NotImplementedError
 
-            for database_column_info in inspect_result:
+    async def iter_database_state(self) -> typing.AsyncIterator[TableDump]:
+        # Every table is yielded as soon as all its columns are read,
+        # in the same order as `tables`, including absent ones.
+        table_dump: TableDump | None = None
+        dumped_table_position: int | None = None
+        async for table_position, column_row in self.iter_tables_columns():
+            if table_position != dumped_table_position:
+                if table_dump is not None:
+                    yield table_dump
+                table_dump = TableDump(table=self.tables[table_position])
+                dumped_table_position = table_position
+
+            if column_row is not None and table_dump is not None:
                 table_dump.add_column_info(
-                    self.database_column_to_column_info(database_column_info),
+                    self.database_column_to_column_info(column_row),
                 )
-            database_dump.append(table_dump)
 
-        await self.engine.stop_connection_pool()
+        if table_dump is not None:
+            yield table_dump
+
+    async def inspect_database(
+        self,
+    ) -> list[TableDump]:
+        database_dump: typing.Final = [
+            table_dump async for table_dump in self.iter_database_state()
+        ]
+        if not self.keep_connection_pool:
+            await self.engine.stop_connection_pool()
         return database_dump
 
     def inspect_local_state(
@@ -74,3 +103,33 @@ class BaseInspector(
             database_dump.append(table_dump)
 
         return database_dump
+
+    def fingerprint_local_state(self) -> dict[str, str]:
+        tables_fingerprints: typing.Final = {}
+        for table_dump in self.inspect_local_state():
+            fingerprint_rows = "\n".join(
+                self.column_info_to_fingerprint_row(column_info)
+                for column_info in sorted(
+                    table_dump.table_columns,
+                    key=lambda column_info: column_info.db_column_name,
+                )
+            )
+            tables_fingerprints[
+                table_dump.table.schemed_original_table_name()
+            ] = hashlib.md5(
+                fingerprint_rows.encode(),
+                usedforsecurity=False,
+            ).hexdigest()
+
+        return tables_fingerprints
+
+    async def fingerprint_database(self) -> dict[str, str]:
+        fingerprint_result: typing.Final = await self.engine.execute(
+            self.build_fingerprint_query(),
+            [],
+        )
+        await self.engine.stop_connection_pool()
+        return {
+            table_fingerprint["table_name"]: table_fingerprint["fingerprint"]
+            for table_fingerprint in fingerprint_result
+        }
@@ -3,7 +3,10 @@ import typing
 
 from qaspen_migrations.exceptions import ConfigurationError
 from qaspen_migrations.inspector.base import BaseInspector
-from qaspen_migrations.inspector.postgres import PostgresInspector
+from qaspen_migrations.inspector.postgres import (
+    AsyncpgPostgresInspector,
+    PostgresInspector,
+)
 
 
 if typing.TYPE_CHECKING:
@@ -17,15 +20,21 @@ INSPECTOR_ENGINE_MAPPING: typing.Final[
     dict[str, type[BaseInspector[typing.Any]]]
 ] = {
     "PSQLPsycopg": PostgresInspector,
+    "PSQLAsyncpg": AsyncpgPostgresInspector,
 }
 
 
 def map_inspector(
     engine: BaseEngine[typing.Any, typing.Any, typing.Any],
     tables: list[type[BaseTable]],
+    keep_connection_pool: bool = False,
 ) -> BaseInspector[BaseEngine[typing.Any, typing.Any, typing.Any]]:
     try:
-        return INSPECTOR_ENGINE_MAPPING[engine.engine_type](engine, tables)
+        return INSPECTOR_ENGINE_MAPPING[engine.engine_type](
+            engine,
+            tables,
+            keep_connection_pool,
+        )
     except LookupError as exc:
         raise ConfigurationError(
             f"Invalid engine type {engine.engine_type}\n"
@@ -1,18 +1,26 @@
 from __future__ import annotations
 import typing
 
+from psycopg.rows import dict_row
 from qaspen import columns
+from qaspen.abc.db_engine import BaseEngine
 from qaspen.columns.base import Column
 from qaspen_psycopg.engine import PsycopgEngine
 
 from qaspen_migrations.exceptions import ColumnParsingError
-from qaspen_migrations.inspector.base import BaseInspector
+from qaspen_migrations.inspector.base import BaseInspector, Engine
 from qaspen_migrations.schema import ColumnInfo
-from qaspen_migrations.types_mapping import POSTGRES_TYPE_MAPPING
+from qaspen_migrations.settings import INSPECT_FETCH_SIZE
+from qaspen_migrations.types_mapping import (
+    POSTGRES_REVERSE_TYPE_MAPPING,
+    POSTGRES_SERIAL_TYPE_MAPPING,
+    POSTGRES_TYPE_MAPPING,
+)
 
 
-if typing.TYPE_CHECKING:
-    from qaspen import BaseTable
+# Sequence names depend on table and schema names, so every
+# sequence default is rendered the same way in fingerprints.
+SEQUENCE_DEFAULT_FINGERPRINT: typing.Final = "nextval"
 
 
 def _parse_numeric_attributes(
@@ -29,12 +37,15 @@ def _parse_numeric_attributes(
         return None
 
 
-class PostgresInspector(
-    BaseInspector[PsycopgEngine],
+class BasePostgresInspector(
+    BaseInspector[Engine],
 ):
     # TODO: implement scale and precision fetching for decimal/numeric array types  # noqa: TD002, E501
+    # Requested tables are joined with their columns, so tables
+    # absent from database are returned too, as a row without a column.
     inspect_info_query = """
         SELECT
+            requested_table.table_position,
             ic.column_name as db_column_name,
             ic.udt_name AS sql_type,
             ic.is_nullable AS is_null,
@@ -46,6 +57,77 @@ class PostgresInspector(
                     AND att.atttypmod > 0 THEN att.atttypmod - 4
                 ELSE ic.character_maximum_length
             END AS max_length
+        FROM
+            {requested_tables} AS requested_table(
+                table_position,
+                table_schema,
+                table_name
+            )
+        LEFT JOIN (
+            information_schema.columns ic
+            JOIN
+                pg_catalog.pg_namespace nsp ON nsp.nspname = ic.table_schema
+            JOIN
+                pg_catalog.pg_class cls ON cls.relname = ic.table_name
+                    AND cls.relnamespace = nsp.oid
+            JOIN
+                pg_catalog.pg_attribute att ON att.attrelid = cls.oid
+                    AND att.attname = ic.column_name
+                    AND att.attnum > 0
+                    AND NOT att.attisdropped
+        ) ON
+            ic.table_catalog = {table_catalog}
+            AND ic.table_schema = requested_table.table_schema
+            AND ic.table_name = requested_table.table_name
+        ORDER BY
+            requested_table.table_position;
+    """
+
+    # Every column is rendered the same way as
+    # `column_info_to_fingerprint_row` renders `ColumnInfo`,
+    # so hashes match only if inspection would find no difference.
+    fingerprint_query = """
+        SELECT
+            ic.table_schema || '.' || ic.table_name AS table_name,
+            md5(
+                string_agg(
+                    concat_ws(
+                        '|',
+                        ic.column_name,
+                        ic.udt_name,
+                        CASE WHEN ic.is_nullable = 'YES' THEN 't' ELSE 'f' END,
+                        CASE
+                            WHEN left(ic.column_default, 8) = 'nextval('
+                                THEN '{sequence_default}'
+                            ELSE coalesce(ic.column_default, '')
+                        END,
+                        coalesce(
+                            CASE
+                                WHEN att.atttypid = ANY (ARRAY[1002, 1015])
+                                    AND att.atttypmod > 0
+                                    THEN att.atttypmod - 4
+                                ELSE ic.character_maximum_length
+                            END::text,
+                            ''
+                        ),
+                        coalesce(
+                            CASE
+                                WHEN trim('_' FROM ic.udt_name) = 'numeric'
+                                    THEN ic.numeric_precision
+                            END::text,
+                            ''
+                        ),
+                        coalesce(
+                            CASE
+                                WHEN trim('_' FROM ic.udt_name) = 'numeric'
+                                    THEN ic.numeric_scale
+                            END::text,
+                            ''
+                        )
+                    ),
+                    E'\\n' ORDER BY ic.column_name COLLATE "C"
+                )
+            ) AS fingerprint
         FROM
             information_schema.columns ic
         JOIN
@@ -57,18 +139,55 @@ class PostgresInspector(
             pg_catalog.pg_attribute att ON att.attrelid = cls.oid
                 AND att.attname = ic.column_name
         WHERE
-            ic.table_catalog = '{}'
-            AND ic.table_name = '{}'
-            AND ic.table_schema = '{}'
+            ic.table_catalog = '{table_catalog}'
+            AND (ic.table_schema, ic.table_name) IN ({requested_tables})
             AND att.attnum > 0
-            AND NOT att.attisdropped;
+            AND NOT att.attisdropped
+        GROUP BY
+            ic.table_schema, ic.table_name;
     """
 
-    def build_inspect_info_query(self, table: type[BaseTable]) -> str:
-        return self.inspect_info_query.format(
-            self.engine.database,
-            table.original_table_name(),
-            table._table_meta.table_schema,
+    def build_fingerprint_query(self) -> str:
+        return self.fingerprint_query.format(
+            sequence_default=SEQUENCE_DEFAULT_FINGERPRINT,
+            table_catalog=self.engine.database,
+            requested_tables=", ".join(
+                f"('{table._table_meta.table_schema}', "
+                f"'{table.original_table_name()}')"
+                for table in self.tables
+            ),
+        )
+
+    def column_info_to_fingerprint_row(self, column_info: ColumnInfo) -> str:
+        column_type: typing.Final = (
+            column_info.inner_column_type or column_info.main_column_type
+        )
+        # Columns without sql type mapping are never equal to
+        # inspected ones, so such table is reported as mismatched.
+        sql_type: typing.Final = POSTGRES_REVERSE_TYPE_MAPPING.get(
+            column_type,
+            column_type.__name__,
+        )
+        return "|".join(
+            [
+                column_info.db_column_name,
+                f"_{sql_type}" if column_info.is_array else sql_type,
+                "t" if column_info.is_null else "f",
+                (
+                    SEQUENCE_DEFAULT_FINGERPRINT
+                    if column_type in POSTGRES_SERIAL_TYPE_MAPPING
+                    and column_info.database_default is None
+                    else column_info.database_default or ""
+                ),
+                *(
+                    str(attribute_value) if attribute_value is not None else ""
+                    for attribute_value in (
+                        column_info.max_length,
+                        column_info.precision,
+                        column_info.scale,
+                    )
+                ),
+            ],
         )
 
     def database_column_to_column_info(
@@ -118,3 +237,93 @@ class PostgresInspector(
             scale=scale,
             precision=precision,
         )
+
+
+class PostgresInspector(BasePostgresInspector[PsycopgEngine]):
+    def build_inspect_info_query(self) -> str:
+        return self.inspect_info_query.format(
+            requested_tables="(VALUES {})".format(
+                ", ".join(
+                    f"({table_position}, "
+                    f"'{table._table_meta.table_schema}', "
+                    f"'{table.original_table_name()}')"
+                    for table_position, table in enumerate(self.tables)
+                ),
+            ),
+            table_catalog=f"'{self.engine.database}'",
+        )
+
+    async def iter_tables_columns(
+        self,
+    ) -> typing.AsyncIterator[tuple[int, dict[str, typing.Any] | None]]:
+        if not self.tables:
+            return
+
+        # Server-side cursor keeps only a batch of
+        # catalog rows in memory, not all of them.
+        connection_pool: typing.Final = await self.engine.connection_pool
+        async with connection_pool.connection() as connection:
+            inspect_cursor = connection.cursor(
+                name="qaspen_migrations_inspect",
+                row_factory=dict_row,
+            )
+            inspect_cursor.itersize = INSPECT_FETCH_SIZE
+            async with inspect_cursor:
+                await inspect_cursor.execute(self.build_inspect_info_query())
+                async for column_row in inspect_cursor:
+                    yield (
+                        column_row["table_position"],
+                        column_row if column_row["db_column_name"] else None,
+                    )
+
+
+class AsyncpgPostgresInspector(
+    BasePostgresInspector[BaseEngine[typing.Any, typing.Any, typing.Any]],
+):
+    # Query text doesn't depend on inspected tables, so its prepared
+    # statement is cached and reused by every inspection on a connection.
+    def build_inspect_info_query(self) -> str:
+        return self.inspect_info_query.format(
+            requested_tables="unnest($1::integer[], $2::text[], $3::text[])",
+            table_catalog="current_database()",
+        )
+
+    def build_inspect_info_parameters(
+        self,
+    ) -> tuple[list[int], list[str], list[str]]:
+        # Arrays unnested into `table_position`,
+        # `table_schema` and `table_name` columns.
+        return (
+            list(range(len(self.tables))),
+            [table._table_meta.table_schema for table in self.tables],
+            [table.original_table_name() for table in self.tables],
+        )
+
+    async def iter_tables_columns(
+        self,
+    ) -> typing.AsyncIterator[tuple[int, dict[str, typing.Any] | None]]:
+        if not self.tables:
+            return
+
+        # Existing pool is returned if it was already created.
+        connection_pool: typing.Final = (
+            await self.engine.create_connection_pool()
+        )
+        # Cursors exist only inside a transaction, rows are
+        # fetched in batches and decoded from binary format.
+        async with connection_pool.acquire() as connection, (
+            connection.transaction()
+        ):
+            async for column_row in connection.cursor(
+                self.build_inspect_info_query(),
+                *self.build_inspect_info_parameters(),
+                prefetch=INSPECT_FETCH_SIZE,
+            ):
+                yield (
+                    column_row["table_position"],
+                    (
+                        dict(column_row)
+                        if column_row["db_column_name"]
+                        else None
+                    ),
+                )
@@ -1,16 +1,109 @@
 from __future__ import annotations
 import dataclasses
+import functools
 import typing
 
-from qaspen_migrations.settings import QaspenMigrationTable
+from qaspen_migrations.ddl.base import (
+    BaseAddColumnDDLElement,
+    BaseAlterColumnDDLElement,
+    BaseCreateTableDDLElement,
+    BaseDropColumnDDLElement,
+    BaseDropTableDDLElement,
+    BaseRenameColumnDDLElement,
+)
+from qaspen_migrations.exceptions import MigrationVersionError
+from qaspen_migrations.inspector.mapping import map_inspector
+from qaspen_migrations.migrations.compiler import (
+    CompiledMigration,
+    CompiledStatement,
+    MigrationsCompiler,
+)
+from qaspen_migrations.migrations.executor import MigrationsExecutor
+from qaspen_migrations.migrations.fingerprints import TablesFingerprints
+from qaspen_migrations.migrations.plan import MigrationPlan
+from qaspen_migrations.operations.base import CreateTableOperation
+from qaspen_migrations.operations.mapping import map_operations_implementer
 
 
 if typing.TYPE_CHECKING:
     from qaspen.abc.db_engine import BaseEngine
-    from qaspen.abc.db_transaction import BaseTransaction
+    from qaspen.table.base_table import BaseTable
 
     from qaspen_migrations.migrations.base import BaseMigration
+    from qaspen_migrations.migrations.progress import ProgressMonitor
     from qaspen_migrations.migrations.versioner import MigrationsVersioner
+    from qaspen_migrations.migrations.watchdog import LockWatchdog
+    from qaspen_migrations.utils.loaders import MigrationLoader
+
+# Operations `makemigrations` generates, snapshot of tables
+# has the same result as all of them applied one by one.
+SNAPSHOT_DDL_ELEMENTS: typing.Final = (
+    BaseCreateTableDDLElement,
+    BaseDropTableDDLElement,
+    BaseAlterColumnDDLElement,
+    BaseAddColumnDDLElement,
+    BaseDropColumnDDLElement,
+    BaseRenameColumnDDLElement,
+)
+
+
+@dataclasses.dataclass
+class MigrationPlanApplyer:
+    engine: BaseEngine[
+        typing.Any,
+        typing.Any,
+        typing.Any,
+    ]
+    # Only finds migration files, migrations are never imported,
+    # so plans are applied without models and their dependencies.
+    migrations_loader: MigrationLoader
+    # How many connections are used at the same time
+    # to run statements that can't be run inside a transaction.
+    parallelism: int = 1
+    # Reports progress of running statements when set.
+    progress_monitor: ProgressMonitor | None = None
+    # Cancels statements blocking other queries for too long when set.
+    lock_watchdog: LockWatchdog | None = None
+
+    def validate_plan(self, migration_plan: MigrationPlan) -> None:
+        # Plan is applied only while its migrations are exactly
+        # local ones, stale or edited plans are refused.
+        migrations_compiler: typing.Final = MigrationsCompiler(
+            self.migrations_loader.migrations_path,
+        )
+        local_migrations_paths: typing.Final = {
+            self.migrations_loader.version_from_migration_path(
+                migration_file_path,
+            ): migration_file_path
+            for migration_file_path in (
+                self.migrations_loader.iter_migration_paths()
+            )
+        }
+        for compiled_migration in migration_plan.migrations:
+            local_migration_path = local_migrations_paths.get(
+                compiled_migration.version,
+            )
+            if (
+                local_migration_path is None
+                or migrations_compiler.calculate_path_checksum(
+                    local_migration_path,
+                )
+                != compiled_migration.checksum
+            ):
+                raise MigrationVersionError(
+                    f"Migration {compiled_migration.version} of the plan "
+                    "doesn't match local migration, make a new plan.",
+                )
+
+    async def apply_plan(self, migration_plan: MigrationPlan) -> list[str]:
+        self.validate_plan(migration_plan)
+        return await MigrationsExecutor(
+            engine=self.engine,
+            parallelism=self.parallelism,
+            progress_monitor=self.progress_monitor,
+            lock_watchdog=self.lock_watchdog,
+            migrations_path=self.migrations_loader.migrations_path,
+        ).apply_plan(migration_plan)
 
 
 @dataclasses.dataclass
@@ -21,43 +114,208 @@ class MigrationsApplyer:
         typing.Any,
     ]
     migrations_versioner: MigrationsVersioner
+    # Apply migrations to this schema instead of schemas
+    # tables were defined with, used for schema-per-tenant setups.
+    table_schema: str | None = None
+    # How many connections are used at the same time
+    # to run statements that can't be run inside a transaction.
+    parallelism: int = 1
+    # Reports progress of running statements when set.
+    progress_monitor: ProgressMonitor | None = None
+    # Cancels statements blocking other queries for too long when set.
+    lock_watchdog: LockWatchdog | None = None
+    # Compiler shared by appliers of many targets,
+    # so every migration is compiled only once for all of them.
+    shared_compiler: MigrationsCompiler | None = None
+
+    @property
+    def executor(self) -> MigrationsExecutor:
+        return MigrationsExecutor(
+            engine=self.engine,
+            table_schema=self.table_schema,
+            parallelism=self.parallelism,
+            progress_monitor=self.progress_monitor,
+            lock_watchdog=self.lock_watchdog,
+            migrations_path=(
+                self.migrations_versioner.migrations_loader.migrations_path
+            ),
+        )
+
+    @functools.cached_property
+    def migrations_compiler(self) -> MigrationsCompiler:
+        if self.shared_compiler is not None:
+            return self.shared_compiler
+
+        return MigrationsCompiler(
+            self.migrations_versioner.migrations_loader.migrations_path,
+        )
+
+    def compile_migration(self, migration: BaseMigration) -> CompiledMigration:
+        if self.table_schema is None:
+            return self.migrations_compiler.get_compiled_migration(migration)
+
+        return self.migrations_compiler.get_retargeted_migration(
+            migration,
+            self.table_schema,
+        )
+
+    def compile_migrations(
+        self,
+        migrations: list[BaseMigration],
+    ) -> list[CompiledMigration]:
+        return [self.compile_migration(migration) for migration in migrations]
 
-    @staticmethod
-    async def bump_version_in_database(version_to_bump: str) -> None:
-        version_from_database = await QaspenMigrationTable.select()
+    async def plan_changes(
+        self,
+        snapshot_tables: list[type[BaseTable]] | None = None,
+    ) -> MigrationPlan:
+        version_in_database: typing.Final = (
+            await self.executor.version_store.fetch_version(self.engine)
+        )
+        # Empty database is built from the tables directly
+        # instead of replaying every migration when they are given.
+        if version_in_database is None and snapshot_tables is not None:
+            return self.plan_snapshot(snapshot_tables)
 
-        if version_from_database is None or not version_from_database.result():
-            await QaspenMigrationTable.insert(
-                [QaspenMigrationTable.version],
-                ([version_to_bump],),
+        applied_checksums: typing.Final = (
+            await self.executor.version_store.fetch_checksums(self.engine)
+        )
+        migrations_to_apply: typing.Final = (
+            self.migrations_versioner.get_migrations_after_version(
+                version_in_database,
+                applied_checksums.keys(),
             )
-        else:
-            await QaspenMigrationTable.update(
-                {QaspenMigrationTable.version: version_to_bump},
-            ).force()
-
-    @staticmethod
-    async def apply_migration(
-        transaction: BaseTransaction[typing.Any, typing.Any],
-        migration: BaseMigration,
-    ) -> None:
-        for migration_ddl_element in migration.migrate():
-            await transaction.execute(
-                migration_ddl_element.to_database_expression(),
-                [],
-                fetch_results=False,
+        )
+        return MigrationPlan(
+            from_version=version_in_database,
+            to_version=(
+                migrations_to_apply[-1].version
+                if migrations_to_apply
+                else version_in_database
+            ),
+            migrations=self.compile_migrations(migrations_to_apply),
+        )
+
+    def compile_snapshot(
+        self,
+        tables: list[type[BaseTable]],
+        latest_version: str,
+    ) -> CompiledStatement:
+        local_state: typing.Final = map_inspector(
+            self.engine,
+            tables,
+        ).inspect_local_state()
+        saved_fingerprints: typing.Final = TablesFingerprints(
+            self.migrations_versioner.migrations_loader.migrations_path,
+        ).load_fingerprints(latest_version)
+        # Tables are trusted only when they are exactly what
+        # the latest migration was generated from.
+        if saved_fingerprints != {
+            table_dump.table.schemed_original_table_name(): (
+                table_dump.fingerprint()
+            )
+            for table_dump in local_state
+        }:
+            raise MigrationVersionError(
+                f"Tables don't match the latest migration {latest_version}, "
+                "run 'makemigrations' or migrate without --from-scratch.",
             )
 
-    async def apply_changes(self) -> None:
-        migrations_to_apply: typing.Final = (
-            await self.migrations_versioner.get_not_applyed_migrations()
+        operations_implementer: typing.Final = map_operations_implementer(
+            self.engine.engine_type,
+        )
+        return CompiledStatement(
+            statement="\n".join(
+                MigrationsCompiler.compile_ddl_element(
+                    CreateTableOperation(
+                        table_dump.table.schemed_original_table_name(),
+                        sorted(
+                            table_dump.table_columns,
+                            key=lambda column_info: column_info.db_column_name,
+                        ),
+                    ).to_ddl_element(operations_implementer),
+                    self.table_schema,
+                ).statement
+                for table_dump in local_state
+            ),
         )
 
-        if not migrations_to_apply:
-            return
+    def plan_snapshot(self, tables: list[type[BaseTable]]) -> MigrationPlan:
+        local_migrations: typing.Final = (
+            self.migrations_versioner.get_migrations_after_version(None)
+        )
+        if not local_migrations:
+            return MigrationPlan(None, None, [])
+
+        # Indexes, loaded data and other hand-written operations
+        # are not part of tables, snapshot would silently lose them.
+        for local_migration in local_migrations:
+            if not all(
+                isinstance(ddl_element, SNAPSHOT_DDL_ELEMENTS)
+                for ddl_element in local_migration.migrate()
+            ):
+                raise MigrationVersionError(
+                    f"Migration {local_migration.version} has operations "
+                    "that can't be built from tables, "
+                    "migrate without --from-scratch.",
+                )
+
+        latest_version: typing.Final = local_migrations[-1].version
+        snapshot_statement: typing.Final = self.compile_snapshot(
+            tables,
+            latest_version,
+        )
+        # Whole schema is created by the first migration in one batch,
+        # the rest only record their checksums and the latest version.
+        return MigrationPlan(
+            from_version=None,
+            to_version=latest_version,
+            migrations=[
+                CompiledMigration(
+                    version=local_migration.version,
+                    checksum=self.migrations_compiler.get_compiled_migration(
+                        local_migration,
+                    ).checksum,
+                    migrate_statements=(
+                        [snapshot_statement] if migration_idx == 0 else []
+                    ),
+                    rollback_statements=[],
+                )
+                for migration_idx, local_migration in enumerate(
+                    local_migrations,
+                )
+            ],
+        )
 
-        async with self.engine.transaction() as transaction:
-            for migration_to_apply in migrations_to_apply:
-                await self.apply_migration(transaction, migration_to_apply)
+    async def apply_plan(self, migration_plan: MigrationPlan) -> list[str]:
+        return await MigrationPlanApplyer(
+            engine=self.engine,
+            migrations_loader=self.migrations_versioner.migrations_loader,
+            parallelism=self.parallelism,
+            progress_monitor=self.progress_monitor,
+            lock_watchdog=self.lock_watchdog,
+        ).apply_plan(migration_plan)
 
-            await self.bump_version_in_database(migration_to_apply.version)
+    async def apply_changes(
+        self,
+        snapshot_tables: list[type[BaseTable]] | None = None,
+    ) -> list[str]:
+        return await self.executor.apply_plan(
+            await self.plan_changes(snapshot_tables),
+        )
+
+    async def plan_rollback(self, to_version: str) -> list[BaseMigration]:
+        return self.migrations_versioner.get_migrations_to_rollback(
+            await self.executor.version_store.fetch_version(self.engine),
+            to_version,
+        )
+
+    async def rollback_changes(
+        self,
+        migrations_to_rollback: list[BaseMigration],
+        to_version: str,
+    ) -> list[str]:
+        return await self.executor.rollback_migrations(
+            self.compile_migrations(migrations_to_rollback),
+            to_version,
+        )
@@ -6,6 +6,8 @@ from qaspen_migrations.operations.mapping import map_operations_implementer
 
 
 if typing.TYPE_CHECKING:
+    import pathlib
+
     from qaspen_migrations.ddl.base import BaseDDLElement
     from qaspen_migrations.operations.base import BaseOperationsImplementer
 
@@ -13,15 +15,23 @@ if typing.TYPE_CHECKING:
 class BaseMigration(abc.ABC):
     version: str
     previous_version: str | None
+    # Versions of other branches this migration merges.
+    merged_versions: tuple[str, ...] = ()
     created_datetime: str
+    migration_path: pathlib.Path | None = None
 
     def __init__(self, engine_type: str) -> None:
+        self.engine_type: typing.Final = engine_type
         self.operations: BaseOperationsImplementer[
             typing.Any,
             typing.Any,
             typing.Any,
             typing.Any,
             typing.Any,
+            typing.Any,
+            typing.Any,
+            typing.Any,
+            typing.Any,
         ] = map_operations_implementer(engine_type)
 
     @abc.abstractmethod
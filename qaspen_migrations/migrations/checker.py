@@ -0,0 +1,35 @@
+from __future__ import annotations
+import dataclasses
+import typing
+
+from qaspen_migrations.inspector.mapping import map_inspector
+
+
+if typing.TYPE_CHECKING:
+    from qaspen.abc.db_engine import BaseEngine
+    from qaspen.table.base_table import BaseTable
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class SchemaChecker:
+    engine: BaseEngine[
+        typing.Any,
+        typing.Any,
+        typing.Any,
+    ]
+    tables: list[type[BaseTable]]
+
+    async def find_mismatched_tables(self) -> list[str]:
+        inspector: typing.Final = map_inspector(self.engine, self.tables)
+        local_fingerprints: typing.Final = inspector.fingerprint_local_state()
+        database_fingerprints: typing.Final = (
+            await inspector.fingerprint_database()
+        )
+        if local_fingerprints == database_fingerprints:
+            return []
+
+        return [
+            table_name
+            for table_name, local_fingerprint in local_fingerprints.items()
+            if database_fingerprints.get(table_name) != local_fingerprint
+        ]
@@ -0,0 +1,397 @@
+from __future__ import annotations
+import contextlib
+import dataclasses
+import hashlib
+import importlib.metadata
+import json
+import pathlib
+import typing
+
+from qaspen_migrations.ddl.base import (
+    BaseCopyFromDDLElement,
+    BaseTableDDLElement,
+)
+from qaspen_migrations.exceptions import MigrationCorruptionError
+from qaspen_migrations.settings import COMPILED_MIGRATIONS_DIRECTORY
+from qaspen_migrations.utils.common import calculate_file_checksum
+
+
+if typing.TYPE_CHECKING:
+    from qaspen_migrations.ddl.base import BaseDDLElement
+    from qaspen_migrations.migrations.base import BaseMigration
+
+
+# Packages rendering migrations into SQL,
+# compiled cache is stale once any of them is upgraded.
+COMPILER_PACKAGES: typing.Final = ("qaspen-migrations", "qaspen")
+
+
+def calculate_compiler_version() -> str:
+    compiler_versions: typing.Final = []
+    for compiler_package in COMPILER_PACKAGES:
+        try:
+            package_version = importlib.metadata.version(compiler_package)
+        except importlib.metadata.PackageNotFoundError:
+            package_version = "unknown"
+        compiler_versions.append(f"{compiler_package}=={package_version}")
+
+    return ",".join(compiler_versions)
+
+
+COMPILER_VERSION: typing.Final = calculate_compiler_version()
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class CompiledStatement:
+    statement: str
+    dependency_key: str | None = None
+    is_transactional: bool = True
+    # Data file streamed into the statement, set for bulk loads,
+    # relative ones are resolved against the migrations directory.
+    copy_source_path: str | None = None
+    defer_indexes: bool = False
+    # Run before retrying an interrupted non-transactional statement.
+    cleanup_statement: str | None = None
+    # Tells whether an interrupted statement has finished anyway.
+    completion_check_statement: str | None = None
+
+    def to_json_dict(self) -> dict[str, typing.Any]:
+        return {
+            field.name: getattr(self, field.name)
+            for field in dataclasses.fields(self)
+        }
+
+    @classmethod
+    def from_json_dict(
+        cls: type[CompiledStatement],
+        compiled_data: dict[str, typing.Any],
+    ) -> CompiledStatement:
+        try:
+            return cls(**compiled_data)
+        except TypeError as exception:
+            raise MigrationCorruptionError(
+                "Compiled statement has unexpected fields.",
+            ) from exception
+
+
+def calculate_migration_checksum(
+    migration_path: pathlib.Path,
+    copy_source_paths: list[str],
+) -> str:
+    migration_checksum: typing.Final = calculate_file_checksum(migration_path)
+    if not copy_source_paths:
+        return migration_checksum
+
+    # Bulk loaded data is a part of the migration,
+    # editing it changes the migration checksum too.
+    migration_hash: typing.Final = hashlib.sha256(migration_checksum.encode())
+    for copy_source_path in copy_source_paths:
+        source_path = migration_path.parent / copy_source_path
+        if not source_path.is_file():
+            raise MigrationCorruptionError(
+                f"Bulk load source {source_path} does not exist.",
+            )
+        migration_hash.update(calculate_file_checksum(source_path).encode())
+
+    return migration_hash.hexdigest()
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class VersionedStatement:
+    migration_version: str
+    compiled_statement: CompiledStatement
+    # Order of the statement in the plan it was applied with.
+    statement_position: int = 0
+
+    @property
+    def dependency_key(self) -> str | None:
+        return self.compiled_statement.dependency_key
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class CompiledMigration:
+    version: str
+    checksum: str | None
+    migrate_statements: list[CompiledStatement]
+    rollback_statements: list[CompiledStatement]
+    # What the statements were compiled with and for,
+    # cache made by other compiler or for other engine is stale.
+    compiler_version: str | None = None
+    engine_type: str | None = None
+
+    @property
+    def copy_source_paths(self) -> list[str]:
+        return [
+            compiled_statement.copy_source_path
+            for compiled_statement in (
+                *self.migrate_statements,
+                *self.rollback_statements,
+            )
+            if compiled_statement.copy_source_path is not None
+        ]
+
+    def to_json_dict(self) -> dict[str, typing.Any]:
+        return {
+            "version": self.version,
+            "checksum": self.checksum,
+            "migrate_statements": [
+                compiled_statement.to_json_dict()
+                for compiled_statement in self.migrate_statements
+            ],
+            "rollback_statements": [
+                compiled_statement.to_json_dict()
+                for compiled_statement in self.rollback_statements
+            ],
+            "compiler_version": self.compiler_version,
+            "engine_type": self.engine_type,
+        }
+
+    @classmethod
+    def from_json_dict(
+        cls: type[CompiledMigration],
+        compiled_data: dict[str, typing.Any],
+    ) -> CompiledMigration:
+        try:
+            return cls(
+                version=compiled_data["version"],
+                checksum=compiled_data["checksum"],
+                migrate_statements=[
+                    CompiledStatement.from_json_dict(compiled_statement)
+                    for compiled_statement in compiled_data[
+                        "migrate_statements"
+                    ]
+                ],
+                rollback_statements=[
+                    CompiledStatement.from_json_dict(compiled_statement)
+                    for compiled_statement in compiled_data[
+                        "rollback_statements"
+                    ]
+                ],
+                compiler_version=compiled_data.get("compiler_version"),
+                engine_type=compiled_data.get("engine_type"),
+            )
+        except (LookupError, TypeError) as exception:
+            raise MigrationCorruptionError(
+                "Compiled migration is missing required fields.",
+            ) from exception
+
+
+@dataclasses.dataclass
+class MigrationsCompiler:
+    migrations_path: str
+    # Migrations already compiled or loaded by this compiler, every
+    # schema-per-tenant target reuses them instead of compiling again.
+    __compiled_migrations: dict[str, CompiledMigration] = dataclasses.field(
+        init=False,
+        default_factory=dict,
+    )
+    __ddl_elements: dict[
+        str,
+        tuple[list[BaseDDLElement], list[BaseDDLElement]],
+    ] = dataclasses.field(
+        init=False,
+        default_factory=dict,
+    )
+
+    @property
+    def compiled_migrations_path(self) -> pathlib.Path:
+        return (
+            pathlib.Path(self.migrations_path) / COMPILED_MIGRATIONS_DIRECTORY
+        )
+
+    def compiled_migration_path(
+        self,
+        migration_path: pathlib.Path,
+    ) -> pathlib.Path:
+        return self.compiled_migrations_path / f"{migration_path.stem}.json"
+
+    @staticmethod
+    def compile_ddl_element(
+        ddl_element: BaseDDLElement,
+        table_schema: str | None = None,
+    ) -> CompiledStatement:
+        if table_schema is not None and isinstance(
+            ddl_element,
+            BaseTableDDLElement,
+        ):
+            ddl_element = ddl_element.with_table_schema(table_schema)
+
+        compiled_statement: typing.Final = CompiledStatement(
+            statement=ddl_element.to_database_expression(),
+            dependency_key=ddl_element.dependency_key,
+            is_transactional=ddl_element.is_transactional,
+            cleanup_statement=ddl_element.to_cleanup_expression(),
+            completion_check_statement=(
+                ddl_element.to_completion_check_expression()
+            ),
+        )
+        if not isinstance(ddl_element, BaseCopyFromDDLElement):
+            return compiled_statement
+
+        # Path is kept as written, so compiled migrations
+        # and plans don't depend on where they were made.
+        return dataclasses.replace(
+            compiled_statement,
+            copy_source_path=ddl_element.source_path,
+            defer_indexes=ddl_element.defer_indexes,
+        )
+
+    @classmethod
+    def compile_migration(
+        cls: type[MigrationsCompiler],
+        migration: BaseMigration,
+        table_schema: str | None = None,
+    ) -> CompiledMigration:
+        compiled_migration: typing.Final = CompiledMigration(
+            version=migration.version,
+            checksum=None,
+            migrate_statements=[
+                cls.compile_ddl_element(ddl_element, table_schema)
+                for ddl_element in migration.migrate()
+            ],
+            rollback_statements=[
+                cls.compile_ddl_element(ddl_element, table_schema)
+                for ddl_element in migration.rollback()
+            ],
+            compiler_version=COMPILER_VERSION,
+            engine_type=migration.engine_type,
+        )
+        if migration.migration_path is None:
+            return compiled_migration
+
+        return dataclasses.replace(
+            compiled_migration,
+            checksum=calculate_migration_checksum(
+                migration.migration_path,
+                compiled_migration.copy_source_paths,
+            ),
+        )
+
+    def save_compiled_migration(
+        self,
+        migration: BaseMigration,
+        compiled_migration: CompiledMigration,
+    ) -> None:
+        if migration.migration_path is None:
+            return
+
+        self.compiled_migrations_path.mkdir(parents=True, exist_ok=True)
+        self.compiled_migration_path(migration.migration_path).write_text(
+            json.dumps(compiled_migration.to_json_dict()),
+        )
+
+    def load_compiled_migration(
+        self,
+        migration: BaseMigration,
+    ) -> CompiledMigration | None:
+        if migration.migration_path is None:
+            return None
+
+        compiled_migration_path: typing.Final = self.compiled_migration_path(
+            migration.migration_path,
+        )
+        if not compiled_migration_path.exists():
+            return None
+
+        try:
+            compiled_migration: typing.Final = (
+                CompiledMigration.from_json_dict(
+                    json.loads(compiled_migration_path.read_bytes()),
+                )
+            )
+        except (ValueError, MigrationCorruptionError):
+            return None
+
+        if (
+            compiled_migration.compiler_version != COMPILER_VERSION
+            or compiled_migration.engine_type != migration.engine_type
+        ):
+            return None
+
+        # Sources of a changed migration can be different,
+        # but then its own file doesn't match already.
+        if compiled_migration.checksum != calculate_migration_checksum(
+            migration.migration_path,
+            compiled_migration.copy_source_paths,
+        ):
+            return None
+
+        return compiled_migration
+
+    def calculate_path_checksum(self, migration_path: pathlib.Path) -> str:
+        # Checksums are calculated without importing migrations,
+        # bulk load sources are taken from the compiled migration.
+        compiled_migration_path: typing.Final = self.compiled_migration_path(
+            migration_path,
+        )
+        if not compiled_migration_path.exists():
+            raise MigrationCorruptionError(
+                f"Migration {migration_path.name} is not compiled, "
+                "its checksum can't be calculated without importing it. "
+                f"Keep {COMPILED_MIGRATIONS_DIRECTORY} directory "
+                "along with migrations.",
+            )
+
+        try:
+            compiled_data: typing.Final = json.loads(
+                compiled_migration_path.read_bytes(),
+            )
+        except ValueError as exception:
+            raise MigrationCorruptionError(
+                f"Compiled migration {compiled_migration_path} "
+                "is not a valid JSON.",
+            ) from exception
+
+        return calculate_migration_checksum(
+            migration_path,
+            CompiledMigration.from_json_dict(compiled_data).copy_source_paths,
+        )
+
+    def get_compiled_migration(
+        self,
+        migration: BaseMigration,
+    ) -> CompiledMigration:
+        if migration.version in self.__compiled_migrations:
+            return self.__compiled_migrations[migration.version]
+
+        compiled_migration = self.load_compiled_migration(migration)
+        if compiled_migration is None:
+            compiled_migration = self.compile_migration(migration)
+            # Migrations directory can be read-only at deploy time,
+            # so stale cache is simply recompiled on every run then.
+            with contextlib.suppress(OSError):
+                self.save_compiled_migration(migration, compiled_migration)
+
+        self.__compiled_migrations[migration.version] = compiled_migration
+        return compiled_migration
+
+    def get_retargeted_migration(
+        self,
+        migration: BaseMigration,
+        table_schema: str,
+    ) -> CompiledMigration:
+        compiled_migration: typing.Final = self.get_compiled_migration(
+            migration,
+        )
+        if migration.version not in self.__ddl_elements:
+            self.__ddl_elements[migration.version] = (
+                migration.migrate(),
+                migration.rollback(),
+            )
+
+        # Only tables schema differs between targets,
+        # so only the statements are rendered for each of them.
+        migrate_elements, rollback_elements = self.__ddl_elements[
+            migration.version
+        ]
+        return dataclasses.replace(
+            compiled_migration,
+            migrate_statements=[
+                self.compile_ddl_element(ddl_element, table_schema)
+                for ddl_element in migrate_elements
+            ],
+            rollback_statements=[
+                self.compile_ddl_element(ddl_element, table_schema)
+                for ddl_element in rollback_elements
+            ],
+        )
@@ -0,0 +1,99 @@
+from __future__ import annotations
+import typing
+
+import aiofile
+
+from qaspen_migrations.exceptions import (
+    ConfigurationError,
+    MigrationCorruptionError,
+)
+from qaspen_migrations.settings import COPY_READ_CHUNK_SIZE
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+    from qaspen.abc.db_transaction import BaseTransaction
+
+    from qaspen_migrations.migrations.compiler import CompiledStatement
+
+
+# Only psycopg connections can stream data with COPY.
+COPY_ENGINE_TYPES: typing.Final = ("PSQLPsycopg",)
+# Indexes backing constraints can't be dropped on their own,
+# so only standalone ones are deferred.
+DEFERRABLE_INDEXES_QUERY: typing.Final = """
+    SELECT
+        table_index.indexrelid::regclass::text AS index_name,
+        pg_get_indexdef(table_index.indexrelid) AS index_definition
+    FROM pg_index AS table_index
+    WHERE table_index.indrelid = %s::regclass
+    AND NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE pg_constraint.conindid = table_index.indexrelid
+    )
+"""
+
+
+async def stream_copy_source(
+    transaction: BaseTransaction[typing.Any, typing.Any],
+    compiled_statement: CompiledStatement,
+    copy_source_path: pathlib.Path,
+) -> None:
+    if transaction.engine.engine_type not in COPY_ENGINE_TYPES:
+        raise ConfigurationError(
+            f"Engine type {transaction.engine.engine_type} "
+            "can't run bulk loads\n"
+            f"Valid engine types: {', '.join(COPY_ENGINE_TYPES)}",
+        )
+
+    # Psycopg transactions don't expose their connection, but COPY
+    # must run on it to see tables created earlier in it.
+    transaction_connection: typing.Final = (
+        transaction._connection  # type: ignore[attr-defined]
+    )
+    async with transaction_connection.cursor() as cursor, cursor.copy(
+        compiled_statement.statement,
+    ) as copy, aiofile.async_open(copy_source_path, "rb") as copy_source:
+        async for chunk in copy_source.iter_chunked(COPY_READ_CHUNK_SIZE):
+            await copy.write(chunk)
+
+
+async def copy_from_source(
+    transaction: BaseTransaction[typing.Any, typing.Any],
+    compiled_statement: CompiledStatement,
+    copy_source_path: pathlib.Path,
+) -> None:
+    if not copy_source_path.is_file():
+        raise MigrationCorruptionError(
+            f"Bulk load source {copy_source_path} does not exist.",
+        )
+
+    # Bulk loads depend on the table they load into.
+    deferred_indexes: typing.Final = (
+        await transaction.execute(
+            DEFERRABLE_INDEXES_QUERY,
+            [compiled_statement.dependency_key],
+        )
+        if compiled_statement.defer_indexes
+        else []
+    )
+    for deferred_index in deferred_indexes:
+        await transaction.execute(
+            f"DROP INDEX {deferred_index['index_name']}",
+            [],
+            fetch_results=False,
+        )
+
+    await stream_copy_source(
+        transaction,
+        compiled_statement,
+        copy_source_path,
+    )
+
+    for deferred_index in deferred_indexes:
+        await transaction.execute(
+            deferred_index["index_definition"],
+            [],
+            fetch_results=False,
+        )
@@ -0,0 +1,53 @@
+from __future__ import annotations
+import typing
+
+from qaspen_migrations.exceptions import MigrationCorruptionError
+from qaspen_migrations.migrations.base import BaseMigration
+from qaspen_migrations.operations.base import operation_from_json_dict
+
+
+if typing.TYPE_CHECKING:
+    from qaspen_migrations.ddl.base import BaseDDLElement
+    from qaspen_migrations.operations.base import BaseOperation
+
+
+class DeclarativeMigration(BaseMigration):
+    """Migration loaded from a JSON document instead of a python module."""
+
+    def __init__(
+        self,
+        engine_type: str,
+        migration_document: dict[str, typing.Any],
+    ) -> None:
+        super().__init__(engine_type)
+        try:
+            self.version = migration_document["version"]
+            self.previous_version = migration_document["previous_version"]
+            self.merged_versions = tuple(
+                migration_document.get("merged_versions", ()),
+            )
+            self.created_datetime = migration_document["created_datetime"]
+            self.to_migrate_operations: list[BaseOperation] = [
+                operation_from_json_dict(operation_data)
+                for operation_data in migration_document["migrate"]
+            ]
+            self.to_rollback_operations: list[BaseOperation] = [
+                operation_from_json_dict(operation_data)
+                for operation_data in migration_document["rollback"]
+            ]
+        except LookupError as exception:
+            raise MigrationCorruptionError(
+                "Migration document is missing required fields.",
+            ) from exception
+
+    def migrate(self) -> list[BaseDDLElement]:
+        return [
+            operation.to_ddl_element(self.operations)
+            for operation in self.to_migrate_operations
+        ]
+
+    def rollback(self) -> list[BaseDDLElement]:
+        return [
+            operation.to_ddl_element(self.operations)
+            for operation in self.to_rollback_operations
+        ]
@@ -0,0 +1,47 @@
+from __future__ import annotations
+import typing
+
+
+class DependentStatement(typing.Protocol):
+    @property
+    def dependency_key(self) -> str | None:
+        ...
+
+
+DependentStatementType = typing.TypeVar(
+    "DependentStatementType",
+    bound=DependentStatement,
+)
+
+
+def group_independent_statements(
+    compiled_statements: typing.Iterable[DependentStatementType],
+) -> list[list[DependentStatementType]]:
+    # Statements in one wave don't conflict with each other.
+    # Statements touching the same table keep their relative order,
+    # statement without dependency key acts as a barrier.
+    statements_waves: typing.Final[list[list[DependentStatementType]]] = []
+    last_waves_indexes: typing.Final[dict[str, int]] = {}
+    barrier_wave_index = -1
+    for compiled_statement in compiled_statements:
+        if compiled_statement.dependency_key is None:
+            wave_index = len(statements_waves)
+            barrier_wave_index = wave_index
+        else:
+            wave_index = (
+                max(
+                    barrier_wave_index,
+                    last_waves_indexes.get(
+                        compiled_statement.dependency_key,
+                        -1,
+                    ),
+                )
+                + 1
+            )
+            last_waves_indexes[compiled_statement.dependency_key] = wave_index
+
+        if wave_index == len(statements_waves):
+            statements_waves.append([])
+        statements_waves[wave_index].append(compiled_statement)
+
+    return statements_waves
@@ -0,0 +1,475 @@
+from __future__ import annotations
+import asyncio
+import contextlib
+import dataclasses
+import pathlib
+import typing
+
+from qaspen_migrations.exceptions import (
+    ConfigurationError,
+    MigrationVersionError,
+)
+from qaspen_migrations.migrations.compiler import VersionedStatement
+from qaspen_migrations.migrations.copier import copy_from_source
+from qaspen_migrations.migrations.dependencies import (
+    group_independent_statements,
+)
+from qaspen_migrations.migrations.store import (
+    MigrationsVersionStore,
+    OperationStateEnum,
+)
+
+
+if typing.TYPE_CHECKING:
+    from qaspen.abc.db_engine import BaseEngine
+    from qaspen.abc.db_transaction import BaseTransaction
+
+    from qaspen_migrations.migrations.compiler import (
+        CompiledMigration,
+        CompiledStatement,
+    )
+    from qaspen_migrations.migrations.plan import MigrationPlan
+    from qaspen_migrations.migrations.progress import ProgressMonitor
+    from qaspen_migrations.migrations.watchdog import LockWatchdog
+    from qaspen_migrations.migrations.watchers import BaseBackendsWatcher
+
+
+BACKEND_PID_QUERY: typing.Final = "SELECT pg_backend_pid() AS backend_pid"
+# Statements are run on driver connections directly, other engines
+# can inspect database and make migrations, but can't apply them.
+EXECUTOR_ENGINE_TYPES: typing.Final = ("PSQLPsycopg",)
+
+
+@dataclasses.dataclass
+class MigrationsExecutor:
+    engine: BaseEngine[
+        typing.Any,
+        typing.Any,
+        typing.Any,
+    ]
+    # Apply migrations to this schema instead of schemas
+    # tables were defined with, used for schema-per-tenant setups.
+    table_schema: str | None = None
+    # How many connections are used at the same time
+    # to run statements that can't be run inside a transaction.
+    parallelism: int = 1
+    # Reports progress of running statements when set.
+    progress_monitor: ProgressMonitor | None = None
+    # Cancels statements blocking other queries for too long when set.
+    lock_watchdog: LockWatchdog | None = None
+    # Bulk load sources are relative to it, current directory if unset.
+    migrations_path: str | None = None
+
+    def __post_init__(self) -> None:
+        if self.engine.engine_type not in EXECUTOR_ENGINE_TYPES:
+            raise ConfigurationError(
+                f"Engine type {self.engine.engine_type} "
+                "can't apply migrations\n"
+                f"Valid engine types: {', '.join(EXECUTOR_ENGINE_TYPES)}",
+            )
+
+    @property
+    def version_store(self) -> MigrationsVersionStore:
+        return MigrationsVersionStore(self.table_schema)
+
+    @property
+    def backends_watchers(self) -> list[BaseBackendsWatcher]:
+        return [
+            backends_watcher
+            for backends_watcher in (self.progress_monitor, self.lock_watchdog)
+            if backends_watcher is not None
+        ]
+
+    @contextlib.asynccontextmanager
+    async def watching_backends(self) -> typing.AsyncIterator[None]:
+        async with contextlib.AsyncExitStack() as watchers_stack:
+            for backends_watcher in self.backends_watchers:
+                await watchers_stack.enter_async_context(
+                    backends_watcher.watching(),
+                )
+            yield
+
+    async def fetch_backend_pid(
+        self,
+        transaction: BaseTransaction[typing.Any, typing.Any],
+    ) -> int | None:
+        if not self.backends_watchers:
+            return None
+
+        backend_pid_result: typing.Final = await transaction.execute(
+            BACKEND_PID_QUERY,
+            [],
+        )
+        return typing.cast(int, backend_pid_result[0]["backend_pid"])
+
+    def track_backend(
+        self,
+        backend_pid: int | None,
+        migration_version: str,
+    ) -> None:
+        if backend_pid is None:
+            return
+        for backends_watcher in self.backends_watchers:
+            backends_watcher.track(backend_pid, migration_version)
+
+    def untrack_backend(self, backend_pid: int | None) -> None:
+        if backend_pid is None:
+            return
+        for backends_watcher in self.backends_watchers:
+            backends_watcher.untrack(backend_pid)
+
+    async def apply_statements(
+        self,
+        transaction: BaseTransaction[typing.Any, typing.Any],
+        compiled_statements: list[CompiledStatement],
+    ) -> None:
+        for compiled_statement in compiled_statements:
+            if not compiled_statement.is_transactional:
+                continue
+            if compiled_statement.copy_source_path is not None:
+                await copy_from_source(
+                    transaction,
+                    compiled_statement,
+                    pathlib.Path(self.migrations_path or ".")
+                    / compiled_statement.copy_source_path,
+                )
+                continue
+
+            await transaction.execute(
+                compiled_statement.statement,
+                [],
+                fetch_results=False,
+            )
+
+    @staticmethod
+    async def is_statement_completed(
+        connection: typing.Any,
+        compiled_statement: CompiledStatement,
+    ) -> bool:
+        if compiled_statement.completion_check_statement is None:
+            return False
+
+        completion_cursor: typing.Final = await connection.execute(
+            compiled_statement.completion_check_statement,
+        )
+        completion_row: typing.Final = await completion_cursor.fetchone()
+        return completion_row is not None and bool(completion_row[0])
+
+    async def resume_operation(
+        self,
+        connection: typing.Any,
+        versioned_statement: VersionedStatement,
+        operation_state: OperationStateEnum,
+    ) -> None:
+        compiled_statement: typing.Final = (
+            versioned_statement.compiled_statement
+        )
+        # Statement may have finished right before the run was
+        # interrupted, then it's only recorded as done.
+        if operation_state != OperationStateEnum.PENDING and (
+            await self.is_statement_completed(connection, compiled_statement)
+        ):
+            await self.version_store.update_operation_state(
+                connection,
+                versioned_statement,
+                OperationStateEnum.DONE,
+            )
+            return
+
+        # Statement that was started before may have been
+        # interrupted halfway, its leftovers are removed first.
+        if (
+            operation_state != OperationStateEnum.PENDING
+            and compiled_statement.cleanup_statement is not None
+        ):
+            await connection.execute(compiled_statement.cleanup_statement)
+
+        await self.version_store.update_operation_state(
+            connection,
+            versioned_statement,
+            OperationStateEnum.RUNNING,
+        )
+        try:
+            await connection.execute(compiled_statement.statement)
+        except Exception:
+            await self.version_store.update_operation_state(
+                connection,
+                versioned_statement,
+                OperationStateEnum.INVALID,
+            )
+            raise
+
+        await self.version_store.update_operation_state(
+            connection,
+            versioned_statement,
+            OperationStateEnum.DONE,
+        )
+
+    async def apply_statement_outside_transaction(
+        self,
+        versioned_statement: VersionedStatement,
+        parallelism_semaphore: asyncio.Semaphore,
+        operation_state: OperationStateEnum | None = None,
+    ) -> None:
+        async with parallelism_semaphore:
+            connection = await self.engine.connection()
+            async with connection:
+                await connection.set_autocommit(True)
+                backend_pid = connection.info.backend_pid
+                self.track_backend(
+                    backend_pid,
+                    versioned_statement.migration_version,
+                )
+                try:
+                    if operation_state is None:
+                        await connection.execute(
+                            versioned_statement.compiled_statement.statement,
+                        )
+                    else:
+                        await self.resume_operation(
+                            connection,
+                            versioned_statement,
+                            operation_state,
+                        )
+                finally:
+                    self.untrack_backend(backend_pid)
+
+    async def apply_non_transactional_statements(
+        self,
+        versioned_statements: typing.Iterable[VersionedStatement],
+        operations_states: (
+            typing.Mapping[VersionedStatement, OperationStateEnum] | None
+        ) = None,
+    ) -> None:
+        # States are recorded only for statements
+        # tracked in the operations table.
+        parallelism_semaphore: typing.Final = asyncio.Semaphore(
+            self.parallelism,
+        )
+        for statements_wave in group_independent_statements(
+            versioned_statement
+            for versioned_statement in versioned_statements
+            if not versioned_statement.compiled_statement.is_transactional
+        ):
+            await asyncio.gather(
+                *(
+                    self.apply_statement_outside_transaction(
+                        versioned_statement,
+                        parallelism_semaphore,
+                        (
+                            operations_states.get(versioned_statement)
+                            if operations_states is not None
+                            else None
+                        ),
+                    )
+                    for versioned_statement in statements_wave
+                ),
+            )
+
+    async def bump_version(self, version_to_bump: str) -> None:
+        async with self.engine.transaction() as transaction:
+            await self.version_store.bump_version(
+                transaction,
+                version_to_bump,
+            )
+
+    async def resume_operations(self) -> str | None:
+        # Operations are recorded only for the migration being applied,
+        # they are forgotten once it's finished and its version is bumped.
+        recorded_operations: typing.Final = (
+            await self.version_store.fetch_recorded_operations(self.engine)
+        )
+        if not recorded_operations:
+            return None
+
+        await self.apply_non_transactional_statements(
+            (
+                versioned_statement
+                for versioned_statement, operation_state in (
+                    recorded_operations.items()
+                )
+                if operation_state != OperationStateEnum.DONE
+            ),
+            recorded_operations,
+        )
+        resumed_version: typing.Final = list(recorded_operations)[
+            -1
+        ].migration_version
+        async with self.engine.transaction() as transaction:
+            await self.version_store.forget_operations(
+                transaction,
+                [resumed_version],
+            )
+            await self.version_store.bump_version(
+                transaction,
+                resumed_version,
+            )
+        return resumed_version
+
+    async def apply_migration(
+        self,
+        compiled_migration: CompiledMigration,
+        non_transactional_statements: list[VersionedStatement],
+    ) -> None:
+        async with self.engine.transaction() as transaction:
+            backend_pid = await self.fetch_backend_pid(transaction)
+            self.track_backend(backend_pid, compiled_migration.version)
+            await self.apply_statements(
+                transaction,
+                compiled_migration.migrate_statements,
+            )
+            self.untrack_backend(backend_pid)
+
+            await self.version_store.record_checksums(
+                transaction,
+                [compiled_migration],
+            )
+            if not non_transactional_statements:
+                await self.version_store.bump_version(
+                    transaction,
+                    compiled_migration.version,
+                )
+                return
+
+            # Statements are recorded as pending together with the
+            # transactional part, so a crash right after commit loses none.
+            is_operations_recorded = (
+                await self.version_store.record_operations(
+                    transaction,
+                    non_transactional_statements,
+                )
+            )
+
+        # Statements like `CREATE INDEX CONCURRENTLY` are run only after
+        # tables they depend on are committed, and before the next
+        # migration starts, version is bumped once all of them are done.
+        if is_operations_recorded:
+            await self.resume_operations()
+            return
+
+        await self.apply_non_transactional_statements(
+            non_transactional_statements,
+        )
+        await self.bump_version(compiled_migration.version)
+
+    async def apply_plan(self, migration_plan: MigrationPlan) -> list[str]:
+        planned_to_version: typing.Final = (
+            migration_plan.migrations[-1].version
+            if migration_plan.migrations
+            else migration_plan.from_version
+        )
+        if migration_plan.to_version != planned_to_version:
+            raise MigrationVersionError(
+                f"Migration plan leads to version {planned_to_version}, "
+                f"but claims version {migration_plan.to_version}.",
+            )
+
+        async with self.watching_backends():
+            # Operations left unfinished by an interrupted run
+            # are completed before anything new is applied.
+            resumed_version: typing.Final = await self.resume_operations()
+            version_in_database: typing.Final = (
+                await self.version_store.fetch_version(self.engine)
+            )
+            plan_versions: typing.Final = [
+                compiled_migration.version
+                for compiled_migration in migration_plan.migrations
+            ]
+            # Interrupted migration may be the one plan starts with,
+            # then it's already finished by resuming its operations.
+            if version_in_database == migration_plan.from_version:
+                pending_migrations = migration_plan.migrations
+            elif (
+                resumed_version is not None
+                and resumed_version == version_in_database
+                and resumed_version in plan_versions
+            ):
+                pending_migrations = migration_plan.migrations[
+                    plan_versions.index(resumed_version) + 1 :
+                ]
+            else:
+                raise MigrationVersionError(
+                    f"Migration plan expects database version "
+                    f"{migration_plan.from_version}, "
+                    f"but database is at version {version_in_database}.",
+                )
+
+            migrate_statements: typing.Final = (
+                migration_plan.migrate_statements
+            )
+            for compiled_migration in pending_migrations:
+                await self.apply_migration(
+                    compiled_migration,
+                    [
+                        versioned_statement
+                        for versioned_statement in migrate_statements
+                        if versioned_statement.migration_version
+                        == compiled_migration.version
+                        and not (
+                            versioned_statement.compiled_statement
+                        ).is_transactional
+                    ],
+                )
+
+        return [
+            compiled_migration.version
+            for compiled_migration in pending_migrations
+        ]
+
+    async def rollback_migration(
+        self,
+        rolled_back_migration: CompiledMigration,
+        to_version: str,
+    ) -> None:
+        # Non-transactional statements undo things built on top of
+        # tables, so they must run before tables are changed back.
+        await self.apply_non_transactional_statements(
+            VersionedStatement(
+                rolled_back_migration.version,
+                compiled_statement,
+            )
+            for compiled_statement in rolled_back_migration.rollback_statements
+        )
+
+        async with self.engine.transaction() as transaction:
+            backend_pid = await self.fetch_backend_pid(transaction)
+            self.track_backend(backend_pid, rolled_back_migration.version)
+            await self.apply_statements(
+                transaction,
+                rolled_back_migration.rollback_statements,
+            )
+            self.untrack_backend(backend_pid)
+
+            await self.version_store.forget_checksums(
+                transaction,
+                [rolled_back_migration.version],
+            )
+            await self.version_store.forget_operations(
+                transaction,
+                [rolled_back_migration.version],
+            )
+            await self.version_store.bump_version(transaction, to_version)
+
+    async def rollback_migrations(
+        self,
+        rolled_back_migrations: list[CompiledMigration],
+        to_version: str,
+    ) -> list[str]:
+        rolled_back_versions: typing.Final = [
+            rolled_back_migration.version
+            for rolled_back_migration in rolled_back_migrations
+        ]
+        # Every migration leaves database at the version of the one
+        # rolled back after it, which is its previous version
+        # unless branches were merged.
+        async with self.watching_backends():
+            for rolled_back_migration, version_after_rollback in zip(
+                rolled_back_migrations,
+                [*rolled_back_versions[1:], to_version],
+            ):
+                await self.rollback_migration(
+                    rolled_back_migration,
+                    version_after_rollback,
+                )
+
+        return rolled_back_versions
@@ -0,0 +1,94 @@
+from __future__ import annotations
+import asyncio
+import dataclasses
+import functools
+import typing
+
+from qaspen_migrations.migrations.applyer import MigrationsApplyer
+from qaspen_migrations.migrations.compiler import MigrationsCompiler
+
+
+if typing.TYPE_CHECKING:
+    from qaspen.abc.db_engine import BaseEngine
+
+    from qaspen_migrations.migrations.versioner import MigrationsVersioner
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class MigrationTarget:
+    engine: BaseEngine[
+        typing.Any,
+        typing.Any,
+        typing.Any,
+    ]
+    table_schema: str | None = None
+
+    @property
+    def name(self) -> str:
+        if self.table_schema is None:
+            return self.engine.database
+        return f"{self.engine.database}.{self.table_schema}"
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class MigrationTargetResult:
+    target: MigrationTarget
+    applied_versions: list[str] = dataclasses.field(default_factory=list)
+    error: Exception | None = None
+
+    @property
+    def is_failed(self) -> bool:
+        return self.error is not None
+
+
+@dataclasses.dataclass
+class MigrationsFanOut:
+    targets: list[MigrationTarget]
+    migrations_versioner: MigrationsVersioner
+    concurrency: int = 10
+    parallelism: int = 1
+
+    @functools.cached_property
+    def migrations_compiler(self) -> MigrationsCompiler:
+        return MigrationsCompiler(
+            self.migrations_versioner.migrations_loader.migrations_path,
+        )
+
+    async def apply_target_changes(
+        self,
+        target: MigrationTarget,
+        concurrency_semaphore: asyncio.Semaphore,
+    ) -> MigrationTargetResult:
+        async with concurrency_semaphore:
+            try:
+                applied_versions = await MigrationsApplyer(
+                    engine=target.engine,
+                    migrations_versioner=self.migrations_versioner,
+                    table_schema=target.table_schema,
+                    parallelism=self.parallelism,
+                    shared_compiler=self.migrations_compiler,
+                ).apply_changes()
+            except Exception as exception:  # noqa: BLE001
+                return MigrationTargetResult(target, error=exception)
+
+        return MigrationTargetResult(target, applied_versions)
+
+    async def apply_changes(self) -> list[MigrationTargetResult]:
+        # Targets can share an engine, its connection pool must be
+        # created once before they start racing for it.
+        for target_engine in {
+            id(target.engine): target.engine for target in self.targets
+        }.values():
+            await target_engine.create_connection_pool()
+
+        concurrency_semaphore: typing.Final = asyncio.Semaphore(
+            self.concurrency,
+        )
+        return list(
+            await asyncio.gather(
+                *(
+                    self.apply_target_changes(target, concurrency_semaphore)
+                    for target in self.targets
+                ),
+            ),
+        )
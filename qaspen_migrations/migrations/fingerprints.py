@@ -0,0 +1,56 @@
+from __future__ import annotations
+import dataclasses
+import json
+import pathlib
+import typing
+
+from qaspen_migrations.settings import TABLES_FINGERPRINTS_FILE
+
+
+@dataclasses.dataclass
+class TablesFingerprints:
+    migrations_path: str
+
+    @property
+    def fingerprints_path(self) -> pathlib.Path:
+        return pathlib.Path(self.migrations_path) / TABLES_FINGERPRINTS_FILE
+
+    def load_fingerprints(
+        self,
+        migration_version: str | None,
+    ) -> dict[str, str]:
+        if migration_version is None or not self.fingerprints_path.exists():
+            return {}
+
+        try:
+            fingerprints_document: typing.Final = json.loads(
+                self.fingerprints_path.read_bytes(),
+            )
+        except ValueError:
+            return {}
+
+        # Fingerprints are valid only for the migration they were
+        # saved with, any other migration could have changed tables.
+        if fingerprints_document.get("version") != migration_version:
+            return {}
+
+        return typing.cast(
+            dict[str, str],
+            fingerprints_document.get("tables", {}),
+        )
+
+    def save_fingerprints(
+        self,
+        migration_version: str,
+        tables_fingerprints: dict[str, str],
+    ) -> None:
+        self.fingerprints_path.write_text(
+            json.dumps(
+                {
+                    "version": migration_version,
+                    "tables": tables_fingerprints,
+                },
+                indent=4,
+                sort_keys=True,
+            ),
+        )
@@ -0,0 +1,191 @@
+"""Source code generators for migration files."""
+from __future__ import annotations
+import abc
+import dataclasses
+import json
+import typing
+
+from qaspen_migrations.settings import (
+    JSON_MIGRATIONS_FORMAT,
+    PYTHON_MIGRATIONS_FORMAT,
+)
+
+
+if typing.TYPE_CHECKING:
+    from qaspen_migrations.operations.base import BaseOperation
+
+
+MIGRATION_MODULE_HEADER: typing.Final = """from __future__ import annotations
+import typing
+
+from qaspen import columns
+
+from qaspen_migrations.migrations.base import BaseMigration
+
+if typing.TYPE_CHECKING:
+    from qaspen_migrations.ddl.base import BaseDDLElement
+
+
+class Migration(BaseMigration):
+    version: str = "{version}"
+    previous_version: str | None = {previous_version}
+{merged_versions}    created_datetime: str = "{created_datetime}"
+
+
+"""
+MIGRATION_METHOD_HEADER: typing.Final = (
+    "    def {method_name}(self) -> list[BaseDDLElement]:\n"
+    "        return [\n"
+    "            "
+)
+MIGRATION_METHOD_FOOTER: typing.Final = """
+        ]"""
+OPERATION_SEPARATOR: typing.Final = """,
+            """
+MIGRATION_MERGED_VERSIONS: typing.Final = (
+    "    merged_versions: tuple[str, ...] = ({merged_versions},)\n"
+)
+METHODS_SEPARATOR: typing.Final = "\n\n"
+JSON_SEPARATORS: typing.Final = (",", ":")
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class BaseMigrationFormatter(abc.ABC):
+    version: str
+    previous_version: str | None
+    created_datetime: str
+    to_migrate_operations: typing.Iterable[BaseOperation] = ()
+    to_rollback_operations: typing.Iterable[BaseOperation] = ()
+    merged_versions: tuple[str, ...] = ()
+
+    # Migration is rendered piece by piece, so operations can be
+    # written as soon as they are generated, without holding all of them.
+    @abc.abstractmethod
+    def iter_head_chunks(self) -> typing.Iterator[str]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def render_operation(self, operation: BaseOperation) -> str:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def iter_operation_chunks(
+        self,
+        rendered_operation: str,
+        operation_idx: int,
+    ) -> typing.Iterator[str]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def iter_middle_chunks(self) -> typing.Iterator[str]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def iter_tail_chunks(self) -> typing.Iterator[str]:
+        raise NotImplementedError
+
+    def iter_chunks(self) -> typing.Iterator[str]:
+        yield from self.iter_head_chunks()
+        yield from self.__iter_operations_chunks(self.to_migrate_operations)
+        yield from self.iter_middle_chunks()
+        yield from self.__iter_operations_chunks(self.to_rollback_operations)
+        yield from self.iter_tail_chunks()
+
+    def __iter_operations_chunks(
+        self,
+        operations: typing.Iterable[BaseOperation],
+    ) -> typing.Iterator[str]:
+        for operation_idx, operation in enumerate(operations):
+            yield from self.iter_operation_chunks(
+                self.render_operation(operation),
+                operation_idx,
+            )
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class MigrationFormatter(BaseMigrationFormatter):
+    def iter_head_chunks(self) -> typing.Iterator[str]:
+        yield MIGRATION_MODULE_HEADER.format(
+            version=self.version,
+            previous_version=(
+                f'"{self.previous_version}"' if self.previous_version else None
+            ),
+            merged_versions=(
+                MIGRATION_MERGED_VERSIONS.format(
+                    merged_versions=", ".join(
+                        f'"{merged_version}"'
+                        for merged_version in self.merged_versions
+                    ),
+                )
+                if self.merged_versions
+                else ""
+            ),
+            created_datetime=self.created_datetime,
+        )
+        yield MIGRATION_METHOD_HEADER.format(method_name="migrate")
+
+    def render_operation(self, operation: BaseOperation) -> str:
+        return repr(operation)
+
+    def iter_operation_chunks(
+        self,
+        rendered_operation: str,
+        operation_idx: int,  # noqa: ARG002
+    ) -> typing.Iterator[str]:
+        yield rendered_operation
+        yield OPERATION_SEPARATOR
+
+    def iter_middle_chunks(self) -> typing.Iterator[str]:
+        yield MIGRATION_METHOD_FOOTER
+        yield METHODS_SEPARATOR
+        yield MIGRATION_METHOD_HEADER.format(method_name="rollback")
+
+    def iter_tail_chunks(self) -> typing.Iterator[str]:
+        yield MIGRATION_METHOD_FOOTER
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class JSONMigrationFormatter(BaseMigrationFormatter):
+    def iter_head_chunks(self) -> typing.Iterator[str]:
+        yield "{"
+        if self.merged_versions:
+            yield (
+                f'"merged_versions":{json.dumps(list(self.merged_versions))},'
+            )
+        for attribute_name in (
+            "version",
+            "previous_version",
+            "created_datetime",
+        ):
+            yield (
+                f"{json.dumps(attribute_name)}:"
+                f"{json.dumps(getattr(self, attribute_name))},"
+            )
+        yield '"migrate":['
+
+    def render_operation(self, operation: BaseOperation) -> str:
+        return json.dumps(
+            operation.to_json_dict(),
+            separators=JSON_SEPARATORS,
+        )
+
+    def iter_operation_chunks(
+        self,
+        rendered_operation: str,
+        operation_idx: int,
+    ) -> typing.Iterator[str]:
+        if operation_idx:
+            yield ","
+        yield rendered_operation
+
+    def iter_middle_chunks(self) -> typing.Iterator[str]:
+        yield '],"rollback":['
+
+    def iter_tail_chunks(self) -> typing.Iterator[str]:
+        yield "]}"
+
+
+MIGRATION_FORMATTERS: typing.Final[dict[str, type[BaseMigrationFormatter]]] = {
+    PYTHON_MIGRATIONS_FORMAT: MigrationFormatter,
+    JSON_MIGRATIONS_FORMAT: JSONMigrationFormatter,
+}
@@ -2,24 +2,60 @@ from __future__ import annotations
 import dataclasses
 import typing
 
+from qaspen.table.base_table import BaseTable
+
 from qaspen_migrations.exceptions import (
     MigrationGenerationError,
 )
 from qaspen_migrations.inspector.mapping import map_inspector
+from qaspen_migrations.migrations.compiler import MigrationsCompiler
+from qaspen_migrations.migrations.fingerprints import TablesFingerprints
 from qaspen_migrations.migrations.versioner import MigrationsVersioner
-from qaspen_migrations.migrations.writer import MigrationsWriter
+from qaspen_migrations.migrations.writer import (
+    MigrationsWriter,
+    iter_single_batch,
+)
 from qaspen_migrations.operations.generator import OperationGenerator
 from qaspen_migrations.schema import (
     ColumnInfo,
     TableDiff,
     TableDump,
 )
+from qaspen_migrations.settings import (
+    PYTHON_MIGRATIONS_FORMAT,
+    RENAMED_COLUMNS_ATTRIBUTE,
+)
 from qaspen_migrations.utils.loaders import MigrationLoader
 
 
 if typing.TYPE_CHECKING:
     from qaspen.abc.db_engine import BaseEngine
-    from qaspen.table.base_table import BaseTable
+
+    from qaspen_migrations.migrations.base import BaseMigration
+    from qaspen_migrations.migrations.writer import OperationsBatch
+    from qaspen_migrations.operations.base import BaseOperation
+
+
+RenameConfirmer: typing.TypeAlias = typing.Callable[
+    ["type[BaseTable]", ColumnInfo, ColumnInfo],
+    bool,
+]
+
+
+def make_removed_table(schemed_table_name: str) -> type[BaseTable]:
+    # Table is gone from the models, a bare table with its name
+    # is enough to inspect its columns and drop it.
+    table_schema, table_name = schemed_table_name.split(".", 1)
+    return typing.cast(
+        type[BaseTable],
+        type(
+            table_name,
+            (BaseTable,),
+            {},
+            table_name=table_name,
+            table_schema=table_schema,
+        ),
+    )
 
 
 @dataclasses.dataclass(slots=True, frozen=True)
@@ -31,31 +67,297 @@ class MigrationMaker:
     ]
     migrations_path: str
     tables: list[type[BaseTable]]
+    migrations_format: str = PYTHON_MIGRATIONS_FORMAT
+    use_fingerprints: bool = True
+    # Asks whether dropped column was renamed to added one,
+    # columns are never treated as renamed without it or a table hint.
+    rename_confirmer: RenameConfirmer | None = None
+    # Database tables inspected by previous runs, kept by long running
+    # processes along with the engine pool, changed only by migrations.
+    database_state_cache: dict[str, TableDump] | None = None
+
+    async def iter_database_state(
+        self,
+        tables: list[type[BaseTable]],
+    ) -> typing.AsyncIterator[TableDump]:
+        if self.database_state_cache is None:
+            async for table_dump in map_inspector(
+                self.engine,
+                tables,
+                keep_connection_pool=True,
+            ).iter_database_state():
+                yield table_dump
+            return
+
+        uncached_tables: typing.Final = [
+            table
+            for table in tables
+            if table.schemed_original_table_name()
+            not in self.database_state_cache
+        ]
+        if uncached_tables:
+            async for table_dump in map_inspector(
+                self.engine,
+                uncached_tables,
+                keep_connection_pool=True,
+            ).iter_database_state():
+                self.database_state_cache[
+                    table_dump.table.schemed_original_table_name()
+                ] = table_dump
+
+        # Reloaded modules define new table classes,
+        # cached dumps are bound to the current ones.
+        for table in tables:
+            yield dataclasses.replace(
+                self.database_state_cache[table.schemed_original_table_name()],
+                table=table,
+            )
+
+    async def compare_local_state(
+        self,
+        migrations_versioner: MigrationsVersioner,
+    ) -> tuple[list[TableDump], dict[str, str]]:
+        await migrations_versioner.is_version_in_database_up_to_date()
+        local_state: typing.Final = map_inspector(
+            self.engine,
+            self.tables,
+        ).inspect_local_state()
+        local_fingerprints: typing.Final = {
+            table_dump.table.schemed_original_table_name(): (
+                table_dump.fingerprint()
+            )
+            for table_dump in local_state
+        }
+        saved_fingerprints: typing.Final = (
+            TablesFingerprints(self.migrations_path).load_fingerprints(
+                migrations_versioner.get_latest_local_migration_version(),
+            )
+            if self.use_fingerprints
+            else {}
+        )
+        # Tables that were not changed since the latest migration
+        # are already in sync with database, there is no need to inspect them.
+        changed_local_state: typing.Final = [
+            table_dump
+            for table_dump in local_state
+            if saved_fingerprints.get(
+                table_dump.table.schemed_original_table_name(),
+            )
+            != local_fingerprints[
+                table_dump.table.schemed_original_table_name()
+            ]
+        ]
+        # Tables saved with the latest migration but missing locally
+        # were removed from the models, they are changed too.
+        removed_local_state: typing.Final = [
+            TableDump(table=make_removed_table(schemed_table_name))
+            for schemed_table_name in sorted(
+                saved_fingerprints.keys() - local_fingerprints.keys(),
+            )
+        ]
+        return (
+            [*changed_local_state, *removed_local_state],
+            local_fingerprints,
+        )
+
+    async def iter_tables_diff(
+        self,
+        changed_local_state: list[TableDump],
+    ) -> typing.AsyncIterator[TableDiff]:
+        if not changed_local_state:
+            return
+
+        # Every table is compared as soon as its columns are read
+        # from database, so only a single database dump is held at a time.
+        local_state_iterator: typing.Final = iter(changed_local_state)
+        try:
+            async for database_table_dump in self.iter_database_state(
+                [table_dump.table for table_dump in changed_local_state],
+            ):
+                yield self.__generate_tables_diff(
+                    [next(local_state_iterator)],
+                    [database_table_dump],
+                )[0]
+        finally:
+            if self.database_state_cache is None:
+                await self.engine.stop_connection_pool()
+
+    async def iter_operations_batches(
+        self,
+        changed_local_state: list[TableDump],
+    ) -> typing.AsyncIterator[
+        tuple[TableDiff, list[BaseOperation], list[BaseOperation]]
+    ]:
+        async for table_diff in self.iter_tables_diff(changed_local_state):
+            if table_diff.should_skip_table:
+                continue
+            to_migrate, to_rollback = OperationGenerator(
+                [table_diff],
+            ).generate_operations()
+            yield table_diff, to_migrate, to_rollback
+
+    async def stream_tables_diff(
+        self,
+    ) -> typing.AsyncIterator[
+        tuple[TableDiff, list[BaseOperation], list[BaseOperation]]
+    ]:
+        changed_local_state, _ = await self.compare_local_state(
+            MigrationsVersioner(
+                MigrationLoader(self.engine.engine_type, self.migrations_path),
+            ),
+        )
+        async for operations_batch in self.iter_operations_batches(
+            changed_local_state,
+        ):
+            yield operations_batch
+
+    async def generate_operations(
+        self,
+        migrations_versioner: MigrationsVersioner,
+    ) -> tuple[list[BaseOperation], list[BaseOperation], dict[str, str]]:
+        (
+            changed_local_state,
+            local_fingerprints,
+        ) = await self.compare_local_state(migrations_versioner)
+        table_diff: typing.Final = [
+            table_diff
+            async for table_diff in self.iter_tables_diff(changed_local_state)
+        ]
+        to_migrate, to_rollback = OperationGenerator(
+            table_diff,
+        ).generate_operations()
+        return to_migrate, to_rollback, local_fingerprints
 
     async def make_migrations(self) -> None:
         migrations_versioner: typing.Final = MigrationsVersioner(
             MigrationLoader(self.engine.engine_type, self.migrations_path),
         )
+        (
+            changed_local_state,
+            local_fingerprints,
+        ) = await self.compare_local_state(migrations_versioner)
 
-        await migrations_versioner.is_version_in_database_up_to_date()
-        inspector: typing.Final = map_inspector(self.engine, self.tables)
-        table_diff: typing.Final = self.__generate_tables_diff(
-            inspector.inspect_local_state(),
-            await inspector.inspect_database(),
+        # Operations of every table are written to the migration
+        # right after it's compared, none are collected in advance.
+        new_migration: typing.Final = await self.__save_migration(
+            migrations_versioner,
+            (
+                (to_migrate, to_rollback)
+                async for (
+                    _,
+                    to_migrate,
+                    to_rollback,
+                ) in self.iter_operations_batches(changed_local_state)
+            ),
+        )
+        TablesFingerprints(self.migrations_path).save_fingerprints(
+            new_migration.version,
+            local_fingerprints,
+        )
+
+    async def make_merge_migration(self) -> str:
+        migrations_versioner: typing.Final = MigrationsVersioner(
+            MigrationLoader(self.engine.engine_type, self.migrations_path),
         )
-        operations_generator: typing.Final = OperationGenerator(table_diff)
-        to_migrate, to_rollback = operations_generator.generate_operations()
+        if len(migrations_versioner.get_heads_versions()) < 2:  # noqa: PLR2004
+            raise MigrationGenerationError(
+                "Migrations have a single head, there is nothing to merge.",
+            )
 
-        migrations_writer = MigrationsWriter(
+        # Merge migration has no operations, tables fingerprints
+        # are not saved for it, so next migration inspects all tables.
+        merge_migration: typing.Final = await self.__save_migration(
             migrations_versioner,
-            to_migrate,
-            to_rollback,
+            iter_single_batch([], []),
         )
+        return merge_migration.version
 
-        await migrations_writer.save_migration()
+    async def __save_migration(
+        self,
+        migrations_versioner: MigrationsVersioner,
+        operations_batches: typing.AsyncIterable[OperationsBatch],
+    ) -> BaseMigration:
+        migrations_writer: typing.Final = MigrationsWriter(
+            migrations_versioner,
+            operations_batches,
+            self.migrations_format,
+        )
+
+        new_migration_path: typing.Final = (
+            await migrations_writer.save_migration()
+        )
+        new_migration: typing.Final = (
+            migrations_versioner.migrations_loader.load_migration(
+                new_migration_path,
+            )
+        )
+        migrations_compiler: typing.Final = MigrationsCompiler(
+            self.migrations_path,
+        )
+        migrations_compiler.save_compiled_migration(
+            new_migration,
+            migrations_compiler.compile_migration(new_migration),
+        )
+        return new_migration
+
+    def __find_renamed_columns(
+        self,
+        table: type[BaseTable],
+        to_add_columns: set[ColumnInfo],
+        to_drop_columns: set[ColumnInfo],
+    ) -> set[tuple[ColumnInfo, ColumnInfo]]:
+        renamed_columns_hint: typing.Final[dict[str, str]] = getattr(
+            table,
+            RENAMED_COLUMNS_ATTRIBUTE,
+            {},
+        )
+        to_rename_columns: typing.Final[
+            set[tuple[ColumnInfo, ColumnInfo]]
+        ] = set()
+        for to_add_column in sorted(
+            to_add_columns,
+            key=lambda to_add_column: to_add_column.db_column_name,
+        ):
+            renamed_from_column_name = renamed_columns_hint.get(
+                to_add_column.db_column_name,
+            )
+            for to_drop_column in sorted(
+                to_drop_columns,
+                key=lambda to_drop_column: to_drop_column.db_column_name,
+            ):
+                if renamed_from_column_name is not None:
+                    is_renamed = (
+                        to_drop_column.db_column_name
+                        == renamed_from_column_name
+                    )
+                else:
+                    # Only columns that differ by name alone can be
+                    # suspected, confirmation decides if it's a rename.
+                    is_renamed = (
+                        self.rename_confirmer is not None
+                        and dataclasses.replace(
+                            to_drop_column,
+                            db_column_name=to_add_column.db_column_name,
+                        )
+                        == to_add_column
+                        and self.rename_confirmer(
+                            table,
+                            to_drop_column,
+                            to_add_column,
+                        )
+                    )
+                if is_renamed:
+                    to_rename_columns.add((to_drop_column, to_add_column))
+                    to_drop_columns.remove(to_drop_column)
+                    break
+
+        for _, renamed_to_column in to_rename_columns:
+            to_add_columns.remove(renamed_to_column)
+
+        return to_rename_columns
 
-    @staticmethod
     def __generate_tables_diff(
+        self,
         dump_from_local_state: list[TableDump],
         dump_from_database: list[TableDump],
     ) -> list[TableDiff]:
@@ -98,16 +400,48 @@ class MigrationMaker:
                 not in column_names_from_local_state
             }
 
+            to_rename_columns = self.__find_renamed_columns(
+                table_dump_from_local_state.table,
+                to_add_columns,
+                to_drop_columns,
+            )
+            # Renamed column can have other changes too, they are
+            # applied to the column after it was renamed.
+            to_alter_columns: set[tuple[ColumnInfo, ColumnInfo]] = {
+                (
+                    dataclasses.replace(
+                        renamed_from_column,
+                        db_column_name=renamed_to_column.db_column_name,
+                    ),
+                    renamed_to_column,
+                )
+                for renamed_from_column, renamed_to_column in to_rename_columns
+                if dataclasses.replace(
+                    renamed_from_column,
+                    db_column_name=renamed_to_column.db_column_name,
+                )
+                != renamed_to_column
+            }
+
             # Columns are suspected for update
             # if they are neither created nor deleted
             suspected_for_update_columns_from_local_state = (
-                table_dump_from_local_state.table_columns - to_add_columns
+                table_dump_from_local_state.table_columns
+                - to_add_columns
+                - {
+                    renamed_to_column
+                    for _, renamed_to_column in to_rename_columns
+                }
             )
             suspected_for_update_columns_from_database = (
-                table_dump_from_database.table_columns - to_drop_columns
+                table_dump_from_database.table_columns
+                - to_drop_columns
+                - {
+                    renamed_from_column
+                    for renamed_from_column, _ in to_rename_columns
+                }
             )
 
-            to_alter_columns: set[tuple[ColumnInfo, ColumnInfo]] = set()
             for (
                 suspected_column_from_local_state,
                 suspected_column_from_database,
@@ -154,6 +488,13 @@ class MigrationMaker:
                     to_add_columns=to_add_columns,
                     to_alter_columns=to_alter_columns,
                     to_drop_columns=to_drop_columns,
+                    to_rename_columns=to_rename_columns,
+                    is_created_in_database=bool(
+                        table_dump_from_database.table_columns,
+                    ),
+                    is_defined_locally=bool(
+                        table_dump_from_local_state.table_columns,
+                    ),
                 ),
             )
 
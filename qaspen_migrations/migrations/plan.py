@@ -0,0 +1,86 @@
+from __future__ import annotations
+import dataclasses
+import json
+import typing
+
+from qaspen_migrations.exceptions import MigrationCorruptionError
+from qaspen_migrations.migrations.compiler import (
+    CompiledMigration,
+    VersionedStatement,
+)
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class MigrationPlan:
+    from_version: str | None
+    to_version: str | None
+    migrations: list[CompiledMigration]
+
+    @property
+    def migrate_statements(self) -> list[VersionedStatement]:
+        migrate_statements: typing.Final = [
+            (compiled_migration.version, compiled_statement)
+            for compiled_migration in self.migrations
+            for compiled_statement in compiled_migration.migrate_statements
+        ]
+        return [
+            VersionedStatement(
+                migration_version,
+                compiled_statement,
+                statement_position,
+            )
+            for statement_position, (
+                migration_version,
+                compiled_statement,
+            ) in enumerate(migrate_statements)
+        ]
+
+    def to_json_dict(self) -> dict[str, typing.Any]:
+        return {
+            "from_version": self.from_version,
+            "to_version": self.to_version,
+            "migrations": [
+                compiled_migration.to_json_dict()
+                for compiled_migration in self.migrations
+            ],
+        }
+
+    @classmethod
+    def from_json_dict(
+        cls: type[MigrationPlan],
+        plan_data: dict[str, typing.Any],
+    ) -> MigrationPlan:
+        try:
+            return cls(
+                from_version=plan_data["from_version"],
+                to_version=plan_data["to_version"],
+                migrations=[
+                    CompiledMigration.from_json_dict(compiled_migration)
+                    for compiled_migration in plan_data["migrations"]
+                ],
+            )
+        except (LookupError, TypeError) as exception:
+            raise MigrationCorruptionError(
+                "Migration plan is missing required fields.",
+            ) from exception
+
+    def save(self, plan_path: pathlib.Path) -> None:
+        plan_path.write_text(json.dumps(self.to_json_dict(), indent=4))
+
+    @classmethod
+    def load(
+        cls: type[MigrationPlan],
+        plan_path: pathlib.Path,
+    ) -> MigrationPlan:
+        try:
+            plan_data: typing.Final = json.loads(plan_path.read_bytes())
+        except ValueError as exception:
+            raise MigrationCorruptionError(
+                f"Migration plan {plan_path} is not a valid JSON.",
+            ) from exception
+
+        return cls.from_json_dict(plan_data)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+import asyncio
+import dataclasses
+import pathlib
+import typing
+
+from qaspen_migrations.migrations.versioner import MigrationsVersioner
+from qaspen_migrations.settings import WATCH_POLL_INTERVAL
+from qaspen_migrations.utils.loaders import MigrationLoader
+
+
+if typing.TYPE_CHECKING:
+    from qaspen_migrations.migrations.maker import MigrationMaker
+    from qaspen_migrations.operations.base import BaseOperation
+    from qaspen_migrations.utils.loaders import TableLoader
+
+
+PreviewCallback: typing.TypeAlias = typing.Callable[
+    [list["BaseOperation"]],
+    None,
+]
+PreviewErrorCallback: typing.TypeAlias = typing.Callable[[Exception], None]
+
+
+@dataclasses.dataclass
+class MigrationsPreviewer:
+    # Maker keeps inspected database tables between previews,
+    # so only tables changed since the last one are inspected.
+    migration_maker: MigrationMaker
+    tables_loader: TableLoader
+    poll_interval: float = WATCH_POLL_INTERVAL
+    database_version: str | None = dataclasses.field(
+        init=False,
+        default=None,
+    )
+    migrations_mtime_ns: int | None = dataclasses.field(
+        init=False,
+        default=None,
+    )
+
+    async def preview_operations(self) -> list[BaseOperation]:
+        migrations_versioner: typing.Final = MigrationsVersioner(
+            MigrationLoader(
+                self.migration_maker.engine.engine_type,
+                self.migration_maker.migrations_path,
+            ),
+        )
+        database_version: typing.Final = await (
+            migrations_versioner.fetch_current_migration_version_in_database()
+        )
+        # Database tables change only when migrations are applied.
+        if (
+            database_version != self.database_version
+            and self.migration_maker.database_state_cache is not None
+        ):
+            self.migration_maker.database_state_cache.clear()
+        self.database_version = database_version
+
+        to_migrate, _, _ = await self.migration_maker.generate_operations(
+            migrations_versioner,
+        )
+        return to_migrate
+
+    def reload_tables(self) -> bool:
+        # New migration makes other fingerprints the latest ones,
+        # so tables are compared again even if they didn't change.
+        migrations_mtime_ns: typing.Final = (
+            pathlib.Path(self.migration_maker.migrations_path)
+            .stat()
+            .st_mtime_ns
+        )
+        is_migrations_changed: typing.Final = (
+            migrations_mtime_ns != self.migrations_mtime_ns
+        )
+        self.migrations_mtime_ns = migrations_mtime_ns
+
+        reloaded_tables: typing.Final = self.tables_loader.reload_tables()
+        if reloaded_tables is not None:
+            self.migration_maker = dataclasses.replace(
+                self.migration_maker,
+                tables=reloaded_tables,
+            )
+        return is_migrations_changed or reloaded_tables is not None
+
+    async def watch(
+        self,
+        preview_callback: PreviewCallback,
+        error_callback: PreviewErrorCallback,
+    ) -> None:
+        is_changed = self.reload_tables()
+        while True:
+            if is_changed:
+                try:
+                    preview_callback(await self.preview_operations())
+                except Exception as exception:  # noqa: BLE001
+                    error_callback(exception)
+
+            await asyncio.sleep(self.poll_interval)
+            try:
+                is_changed = self.reload_tables()
+            except Exception as exception:  # noqa: BLE001
+                error_callback(exception)
+                is_changed = False
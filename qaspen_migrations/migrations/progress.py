@@ -0,0 +1,153 @@
+from __future__ import annotations
+import dataclasses
+import typing
+
+from qaspen_migrations.migrations.watchers import BaseBackendsWatcher
+
+
+if typing.TYPE_CHECKING:
+    import datetime
+
+
+# `pg_stat_progress_cluster` also covers `VACUUM FULL`,
+# statements without a progress view report only elapsed time.
+STATEMENTS_PROGRESS_QUERY: typing.Final = """
+    SELECT
+        activity.pid,
+        activity.query,
+        activity.query_start,
+        now() AS polled_at,
+        coalesce(create_index.phase, table_cluster.phase) AS phase,
+        coalesce(
+            create_index.blocks_done,
+            table_cluster.heap_blks_scanned
+        ) AS blocks_done,
+        coalesce(
+            create_index.blocks_total,
+            table_cluster.heap_blks_total
+        ) AS blocks_total
+    FROM pg_stat_activity AS activity
+    LEFT JOIN pg_stat_progress_create_index AS create_index
+        ON create_index.pid = activity.pid
+    LEFT JOIN pg_stat_progress_cluster AS table_cluster
+        ON table_cluster.pid = activity.pid
+    WHERE activity.pid = ANY(%s) AND activity.state = 'active'
+"""
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class StatementProgress:
+    migration_version: str | None
+    query: str
+    query_start: datetime.datetime
+    polled_at: datetime.datetime
+    phase: str | None = None
+    blocks_done: int | None = None
+    blocks_total: int | None = None
+    # Poll time and blocks done when the current phase was
+    # polled first, the phase rate is measured since then.
+    phase_polled_at: datetime.datetime | None = None
+    phase_blocks_done: int | None = None
+
+    @property
+    def elapsed(self) -> datetime.timedelta:
+        return self.polled_at - self.query_start
+
+    @property
+    def done_fraction(self) -> float | None:
+        if not self.blocks_total or self.blocks_done is None:
+            return None
+        return self.blocks_done / self.blocks_total
+
+    @property
+    def estimated_phase_finish(self) -> datetime.datetime | None:
+        # Phases of a statement scan different blocks at different
+        # rates, so only the current phase finish is estimated.
+        if (
+            not self.blocks_total
+            or self.blocks_done is None
+            or self.phase_polled_at is None
+            or self.phase_blocks_done is None
+        ):
+            return None
+        phase_blocks_done: typing.Final = (
+            self.blocks_done - self.phase_blocks_done
+        )
+        if phase_blocks_done <= 0:
+            return None
+        return self.polled_at + (self.polled_at - self.phase_polled_at) * (
+            (self.blocks_total - self.blocks_done) / phase_blocks_done
+        )
+
+
+ProgressCallback: typing.TypeAlias = typing.Callable[
+    [StatementProgress],
+    None,
+]
+
+
+@dataclasses.dataclass(kw_only=True)
+class ProgressMonitor(BaseBackendsWatcher):
+    # Called for every running statement on every poll.
+    progress_callback: ProgressCallback
+
+    # First progress polled in the current phase of every backend.
+    phases_progress: dict[int, StatementProgress] = dataclasses.field(
+        default_factory=dict,
+        init=False,
+    )
+
+    def untrack(self, backend_pid: int) -> None:
+        super().untrack(backend_pid)
+        self.phases_progress.pop(backend_pid, None)
+
+    def track_phase(
+        self,
+        backend_pid: int,
+        statement_progress: StatementProgress,
+    ) -> StatementProgress:
+        phase_progress = self.phases_progress.get(backend_pid)
+        if phase_progress is None or (
+            phase_progress.query_start,
+            phase_progress.phase,
+        ) != (statement_progress.query_start, statement_progress.phase):
+            phase_progress = statement_progress
+            self.phases_progress[backend_pid] = phase_progress
+        return dataclasses.replace(
+            statement_progress,
+            phase_polled_at=phase_progress.polled_at,
+            phase_blocks_done=phase_progress.blocks_done,
+        )
+
+    async def poll(self, connection: typing.Any) -> list[StatementProgress]:
+        progress_cursor: typing.Final = await connection.execute(
+            STATEMENTS_PROGRESS_QUERY,
+            [list(self.tracked_backends)],
+        )
+        return [
+            self.track_phase(
+                backend_pid,
+                StatementProgress(
+                    self.tracked_backends.get(backend_pid),
+                    query,
+                    query_start,
+                    polled_at,
+                    phase,
+                    blocks_done,
+                    blocks_total,
+                ),
+            )
+            for (
+                backend_pid,
+                query,
+                query_start,
+                polled_at,
+                phase,
+                blocks_done,
+                blocks_total,
+            ) in await progress_cursor.fetchall()
+        ]
+
+    async def inspect_backends(self, connection: typing.Any) -> None:
+        for statement_progress in await self.poll(connection):
+            self.progress_callback(statement_progress)
@@ -0,0 +1,183 @@
+from __future__ import annotations
+import dataclasses
+import functools
+import hashlib
+import typing
+
+from qaspen_migrations.exceptions import ConfigurationError
+from qaspen_migrations.migrations.applyer import MigrationsApplyer
+from qaspen_migrations.migrations.compiler import MigrationsCompiler
+from qaspen_migrations.migrations.executor import EXECUTOR_ENGINE_TYPES
+from qaspen_migrations.utils.common import replace_url_database
+
+
+if typing.TYPE_CHECKING:
+    from qaspen.abc.db_engine import BaseEngine
+
+    from qaspen_migrations.migrations.versioner import MigrationsVersioner
+
+
+MANIFEST_HASH_LENGTH: typing.Final = 12
+
+
+@dataclasses.dataclass
+class DatabaseProvisioner:
+    # Engine of the configured database, used only as
+    # a maintenance connection to create and drop databases.
+    engine: BaseEngine[
+        typing.Any,
+        typing.Any,
+        typing.Any,
+    ]
+    migrations_versioner: MigrationsVersioner
+    parallelism: int = 1
+
+    def __post_init__(self) -> None:
+        # Maintenance statements switch psycopg connections to autocommit,
+        # and templates are migrated with the executor anyway.
+        if self.engine.engine_type not in EXECUTOR_ENGINE_TYPES:
+            raise ConfigurationError(
+                f"Engine type {self.engine.engine_type} "
+                "can't provision databases\n"
+                f"Valid engine types: {', '.join(EXECUTOR_ENGINE_TYPES)}",
+            )
+
+    @functools.cached_property
+    def manifest_hash(self) -> str:
+        # Editing an applied migration in place must
+        # invalidate the template too, not only adding one.
+        manifest: typing.Final = hashlib.sha256()
+        local_migrations: typing.Final = (
+            self.migrations_versioner.get_migrations_after_version(None)
+        )
+        migrations_compiler: typing.Final = MigrationsCompiler(
+            self.migrations_versioner.migrations_loader.migrations_path,
+        )
+        for migration in local_migrations:
+            manifest.update(migration.version.encode())
+            migration_checksum = migrations_compiler.get_compiled_migration(
+                migration,
+            ).checksum
+            if migration_checksum is not None:
+                manifest.update(migration_checksum.encode())
+
+        return manifest.hexdigest()[:MANIFEST_HASH_LENGTH]
+
+    @property
+    def template_prefix(self) -> str:
+        return f"{self.engine.database}_template_"
+
+    @property
+    def template_name(self) -> str:
+        return f"{self.template_prefix}{self.manifest_hash}"
+
+    def database_engine(
+        self,
+        database_name: str,
+    ) -> BaseEngine[typing.Any, typing.Any, typing.Any]:
+        return type(self.engine)(
+            connection_url=replace_url_database(
+                self.engine.connection_url,
+                database_name,
+            ),
+        )
+
+    async def execute_maintenance(
+        self,
+        statement: str,
+        parameters: list[typing.Any] | None = None,
+    ) -> list[tuple[typing.Any, ...]]:
+        # `CREATE DATABASE` can't run inside a transaction.
+        connection = await self.engine.connection()
+        async with connection:
+            await connection.set_autocommit(True)
+            maintenance_cursor = await connection.execute(
+                statement,
+                parameters,
+            )
+            if maintenance_cursor.description is None:
+                return []
+            return typing.cast(
+                list[tuple[typing.Any, ...]],
+                await maintenance_cursor.fetchall(),
+            )
+
+    async def fetch_databases_names(self, name_prefix: str) -> list[str]:
+        databases_names_result: typing.Final = await self.execute_maintenance(
+            "SELECT datname FROM pg_database "
+            "WHERE starts_with(datname, %s)",
+            [name_prefix],
+        )
+        return [database_name for (database_name,) in databases_names_result]
+
+    async def drop_database(self, database_name: str) -> None:
+        await self.execute_maintenance(
+            f'DROP DATABASE IF EXISTS "{database_name}" WITH (FORCE)',
+        )
+
+    async def migrate_database(
+        self,
+        database_name: str,
+        check_round_trip: bool,
+    ) -> None:
+        database_engine: typing.Final = self.database_engine(database_name)
+        migrations_applyer: typing.Final = MigrationsApplyer(
+            engine=database_engine,
+            migrations_versioner=self.migrations_versioner,
+            parallelism=self.parallelism,
+        )
+        local_migrations: typing.Final = (
+            self.migrations_versioner.get_migrations_after_version(None)
+        )
+        try:
+            await migrations_applyer.apply_changes()
+            if not check_round_trip or not local_migrations:
+                return
+
+            # Root migration creates version tables themselves,
+            # so everything after it is rolled back and reapplied.
+            # Rollback of the root migration itself is not checked,
+            # the executor has nowhere to record an empty database.
+            root_migration: typing.Final = local_migrations[0]
+            await migrations_applyer.rollback_changes(
+                await migrations_applyer.plan_rollback(
+                    root_migration.version,
+                ),
+                root_migration.version,
+            )
+            await migrations_applyer.apply_changes()
+        finally:
+            # Template can't be copied while anyone is connected to it.
+            await database_engine.stop_connection_pool()
+
+    async def provision_template(self, check_round_trip: bool = True) -> bool:
+        template_name: typing.Final = self.template_name
+        existing_templates_names: typing.Final = (
+            await self.fetch_databases_names(self.template_prefix)
+        )
+        if template_name in existing_templates_names:
+            return False
+
+        for existing_template_name in existing_templates_names:
+            await self.drop_database(existing_template_name)
+
+        # Template is migrated under a temporary name and renamed
+        # only when it is complete, a failed run leaves no template.
+        building_template_name: typing.Final = f"{template_name}_building"
+        await self.execute_maintenance(
+            f'CREATE DATABASE "{building_template_name}"',
+        )
+        await self.migrate_database(building_template_name, check_round_trip)
+        await self.execute_maintenance(
+            f'ALTER DATABASE "{building_template_name}" '
+            f'RENAME TO "{template_name}"',
+        )
+        return True
+
+    async def create_workers(self, workers_names: list[str]) -> None:
+        for worker_name in workers_names:
+            await self.drop_database(worker_name)
+            await self.execute_maintenance(
+                f'CREATE DATABASE "{worker_name}" '
+                f'TEMPLATE "{self.template_name}"',
+            )
@@ -0,0 +1,350 @@
+from __future__ import annotations
+import dataclasses
+import enum
+import typing
+
+from qaspen_migrations.exceptions import MigrationVersionError
+from qaspen_migrations.migrations.compiler import (
+    CompiledStatement,
+    VersionedStatement,
+)
+from qaspen_migrations.settings import (
+    QaspenMigrationChecksumTable,
+    QaspenMigrationOperationTable,
+    QaspenMigrationTable,
+)
+
+
+if typing.TYPE_CHECKING:
+    from qaspen.abc.db_engine import BaseEngine
+    from qaspen.abc.db_transaction import BaseTransaction
+    from qaspen.table.base_table import BaseTable
+
+    from qaspen_migrations.migrations.compiler import CompiledMigration
+
+
+COMPLETION_CHECK_COLUMN: typing.Final = "completion_check_statement"
+
+
+class OperationStateEnum(enum.StrEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    # Statement failed and may have left half-built objects.
+    INVALID = "invalid"
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class MigrationsVersionStore:
+    table_schema: str | None = None
+
+    def schemed_table_name(self, table: type[BaseTable]) -> str:
+        return (
+            f"{self.table_schema or table._table_meta.table_schema}."
+            f"{table.original_table_name()}"
+        )
+
+    async def fetch_version(
+        self,
+        engine: BaseEngine[typing.Any, typing.Any, typing.Any],
+    ) -> str | None:
+        # Only a missing version table means nothing is applied yet,
+        # any other failure is not mistaken for an empty database.
+        async with engine.transaction() as transaction:
+            if not await self.is_table_created(
+                transaction,
+                QaspenMigrationTable,
+            ):
+                return None
+
+            version_result: typing.Final = await transaction.execute(
+                "SELECT version FROM "
+                f"{self.schemed_table_name(QaspenMigrationTable)}",
+                [],
+            )
+
+        if not version_result:
+            return None
+
+        corruption_error_message: typing.Final = (
+            "Database version is corrupted. "
+            "Consider dropping version table and "
+            "applying all migrations once again."
+        )
+        if len(version_result) > 1:
+            raise MigrationVersionError(corruption_error_message)
+        if version_result[0].get("version") is None:
+            raise MigrationVersionError(corruption_error_message)
+
+        return typing.cast(str, version_result[0]["version"])
+
+    async def bump_version(
+        self,
+        transaction: BaseTransaction[typing.Any, typing.Any],
+        version_to_bump: str,
+    ) -> None:
+        version_table_name: typing.Final = self.schemed_table_name(
+            QaspenMigrationTable,
+        )
+        await transaction.execute(
+            f"DELETE FROM {version_table_name}",
+            [],
+            fetch_results=False,
+        )
+        await transaction.execute(
+            f"INSERT INTO {version_table_name} (version) "
+            f"VALUES ('{version_to_bump}')",
+            [],
+            fetch_results=False,
+        )
+
+    async def is_table_created(
+        self,
+        transaction: BaseTransaction[typing.Any, typing.Any],
+        table: type[BaseTable],
+    ) -> bool:
+        table_schema, table_name = self.schemed_table_name(table).split(".")
+        table_query_result: typing.Final = await transaction.execute(
+            "SELECT 1 FROM information_schema.tables "
+            f"WHERE table_schema = '{table_schema}' "
+            f"AND table_name = '{table_name}'",
+            [],
+        )
+        return bool(table_query_result)
+
+    async def is_column_created(
+        self,
+        transaction: BaseTransaction[typing.Any, typing.Any],
+        table: type[BaseTable],
+        column_name: str,
+    ) -> bool:
+        table_schema, table_name = self.schemed_table_name(table).split(".")
+        column_query_result: typing.Final = await transaction.execute(
+            "SELECT 1 FROM information_schema.columns "
+            f"WHERE table_schema = '{table_schema}' "
+            f"AND table_name = '{table_name}' "
+            f"AND column_name = '{column_name}'",
+            [],
+        )
+        return bool(column_query_result)
+
+    async def record_checksums(
+        self,
+        transaction: BaseTransaction[typing.Any, typing.Any],
+        applied_migrations: list[CompiledMigration],
+    ) -> None:
+        checksums_to_record: typing.Final = [
+            f"('{applied_migration.version}', '{applied_migration.checksum}')"
+            for applied_migration in applied_migrations
+            if applied_migration.checksum is not None
+        ]
+        if not checksums_to_record:
+            return
+
+        # Checksum table is created by the migrations themselves,
+        # projects generated before it existed don't have it yet.
+        if not await self.is_table_created(
+            transaction,
+            QaspenMigrationChecksumTable,
+        ):
+            return
+
+        await transaction.execute(
+            "INSERT INTO "
+            f"{self.schemed_table_name(QaspenMigrationChecksumTable)} "
+            f"(version, checksum) VALUES {', '.join(checksums_to_record)}",
+            [],
+            fetch_results=False,
+        )
+
+    async def fetch_checksums(
+        self,
+        engine: BaseEngine[typing.Any, typing.Any, typing.Any],
+    ) -> dict[str, str]:
+        async with engine.transaction() as transaction:
+            if not await self.is_table_created(
+                transaction,
+                QaspenMigrationChecksumTable,
+            ):
+                return {}
+
+            checksums_result: typing.Final = await transaction.execute(
+                "SELECT version, checksum FROM "
+                f"{self.schemed_table_name(QaspenMigrationChecksumTable)}",
+                [],
+            )
+
+        return {
+            applied_checksum["version"]: applied_checksum["checksum"]
+            for applied_checksum in checksums_result
+        }
+
+    async def forget_versions(
+        self,
+        transaction: BaseTransaction[typing.Any, typing.Any],
+        table: type[BaseTable],
+        rolled_back_versions: list[str],
+    ) -> None:
+        if not rolled_back_versions or not await self.is_table_created(
+            transaction,
+            table,
+        ):
+            return
+
+        versions_to_forget: typing.Final = ", ".join(
+            f"'{rolled_back_version}'"
+            for rolled_back_version in rolled_back_versions
+        )
+        await transaction.execute(
+            f"DELETE FROM {self.schemed_table_name(table)} "
+            f"WHERE version IN ({versions_to_forget})",
+            [],
+            fetch_results=False,
+        )
+
+    async def forget_checksums(
+        self,
+        transaction: BaseTransaction[typing.Any, typing.Any],
+        rolled_back_versions: list[str],
+    ) -> None:
+        await self.forget_versions(
+            transaction,
+            QaspenMigrationChecksumTable,
+            rolled_back_versions,
+        )
+
+    async def record_operations(
+        self,
+        transaction: BaseTransaction[typing.Any, typing.Any],
+        versioned_statements: list[VersionedStatement],
+    ) -> bool:
+        # Operations table is created by the migrations themselves,
+        # statements of older projects are run without tracking.
+        if not await self.is_table_created(
+            transaction,
+            QaspenMigrationOperationTable,
+        ):
+            return False
+        if not versioned_statements:
+            return True
+
+        # Completion checks were added to the table later,
+        # older projects resume statements without them.
+        operations_columns: typing.Final = [
+            "version",
+            "statement_position",
+            "statement",
+            "cleanup_statement",
+            "dependency_key",
+            "state",
+        ]
+        if await self.is_column_created(
+            transaction,
+            QaspenMigrationOperationTable,
+            COMPLETION_CHECK_COLUMN,
+        ):
+            operations_columns.append(COMPLETION_CHECK_COLUMN)
+
+        operations_values: typing.Final = [
+            operation_value
+            for versioned_statement in versioned_statements
+            for operation_value in (
+                versioned_statement.migration_version,
+                versioned_statement.statement_position,
+                versioned_statement.compiled_statement.statement,
+                versioned_statement.compiled_statement.cleanup_statement,
+                versioned_statement.compiled_statement.dependency_key,
+                OperationStateEnum.PENDING.value,
+                versioned_statement.compiled_statement.completion_check_statement,
+            )[: len(operations_columns)]
+        ]
+        operation_placeholder: typing.Final = (
+            f"({', '.join(['%s'] * len(operations_columns))})"
+        )
+        operations_placeholders: typing.Final = ", ".join(
+            [operation_placeholder] * len(versioned_statements),
+        )
+        await transaction.execute(
+            "INSERT INTO "
+            f"{self.schemed_table_name(QaspenMigrationOperationTable)} "
+            f"({', '.join(operations_columns)}) "
+            f"VALUES {operations_placeholders}",
+            operations_values,
+            fetch_results=False,
+        )
+        return True
+
+    async def fetch_recorded_operations(
+        self,
+        engine: BaseEngine[typing.Any, typing.Any, typing.Any],
+    ) -> dict[VersionedStatement, OperationStateEnum]:
+        async with engine.transaction() as transaction:
+            if not await self.is_table_created(
+                transaction,
+                QaspenMigrationOperationTable,
+            ):
+                return {}
+
+            completion_check_column: typing.Final = (
+                COMPLETION_CHECK_COLUMN
+                if await self.is_column_created(
+                    transaction,
+                    QaspenMigrationOperationTable,
+                    COMPLETION_CHECK_COLUMN,
+                )
+                else f"NULL AS {COMPLETION_CHECK_COLUMN}"
+            )
+            operations_result: typing.Final = await transaction.execute(
+                "SELECT version, statement_position, statement, "
+                "cleanup_statement, dependency_key, state, "
+                f"{completion_check_column} FROM "
+                f"{self.schemed_table_name(QaspenMigrationOperationTable)} "
+                "ORDER BY recorded_at, statement_position",
+                [],
+            )
+
+        return {
+            VersionedStatement(
+                migration_version=recorded_operation["version"],
+                compiled_statement=CompiledStatement(
+                    statement=recorded_operation["statement"],
+                    dependency_key=recorded_operation["dependency_key"],
+                    is_transactional=False,
+                    cleanup_statement=recorded_operation["cleanup_statement"],
+                    completion_check_statement=recorded_operation[
+                        COMPLETION_CHECK_COLUMN
+                    ],
+                ),
+                statement_position=recorded_operation["statement_position"],
+            ): OperationStateEnum(recorded_operation["state"])
+            for recorded_operation in operations_result
+        }
+
+    async def update_operation_state(
+        self,
+        connection: typing.Any,
+        versioned_statement: VersionedStatement,
+        operation_state: OperationStateEnum,
+    ) -> None:
+        await connection.execute(
+            "UPDATE "
+            f"{self.schemed_table_name(QaspenMigrationOperationTable)} "
+            "SET state = %s, updated_at = NOW() "
+            "WHERE version = %s AND statement_position = %s",
+            [
+                operation_state.value,
+                versioned_statement.migration_version,
+                versioned_statement.statement_position,
+            ],
+        )
+
+    async def forget_operations(
+        self,
+        transaction: BaseTransaction[typing.Any, typing.Any],
+        rolled_back_versions: list[str],
+    ) -> None:
+        await self.forget_versions(
+            transaction,
+            QaspenMigrationOperationTable,
+            rolled_back_versions,
+        )
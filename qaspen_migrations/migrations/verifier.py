@@ -0,0 +1,73 @@
+from __future__ import annotations
+import dataclasses
+import enum
+import typing
+
+from qaspen_migrations.migrations.compiler import MigrationsCompiler
+from qaspen_migrations.migrations.store import MigrationsVersionStore
+
+
+if typing.TYPE_CHECKING:
+    from qaspen.abc.db_engine import BaseEngine
+
+    from qaspen_migrations.utils.loaders import MigrationLoader
+
+
+class MigrationDriftEnum(enum.StrEnum):
+    MODIFIED = "modified"
+    MISSING = "missing"
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class MigrationDrift:
+    version: str
+    drift: MigrationDriftEnum
+
+
+@dataclasses.dataclass
+class MigrationsVerifier:
+    engine: BaseEngine[
+        typing.Any,
+        typing.Any,
+        typing.Any,
+    ]
+    migrations_loader: MigrationLoader
+    # Verify migrations applied to this schema, used
+    # for schema-per-tenant setups like in the applyer.
+    table_schema: str | None = None
+
+    async def fetch_applied_checksums(self) -> dict[str, str]:
+        return await MigrationsVersionStore(
+            self.table_schema,
+        ).fetch_checksums(self.engine)
+
+    def calculate_local_checksums(self) -> dict[str, str]:
+        migrations_compiler: typing.Final = MigrationsCompiler(
+            self.migrations_loader.migrations_path,
+        )
+        return {
+            self.migrations_loader.version_from_migration_path(
+                migration_file_path,
+            ): migrations_compiler.calculate_path_checksum(migration_file_path)
+            for migration_file_path in (
+                self.migrations_loader.iter_migration_paths()
+            )
+        }
+
+    async def verify(self) -> list[MigrationDrift]:
+        applied_checksums: typing.Final = await self.fetch_applied_checksums()
+        local_checksums: typing.Final = self.calculate_local_checksums()
+
+        migrations_drift: typing.Final = []
+        for version, applied_checksum in applied_checksums.items():
+            local_checksum = local_checksums.get(version)
+            if local_checksum is None:
+                migrations_drift.append(
+                    MigrationDrift(version, MigrationDriftEnum.MISSING),
+                )
+            elif local_checksum != applied_checksum:
+                migrations_drift.append(
+                    MigrationDrift(version, MigrationDriftEnum.MODIFIED),
+                )
+
+        return migrations_drift
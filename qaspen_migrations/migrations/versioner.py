@@ -1,18 +1,13 @@
 from __future__ import annotations
 import dataclasses
-import datetime
+import heapq
 import typing
 
-import pytz
-
 from qaspen_migrations.exceptions import (
     MigrationCorruptionError,
     MigrationVersionError,
 )
-from qaspen_migrations.settings import (
-    MIGRATION_CREATED_DATETIME_FORMAT,
-    QaspenMigrationTable,
-)
+from qaspen_migrations.settings import QaspenMigrationTable
 
 
 if typing.TYPE_CHECKING:
@@ -27,34 +22,119 @@ class MigrationsVersioner:
         init=False,
         default_factory=list,
     )
+    __migrations_indexes: dict[str, int] = dataclasses.field(
+        init=False,
+        default_factory=dict,
+    )
+    __children_versions: dict[str, list[str]] = dataclasses.field(
+        init=False,
+        default_factory=dict,
+    )
 
     def __post_init__(self) -> None:
-        self.__sorted_migrations = self.__sort_migrations_by_created_at(
-            self.migrations_loader.load_migrations(),
+        migrations_by_version: typing.Final[dict[str, BaseMigration]] = {}
+        for migration in self.migrations_loader.load_migrations():
+            if migration.version in migrations_by_version:
+                raise MigrationCorruptionError(
+                    f"Migration version {migration.version} is duplicated.",
+                )
+            migrations_by_version[migration.version] = migration
+
+        self.__children_versions = {
+            version: [] for version in migrations_by_version
+        }
+        for migration in migrations_by_version.values():
+            for parent_version in self.get_parent_versions(migration):
+                if parent_version not in migrations_by_version:
+                    raise MigrationCorruptionError(
+                        f"Migration {migration.version} depends on "
+                        f"missing migration {parent_version}.",
+                    )
+                self.__children_versions[parent_version].append(
+                    migration.version,
+                )
+
+        self.__sorted_migrations = self.__sort_migrations_topologically(
+            migrations_by_version,
         )
+        self.__migrations_indexes = {
+            migration.version: migration_idx
+            for migration_idx, migration in enumerate(
+                self.__sorted_migrations,
+            )
+        }
 
     @staticmethod
-    def __sort_migrations_by_created_at(
-        migrations_to_sort: list[BaseMigration],
+    def get_parent_versions(migration: BaseMigration) -> list[str]:
+        parent_versions: typing.Final = list(migration.merged_versions)
+        if migration.previous_version is not None:
+            parent_versions.insert(0, migration.previous_version)
+        return parent_versions
+
+    def __sort_migrations_topologically(
+        self,
+        migrations_by_version: dict[str, BaseMigration],
     ) -> list[BaseMigration]:
+        # Creation datetime only breaks ties between independent
+        # branches, so order stays stable between runs.
         try:
-            return sorted(
-                migrations_to_sort,
-                key=lambda migration: datetime.datetime.strptime(
-                    migration.created_datetime,
-                    MIGRATION_CREATED_DATETIME_FORMAT,
-                ).replace(tzinfo=pytz.UTC),
-            )
+            sorting_keys: typing.Final = {
+                version: (migration.created_datetime, version)
+                for version, migration in migrations_by_version.items()
+            }
         except AttributeError as exception:
             raise MigrationCorruptionError(
                 "Cannot parse created at migration attribute.",
             ) from exception
 
+        not_sorted_parents_count: typing.Final = {
+            version: len(self.get_parent_versions(migration))
+            for version, migration in migrations_by_version.items()
+        }
+        ready_migrations: typing.Final = [
+            sorting_keys[version]
+            for version, parents_count in not_sorted_parents_count.items()
+            if not parents_count
+        ]
+        heapq.heapify(ready_migrations)
+        sorted_migrations: typing.Final[list[BaseMigration]] = []
+        while ready_migrations:
+            _, version = heapq.heappop(ready_migrations)
+            sorted_migrations.append(migrations_by_version[version])
+            for child_version in self.__children_versions[version]:
+                not_sorted_parents_count[child_version] -= 1
+                if not not_sorted_parents_count[child_version]:
+                    heapq.heappush(
+                        ready_migrations,
+                        sorting_keys[child_version],
+                    )
+
+        if len(sorted_migrations) != len(migrations_by_version):
+            raise MigrationCorruptionError(
+                "Migrations have a cycle in their previous versions.",
+            )
+
+        return sorted_migrations
+
+    def get_heads_versions(self) -> list[str]:
+        return [
+            migration.version
+            for migration in self.__sorted_migrations
+            if not self.__children_versions[migration.version]
+        ]
+
     def get_latest_local_migration_version(self) -> str | None:
-        if not self.__sorted_migrations:
+        heads_versions: typing.Final = self.get_heads_versions()
+        if not heads_versions:
             return None
 
-        return self.__sorted_migrations[-1].version
+        if len(heads_versions) > 1:
+            raise MigrationVersionError(
+                "Migrations have multiple heads: "
+                f"{', '.join(heads_versions)}. Please, run 'merge' command",
+            )
+
+        return heads_versions[0]
 
     async def is_version_in_database_up_to_date(self) -> None:
         version_in_database: typing.Final = (
@@ -99,17 +179,79 @@ class MigrationsVersioner:
             return latest_migration_version[0].get("version")
 
     async def get_not_applyed_migrations(self) -> list[BaseMigration]:
-        version_in_database: typing.Final = (
-            await self.fetch_current_migration_version_in_database()
+        return self.get_migrations_after_version(
+            await self.fetch_current_migration_version_in_database(),
         )
 
-        if version_in_database is None:
-            return self.__sorted_migrations
+    def get_migration(self, version: str) -> BaseMigration | None:
+        migration_idx: typing.Final = self.__migrations_indexes.get(version)
+        if migration_idx is None:
+            return None
+
+        return self.__sorted_migrations[migration_idx]
+
+    def get_ancestors_versions(self, version: str | None) -> set[str]:
+        if version is None:
+            return set()
+
+        if version not in self.__migrations_indexes:
+            raise MigrationVersionError(
+                f"Version {version} is missing in existing migrations.",
+            )
+
+        ancestors_versions: typing.Final = {version}
+        versions_to_visit: typing.Final = [version]
+        while versions_to_visit:
+            migration = self.__sorted_migrations[
+                self.__migrations_indexes[versions_to_visit.pop()]
+            ]
+            for parent_version in self.get_parent_versions(migration):
+                if parent_version not in ancestors_versions:
+                    ancestors_versions.add(parent_version)
+                    versions_to_visit.append(parent_version)
+
+        return ancestors_versions
+
+    def get_migrations_after_version(
+        self,
+        version_in_database: str | None,
+        applied_versions: typing.AbstractSet[str] = frozenset(),
+    ) -> list[BaseMigration]:
+        # Version is bumped after each migration, so a branch applied
+        # before it isn't its ancestor, migrations recorded as applied
+        # are never pending again.
+        pending_versions: typing.Final = (
+            self.get_ancestors_versions(
+                self.get_latest_local_migration_version(),
+            )
+            - self.get_ancestors_versions(version_in_database)
+            - applied_versions
+        )
+        return [
+            migration
+            for migration in self.__sorted_migrations
+            if migration.version in pending_versions
+        ]
 
-        for migration_idx, migration in enumerate(self.__sorted_migrations):
-            if migration.version == version_in_database:
-                return self.__sorted_migrations[migration_idx + 1 :]
+    def get_migrations_to_rollback(
+        self,
+        version_in_database: str | None,
+        to_version: str,
+    ) -> list[BaseMigration]:
+        database_ancestors_versions: typing.Final = (
+            self.get_ancestors_versions(version_in_database)
+        )
+        if to_version not in database_ancestors_versions:
+            raise MigrationVersionError(
+                f"Version {to_version} is not applied to the database.",
+            )
 
-        raise MigrationVersionError(
-            "Version from database is missing in existing migrations.",
+        to_rollback_versions: typing.Final = (
+            database_ancestors_versions
+            - self.get_ancestors_versions(to_version)
         )
+        return [
+            migration
+            for migration in reversed(self.__sorted_migrations)
+            if migration.version in to_rollback_versions
+        ]
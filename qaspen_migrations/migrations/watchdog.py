@@ -0,0 +1,114 @@
+from __future__ import annotations
+import contextlib
+import dataclasses
+import typing
+
+from qaspen_migrations.exceptions import MigrationLockError
+from qaspen_migrations.migrations.watchers import BaseBackendsWatcher
+
+
+# `pg_blocking_pids` also reports sessions queued behind
+# a lock the migration is still waiting for itself.
+BLOCKED_SESSIONS_QUERY: typing.Final = """
+    SELECT
+        blocking_pid,
+        count(*) AS blocked_sessions,
+        extract(
+            epoch FROM max(now() - {wait_start})
+        )::float AS max_blocked_seconds
+    FROM pg_stat_activity AS activity
+    CROSS JOIN LATERAL unnest(pg_blocking_pids(activity.pid)) AS blocking_pid
+    WHERE blocking_pid = ANY(%s)
+    GROUP BY blocking_pid
+"""
+# `pg_locks.waitstart` exists since PostgreSQL 14, older servers only
+# know when state of a session changed, that is when its query started.
+LOCK_WAIT_START: typing.Final = """coalesce(
+        (
+            SELECT min(waiting_lock.waitstart)
+            FROM pg_locks AS waiting_lock
+            WHERE waiting_lock.pid = activity.pid
+            AND NOT waiting_lock.granted
+        ),
+        activity.query_start
+    )"""
+STATE_CHANGE_WAIT_START: typing.Final = "activity.state_change"
+LOCK_WAIT_START_SERVER_VERSION: typing.Final = 140000
+SERVER_VERSION_QUERY: typing.Final = (
+    "SELECT current_setting('server_version_num')::integer"
+)
+CANCEL_BACKEND_QUERY: typing.Final = "SELECT pg_cancel_backend(%s)"
+
+
+@dataclasses.dataclass(kw_only=True)
+class LockWatchdog(BaseBackendsWatcher):
+    # Migration statement is cancelled when it blocks more
+    # sessions or blocks any of them longer than allowed.
+    max_blocked_sessions: int | None = None
+    max_blocked_seconds: float | None = None
+    cancellation_reason: str | None = dataclasses.field(
+        init=False,
+        default=None,
+    )
+    blocked_sessions_query: str = dataclasses.field(
+        init=False,
+        default=BLOCKED_SESSIONS_QUERY.format(wait_start=LOCK_WAIT_START),
+    )
+
+    async def prepare(self, connection: typing.Any) -> None:
+        server_version_cursor: typing.Final = await connection.execute(
+            SERVER_VERSION_QUERY,
+        )
+        (server_version,) = await server_version_cursor.fetchone()
+        if server_version < LOCK_WAIT_START_SERVER_VERSION:
+            self.blocked_sessions_query = BLOCKED_SESSIONS_QUERY.format(
+                wait_start=STATE_CHANGE_WAIT_START,
+            )
+
+    def is_limit_exceeded(
+        self,
+        blocked_sessions: int,
+        max_blocked_seconds: float,
+    ) -> bool:
+        return (
+            self.max_blocked_sessions is not None
+            and blocked_sessions > self.max_blocked_sessions
+        ) or (
+            self.max_blocked_seconds is not None
+            and max_blocked_seconds > self.max_blocked_seconds
+        )
+
+    async def inspect_backends(self, connection: typing.Any) -> None:
+        blocked_cursor: typing.Final = await connection.execute(
+            self.blocked_sessions_query,
+            [list(self.tracked_backends)],
+        )
+        for (
+            blocking_pid,
+            blocked_sessions,
+            max_blocked_seconds,
+        ) in await blocked_cursor.fetchall():
+            if self.cancellation_reason is not None:
+                return
+            if not self.is_limit_exceeded(
+                blocked_sessions,
+                max_blocked_seconds,
+            ):
+                continue
+
+            self.cancellation_reason = (
+                f"Migration {self.tracked_backends.get(blocking_pid)} "
+                f"was cancelled, it blocked {blocked_sessions} sessions "
+                f"for up to {max_blocked_seconds:.1f} seconds."
+            )
+            await connection.execute(CANCEL_BACKEND_QUERY, [blocking_pid])
+
+    @contextlib.asynccontextmanager
+    async def watching(self) -> typing.AsyncIterator[None]:
+        try:
+            async with super().watching():
+                yield
+        except Exception as exception:  # noqa: BLE001
+            if self.cancellation_reason is None:
+                raise
+            raise MigrationLockError(self.cancellation_reason) from exception
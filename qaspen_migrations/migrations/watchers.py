@@ -0,0 +1,82 @@
+from __future__ import annotations
+import abc
+import asyncio
+import contextlib
+import dataclasses
+import typing
+
+from qaspen_migrations.settings import PROGRESS_POLL_INTERVAL
+
+
+if typing.TYPE_CHECKING:
+    from qaspen.abc.db_engine import BaseEngine
+
+
+@dataclasses.dataclass
+class BaseBackendsWatcher(abc.ABC):
+    engine: BaseEngine[
+        typing.Any,
+        typing.Any,
+        typing.Any,
+    ]
+    poll_interval: float = PROGRESS_POLL_INTERVAL
+    # Backends running migration statements mapped to
+    # versions of migrations they are running.
+    tracked_backends: dict[int, str | None] = dataclasses.field(
+        default_factory=dict,
+    )
+
+    def track(self, backend_pid: int, migration_version: str | None) -> None:
+        self.tracked_backends[backend_pid] = migration_version
+
+    def untrack(self, backend_pid: int) -> None:
+        self.tracked_backends.pop(backend_pid, None)
+
+    @abc.abstractmethod
+    async def inspect_backends(self, connection: typing.Any) -> None:
+        raise NotImplementedError
+
+    async def prepare(  # noqa: B027
+        self,
+        connection: typing.Any,
+    ) -> None:
+        # Called once the side connection is opened, before any polling.
+        pass
+
+    async def watch(self) -> None:
+        # Backends are inspected on a side connection, migration
+        # connections are busy running statements.
+        connection: typing.Final = await self.engine.connection()
+        async with connection:
+            await connection.set_autocommit(True)
+            await self.prepare(connection)
+            while True:
+                if self.tracked_backends:
+                    await self.inspect_backends(connection)
+                await asyncio.sleep(self.poll_interval)
+
+    @contextlib.asynccontextmanager
+    async def watching(self) -> typing.AsyncIterator[None]:
+        # Watched task is cancelled when watcher fails,
+        # then exception of the watcher is raised instead.
+        watched_task: typing.Final = asyncio.current_task()
+        watch_task: typing.Final = asyncio.create_task(self.watch())
+        is_watching = True
+
+        def cancel_watched_task(_: asyncio.Task[None]) -> None:
+            if (
+                is_watching
+                and watched_task is not None
+                and not watch_task.cancelled()
+                and watch_task.exception() is not None
+            ):
+                watched_task.cancel()
+
+        watch_task.add_done_callback(cancel_watched_task)
+        try:
+            yield
+        finally:
+            is_watching = False
+            watch_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await watch_task
@@ -2,88 +2,193 @@
 from __future__ import annotations
 import dataclasses
 import datetime
+import json
 import pathlib
-import textwrap
+import tempfile
 import typing
 import uuid
 
 import aiofile
 import pytz
-from jinja2 import Environment, FileSystemLoader
 
+from qaspen_migrations.exceptions import ConfigurationError
+from qaspen_migrations.migrations.formatter import MIGRATION_FORMATTERS
 from qaspen_migrations.settings import (
     MIGRATION_CREATED_DATETIME_FORMAT,
-    QASPEN_MIGRATION_TEMPLATE_NAME,
-    QASPEN_MIGRATION_TEMPLATE_PATH,
+    MIGRATION_FILE_SUFFIXES,
+    MIGRATION_WRITE_CHUNK_SIZE,
+    PYTHON_MIGRATIONS_FORMAT,
 )
 
 
 if typing.TYPE_CHECKING:
+    from aiofile.utils import FileIOWrapperBase
+
+    from qaspen_migrations.migrations.formatter import BaseMigrationFormatter
     from qaspen_migrations.migrations.versioner import MigrationsVersioner
     from qaspen_migrations.operations.base import BaseOperation
 
 
-jinja_environment: typing.Final = Environment(
-    loader=FileSystemLoader(QASPEN_MIGRATION_TEMPLATE_PATH),
-    autoescape=True,
-    enable_async=True,
-)
+ENGINE_TYPE_DATABASE_TYPE_FOR_DDL_MAP = {
+    "PSQLPsycopg": "postgres",
+    "PSQLAsyncpg": "postgres",
+}
+
+# Operations to migrate and to rollback, generated for a single table.
+OperationsBatch: typing.TypeAlias = tuple[
+    typing.Iterable["BaseOperation"],
+    typing.Iterable["BaseOperation"],
+]
 
-ENGINE_TYPE_DATABASE_TYPE_FOR_DDL_MAP = {"PSQLPsycopg": "postgres"}
 
+async def iter_single_batch(
+    to_migrate_operations: typing.Iterable[BaseOperation],
+    to_rollback_operations: typing.Iterable[BaseOperation],
+) -> typing.AsyncIterator[OperationsBatch]:
+    yield to_migrate_operations, to_rollback_operations
 
-def dedent_filter(input_text: str) -> str:
-    return textwrap.dedent(input_text)
 
+@dataclasses.dataclass(slots=True)
+class ChunksBuffer:
+    migration_file: FileIOWrapperBase
+    buffered_chunks: list[str] = dataclasses.field(default_factory=list)
+    buffered_size: int = 0
 
-jinja_environment.filters["dedent"] = dedent_filter
+    async def write(self, chunks: typing.Iterable[str]) -> None:
+        for chunk in chunks:
+            self.buffered_chunks.append(chunk)
+            self.buffered_size += len(chunk)
+            if self.buffered_size >= MIGRATION_WRITE_CHUNK_SIZE:
+                await self.flush()
+
+    async def flush(self) -> None:
+        await self.migration_file.write("".join(self.buffered_chunks))
+        self.buffered_chunks.clear()
+        self.buffered_size = 0
 
 
 @dataclasses.dataclass
 class MigrationsWriter:
     migrations_versioner: MigrationsVersioner
-    to_migrate_operations: list[BaseOperation]
-    to_rollback_operations: list[BaseOperation]
+    # Batches are written as soon as they are generated, rollback
+    # method goes after migrate one, so its batches are spooled.
+    operations_batches: typing.AsyncIterable[OperationsBatch]
+    migrations_format: str = PYTHON_MIGRATIONS_FORMAT
+
+    def __post_init__(self) -> None:
+        if self.migrations_format not in MIGRATION_FORMATTERS:
+            raise ConfigurationError(
+                f"Invalid migrations format {self.migrations_format}\n"
+                f"Valid formats: {', '.join(MIGRATION_FORMATTERS.keys())}",
+            )
 
     def generate_migration_name(
         self,
         created_datetime: str,
         version: str,
     ) -> str:
-        return f"{created_datetime}_{version}.py"
+        return (
+            f"{created_datetime}_{version}"
+            f"{MIGRATION_FILE_SUFFIXES[self.migrations_format]}"
+        )
 
-    async def save_migration(self) -> str:
+    async def save_migration(self) -> pathlib.Path:
         new_migration_version: typing.Final = uuid.uuid4().hex[:10]
         new_migration_created_datetime: typing.Final = datetime.datetime.now(
             tz=pytz.UTC,
         ).strftime(MIGRATION_CREATED_DATETIME_FORMAT)
-        previous_migration_version: typing.Final = (
-            self.migrations_versioner.get_latest_local_migration_version()
+        # New migration follows every head, more than one head
+        # is possible only when branches are merged.
+        heads_versions: typing.Final = (
+            self.migrations_versioner.get_heads_versions()
         )
 
-        migration_template: typing.Final = jinja_environment.get_template(
-            QASPEN_MIGRATION_TEMPLATE_NAME,
-        )
-        rendered_migration_template: typing.Final = (
-            await migration_template.render_async(
-                version=new_migration_version,
-                created_datetime=new_migration_created_datetime,
-                previous_version=previous_migration_version,
-                elements_to_migrate=self.to_migrate_operations,
-                elements_to_rollback=self.to_rollback_operations,
-            )
+        migration_formatter: typing.Final = MIGRATION_FORMATTERS[
+            self.migrations_format
+        ](
+            version=new_migration_version,
+            previous_version=heads_versions[0] if heads_versions else None,
+            created_datetime=new_migration_created_datetime,
+            merged_versions=tuple(heads_versions[1:]),
         )
 
+        new_migration_path: typing.Final = pathlib.Path(
+            self.migrations_versioner.migrations_loader.migrations_path,
+        ) / self.generate_migration_name(
+            new_migration_created_datetime,
+            new_migration_version,
+        )
         async with aiofile.async_open(
-            pathlib.Path(
-                self.migrations_versioner.migrations_loader.migrations_path,
-            )
-            / self.generate_migration_name(
-                new_migration_created_datetime,
-                new_migration_version,
-            ),
+            new_migration_path,
             "w",
         ) as new_migration_file:
-            await new_migration_file.write(rendered_migration_template)
-
-        return new_migration_version
+            chunks_buffer: typing.Final = ChunksBuffer(new_migration_file)
+            await chunks_buffer.write(migration_formatter.iter_head_chunks())
+            with tempfile.TemporaryFile("w+") as rollback_spool:
+                rollback_batches_offsets: typing.Final[list[int]] = []
+                migrate_operation_idx = 0
+                async for (
+                    to_migrate_operations,
+                    to_rollback_operations,
+                ) in self.operations_batches:
+                    for to_migrate_operation in to_migrate_operations:
+                        await chunks_buffer.write(
+                            migration_formatter.iter_operation_chunks(
+                                migration_formatter.render_operation(
+                                    to_migrate_operation,
+                                ),
+                                migrate_operation_idx,
+                            ),
+                        )
+                        migrate_operation_idx += 1
+
+                    rollback_batches_offsets.append(rollback_spool.tell())
+                    rollback_spool.write(
+                        json.dumps(
+                            [
+                                migration_formatter.render_operation(
+                                    to_rollback_operation,
+                                )
+                                for to_rollback_operation in (
+                                    to_rollback_operations
+                                )
+                            ],
+                        )
+                        + "\n",
+                    )
+
+                await chunks_buffer.write(
+                    migration_formatter.iter_middle_chunks(),
+                )
+                await self.__write_spooled_rollback(
+                    migration_formatter,
+                    chunks_buffer,
+                    rollback_spool,
+                    rollback_batches_offsets,
+                )
+
+            await chunks_buffer.write(migration_formatter.iter_tail_chunks())
+            await chunks_buffer.flush()
+
+        return new_migration_path
+
+    @staticmethod
+    async def __write_spooled_rollback(
+        migration_formatter: BaseMigrationFormatter,
+        chunks_buffer: ChunksBuffer,
+        rollback_spool: typing.IO[str],
+        rollback_batches_offsets: list[int],
+    ) -> None:
+        # Later tables are rolled back first, while
+        # every batch is already in the rollback order.
+        rollback_operation_idx = 0
+        for rollback_batch_offset in reversed(rollback_batches_offsets):
+            rollback_spool.seek(rollback_batch_offset)
+            for rendered_operation in json.loads(rollback_spool.readline()):
+                await chunks_buffer.write(
+                    migration_formatter.iter_operation_chunks(
+                        rendered_operation,
+                        rollback_operation_idx,
+                    ),
+                )
+                rollback_operation_idx += 1
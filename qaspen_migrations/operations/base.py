@@ -7,19 +7,24 @@ import typing
 from qaspen_migrations.ddl.base import (
     BaseAddColumnDDLElement,
     BaseAlterColumnDDLElement,
+    BaseCopyFromDDLElement,
+    BaseCreateIndexDDLElement,
     BaseCreateTableDDLElement,
     BaseDDLElement,
     BaseDropColumnDDLElement,
+    BaseDropIndexDDLElement,
     BaseDropTableDDLElement,
+    BaseRenameColumnDDLElement,
+    CopyFormatEnum,
 )
+from qaspen_migrations.exceptions import MigrationCorruptionError
+from qaspen_migrations.schema import ColumnInfo
 from qaspen_migrations.utils.parsing import table_column_to_column_info
 
 
 if typing.TYPE_CHECKING:
     from qaspen.columns.base import Column
 
-    from qaspen_migrations.schema import ColumnInfo
-
 
 class OperationsEnum(enum.StrEnum):
     CREATE_TABLE = "self.operations.create_table"
@@ -27,6 +32,10 @@ class OperationsEnum(enum.StrEnum):
     ALTER_COLUMN = "self.operations.alter_column"
     ADD_COLUMN = "self.operations.add_column"
     DROP_COLUMN = "self.operations.drop_column"
+    RENAME_COLUMN = "self.operations.rename_column"
+    COPY_FROM = "self.operations.copy_from"
+    CREATE_INDEX = "self.operations.create_index"
+    DROP_INDEX = "self.operations.drop_index"
 
 
 CreateTableDDLElementType = typing.TypeVar(
@@ -49,6 +58,22 @@ DropColumnDDLElementType = typing.TypeVar(
     "DropColumnDDLElementType",
     bound=BaseDropColumnDDLElement,
 )
+RenameColumnDDLElementType = typing.TypeVar(
+    "RenameColumnDDLElementType",
+    bound=BaseRenameColumnDDLElement,
+)
+CopyFromDDLElementType = typing.TypeVar(
+    "CopyFromDDLElementType",
+    bound=BaseCopyFromDDLElement,
+)
+CreateIndexDDLElementType = typing.TypeVar(
+    "CreateIndexDDLElementType",
+    bound=BaseCreateIndexDDLElement,
+)
+DropIndexDDLElementType = typing.TypeVar(
+    "DropIndexDDLElementType",
+    bound=BaseDropIndexDDLElement,
+)
 
 
 class BaseOperationsImplementer(
@@ -58,6 +83,10 @@ class BaseOperationsImplementer(
         AlterColumnDDLElementType,
         AddColumnDDLElementType,
         DropColumnDDLElementType,
+        RenameColumnDDLElementType,
+        CopyFromDDLElementType,
+        CreateIndexDDLElementType,
+        DropIndexDDLElementType,
     ],
 ):
     create_table_ddl: type[CreateTableDDLElementType]
@@ -65,6 +94,10 @@ class BaseOperationsImplementer(
     alter_column_table_ddl: type[AlterColumnDDLElementType]
     add_column_ddl: type[AddColumnDDLElementType]
     drop_column_ddl: type[DropColumnDDLElementType]
+    rename_column_ddl: type[RenameColumnDDLElementType]
+    copy_from_ddl: type[CopyFromDDLElementType]
+    create_index_ddl: type[CreateIndexDDLElementType]
+    drop_index_ddl: type[DropIndexDDLElementType]
 
     def create_table(
         self,
@@ -110,10 +143,87 @@ class BaseOperationsImplementer(
     def drop_column(self, table_name: str, column_name: str) -> BaseDDLElement:
         return self.drop_column_ddl(table_name, column_name)
 
+    def rename_column(
+        self,
+        table_name: str,
+        from_column_name: str,
+        to_column_name: str,
+    ) -> BaseDDLElement:
+        return self.rename_column_ddl(
+            table_name,
+            from_column_name,
+            to_column_name,
+        )
+
+    def copy_from(
+        self,
+        table_name: str,
+        source_path: str,
+        column_names: list[str],
+        source_format: CopyFormatEnum = CopyFormatEnum.CSV,
+        defer_indexes: bool = False,
+    ) -> BaseDDLElement:
+        return self.copy_from_ddl(
+            table_name,
+            source_path,
+            column_names,
+            CopyFormatEnum(source_format),
+            defer_indexes,
+        )
+
+    def create_index(
+        self,
+        table_name: str,
+        index_name: str,
+        column_names: list[str],
+        is_unique: bool = False,
+    ) -> BaseDDLElement:
+        return self.create_index_ddl(
+            table_name,
+            index_name,
+            column_names,
+            is_unique,
+        )
+
+    def drop_index(self, table_name: str, index_name: str) -> BaseDDLElement:
+        return self.drop_index_ddl(table_name, index_name)
+
+
+OperationsImplementer: typing.TypeAlias = BaseOperationsImplementer[
+    BaseCreateTableDDLElement,
+    BaseDropTableDDLElement,
+    BaseAlterColumnDDLElement,
+    BaseAddColumnDDLElement,
+    BaseDropColumnDDLElement,
+    BaseRenameColumnDDLElement,
+    BaseCopyFromDDLElement,
+    BaseCreateIndexDDLElement,
+    BaseDropIndexDDLElement,
+]
+
 
 class BaseOperation(abc.ABC):
     operation: OperationsEnum
 
+    @abc.abstractmethod
+    def to_json_dict(self) -> dict[str, typing.Any]:
+        raise NotImplementedError
+
+    @classmethod
+    @abc.abstractmethod
+    def from_json_dict(
+        cls: type[BaseOperation],
+        operation_data: dict[str, typing.Any],
+    ) -> BaseOperation:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def to_ddl_element(
+        self,
+        operations_implementer: OperationsImplementer,
+    ) -> BaseDDLElement:
+        raise NotImplementedError
+
 
 @dataclasses.dataclass(slots=True, frozen=True, repr=False)
 class CreateTableOperation(BaseOperation):
@@ -131,6 +241,38 @@ class CreateTableOperation(BaseOperation):
                 [{", ".join(columns_repr)}],
             )"""
 
+    def to_json_dict(self) -> dict[str, typing.Any]:
+        return {
+            "operation": self.operation.name.lower(),
+            "table_name": self.table_name,
+            "to_add_columns": [
+                column_info.to_json_dict()
+                for column_info in self.to_add_columns_info
+            ],
+        }
+
+    @classmethod
+    def from_json_dict(
+        cls: type[CreateTableOperation],
+        operation_data: dict[str, typing.Any],
+    ) -> CreateTableOperation:
+        return cls(
+            operation_data["table_name"],
+            [
+                ColumnInfo.from_json_dict(column_data)
+                for column_data in operation_data["to_add_columns"]
+            ],
+        )
+
+    def to_ddl_element(
+        self,
+        operations_implementer: OperationsImplementer,
+    ) -> BaseDDLElement:
+        return operations_implementer.create_table_ddl(
+            self.table_name,
+            self.to_add_columns_info,
+        )
+
 
 @dataclasses.dataclass(slots=True, frozen=True, repr=False)
 class DropTableOperation(BaseOperation):
@@ -140,6 +282,25 @@ class DropTableOperation(BaseOperation):
     def __repr__(self) -> str:
         return f"""{self.operation}("{self.table_name}")"""
 
+    def to_json_dict(self) -> dict[str, typing.Any]:
+        return {
+            "operation": self.operation.name.lower(),
+            "table_name": self.table_name,
+        }
+
+    @classmethod
+    def from_json_dict(
+        cls: type[DropTableOperation],
+        operation_data: dict[str, typing.Any],
+    ) -> DropTableOperation:
+        return cls(operation_data["table_name"])
+
+    def to_ddl_element(
+        self,
+        operations_implementer: OperationsImplementer,
+    ) -> BaseDDLElement:
+        return operations_implementer.drop_table_ddl(self.table_name)
+
 
 @dataclasses.dataclass(slots=True, frozen=True, repr=False)
 class AlterColumnOperation(BaseOperation):
@@ -155,6 +316,35 @@ class AlterColumnOperation(BaseOperation):
                 {self.to_column_info.to_table_column_repr()},
             )"""
 
+    def to_json_dict(self) -> dict[str, typing.Any]:
+        return {
+            "operation": self.operation.name.lower(),
+            "table_name": self.table_name,
+            "from_column": self.from_column_info.to_json_dict(),
+            "to_column": self.to_column_info.to_json_dict(),
+        }
+
+    @classmethod
+    def from_json_dict(
+        cls: type[AlterColumnOperation],
+        operation_data: dict[str, typing.Any],
+    ) -> AlterColumnOperation:
+        return cls(
+            operation_data["table_name"],
+            ColumnInfo.from_json_dict(operation_data["from_column"]),
+            ColumnInfo.from_json_dict(operation_data["to_column"]),
+        )
+
+    def to_ddl_element(
+        self,
+        operations_implementer: OperationsImplementer,
+    ) -> BaseDDLElement:
+        return operations_implementer.alter_column_table_ddl(
+            self.table_name,
+            self.from_column_info,
+            self.to_column_info,
+        )
+
 
 @dataclasses.dataclass(slots=True, frozen=True, repr=False)
 class AddColumnOperation(BaseOperation):
@@ -168,6 +358,32 @@ class AddColumnOperation(BaseOperation):
             {self.to_add_column.to_table_column_repr()},
         )"""
 
+    def to_json_dict(self) -> dict[str, typing.Any]:
+        return {
+            "operation": self.operation.name.lower(),
+            "table_name": self.table_name,
+            "to_add_column": self.to_add_column.to_json_dict(),
+        }
+
+    @classmethod
+    def from_json_dict(
+        cls: type[AddColumnOperation],
+        operation_data: dict[str, typing.Any],
+    ) -> AddColumnOperation:
+        return cls(
+            operation_data["table_name"],
+            ColumnInfo.from_json_dict(operation_data["to_add_column"]),
+        )
+
+    def to_ddl_element(
+        self,
+        operations_implementer: OperationsImplementer,
+    ) -> BaseDDLElement:
+        return operations_implementer.add_column_ddl(
+            self.table_name,
+            self.to_add_column,
+        )
+
 
 @dataclasses.dataclass(slots=True, frozen=True, repr=False)
 class DropColumnOperation(BaseOperation):
@@ -180,3 +396,244 @@ class DropColumnOperation(BaseOperation):
             "{self.table_name}",
             "{self.column_name}",
         )"""
+
+    def to_json_dict(self) -> dict[str, typing.Any]:
+        return {
+            "operation": self.operation.name.lower(),
+            "table_name": self.table_name,
+            "column_name": self.column_name,
+        }
+
+    @classmethod
+    def from_json_dict(
+        cls: type[DropColumnOperation],
+        operation_data: dict[str, typing.Any],
+    ) -> DropColumnOperation:
+        return cls(
+            operation_data["table_name"],
+            operation_data["column_name"],
+        )
+
+    def to_ddl_element(
+        self,
+        operations_implementer: OperationsImplementer,
+    ) -> BaseDDLElement:
+        return operations_implementer.drop_column_ddl(
+            self.table_name,
+            self.column_name,
+        )
+
+
+@dataclasses.dataclass(slots=True, frozen=True, repr=False)
+class RenameColumnOperation(BaseOperation):
+    table_name: str
+    from_column_name: str
+    to_column_name: str
+    operation: OperationsEnum = OperationsEnum.RENAME_COLUMN
+
+    def __repr__(self) -> str:
+        return f"""{self.operation}(
+            "{self.table_name}",
+            "{self.from_column_name}",
+            "{self.to_column_name}",
+        )"""
+
+    def to_json_dict(self) -> dict[str, typing.Any]:
+        return {
+            "operation": self.operation.name.lower(),
+            "table_name": self.table_name,
+            "from_column_name": self.from_column_name,
+            "to_column_name": self.to_column_name,
+        }
+
+    @classmethod
+    def from_json_dict(
+        cls: type[RenameColumnOperation],
+        operation_data: dict[str, typing.Any],
+    ) -> RenameColumnOperation:
+        return cls(
+            operation_data["table_name"],
+            operation_data["from_column_name"],
+            operation_data["to_column_name"],
+        )
+
+    def to_ddl_element(
+        self,
+        operations_implementer: OperationsImplementer,
+    ) -> BaseDDLElement:
+        return operations_implementer.rename_column_ddl(
+            self.table_name,
+            self.from_column_name,
+            self.to_column_name,
+        )
+
+
+@dataclasses.dataclass(slots=True, frozen=True, repr=False)
+class CopyFromOperation(BaseOperation):
+    table_name: str
+    source_path: str
+    column_names: list[str]
+    source_format: CopyFormatEnum = CopyFormatEnum.CSV
+    defer_indexes: bool = False
+    operation: OperationsEnum = OperationsEnum.COPY_FROM
+
+    def __repr__(self) -> str:
+        return f"""{self.operation}(
+            "{self.table_name}",
+            "{self.source_path}",
+            {self.column_names!r},
+            "{self.source_format}",
+            {self.defer_indexes},
+        )"""
+
+    def to_json_dict(self) -> dict[str, typing.Any]:
+        return {
+            "operation": self.operation.name.lower(),
+            "table_name": self.table_name,
+            "source_path": self.source_path,
+            "column_names": self.column_names,
+            "source_format": self.source_format.value,
+            "defer_indexes": self.defer_indexes,
+        }
+
+    @classmethod
+    def from_json_dict(
+        cls: type[CopyFromOperation],
+        operation_data: dict[str, typing.Any],
+    ) -> CopyFromOperation:
+        return cls(
+            operation_data["table_name"],
+            operation_data["source_path"],
+            operation_data["column_names"],
+            CopyFormatEnum(
+                operation_data.get("source_format", CopyFormatEnum.CSV),
+            ),
+            operation_data.get("defer_indexes", False),
+        )
+
+    def to_ddl_element(
+        self,
+        operations_implementer: OperationsImplementer,
+    ) -> BaseDDLElement:
+        return operations_implementer.copy_from_ddl(
+            self.table_name,
+            self.source_path,
+            self.column_names,
+            self.source_format,
+            self.defer_indexes,
+        )
+
+
+@dataclasses.dataclass(slots=True, frozen=True, repr=False)
+class CreateIndexOperation(BaseOperation):
+    table_name: str
+    index_name: str
+    column_names: list[str]
+    is_unique: bool = False
+    operation: OperationsEnum = OperationsEnum.CREATE_INDEX
+
+    def __repr__(self) -> str:
+        return f"""{self.operation}(
+            "{self.table_name}",
+            "{self.index_name}",
+            {self.column_names!r},
+            {self.is_unique},
+        )"""
+
+    def to_json_dict(self) -> dict[str, typing.Any]:
+        return {
+            "operation": self.operation.name.lower(),
+            "table_name": self.table_name,
+            "index_name": self.index_name,
+            "column_names": self.column_names,
+            "is_unique": self.is_unique,
+        }
+
+    @classmethod
+    def from_json_dict(
+        cls: type[CreateIndexOperation],
+        operation_data: dict[str, typing.Any],
+    ) -> CreateIndexOperation:
+        return cls(
+            operation_data["table_name"],
+            operation_data["index_name"],
+            operation_data["column_names"],
+            operation_data.get("is_unique", False),
+        )
+
+    def to_ddl_element(
+        self,
+        operations_implementer: OperationsImplementer,
+    ) -> BaseDDLElement:
+        return operations_implementer.create_index_ddl(
+            self.table_name,
+            self.index_name,
+            self.column_names,
+            self.is_unique,
+        )
+
+
+@dataclasses.dataclass(slots=True, frozen=True, repr=False)
+class DropIndexOperation(BaseOperation):
+    table_name: str
+    index_name: str
+    operation: OperationsEnum = OperationsEnum.DROP_INDEX
+
+    def __repr__(self) -> str:
+        return f"""{self.operation}(
+            "{self.table_name}",
+            "{self.index_name}",
+        )"""
+
+    def to_json_dict(self) -> dict[str, typing.Any]:
+        return {
+            "operation": self.operation.name.lower(),
+            "table_name": self.table_name,
+            "index_name": self.index_name,
+        }
+
+    @classmethod
+    def from_json_dict(
+        cls: type[DropIndexOperation],
+        operation_data: dict[str, typing.Any],
+    ) -> DropIndexOperation:
+        return cls(
+            operation_data["table_name"],
+            operation_data["index_name"],
+        )
+
+    def to_ddl_element(
+        self,
+        operations_implementer: OperationsImplementer,
+    ) -> BaseDDLElement:
+        return operations_implementer.drop_index_ddl(
+            self.table_name,
+            self.index_name,
+        )
+
+
+OPERATIONS_MAPPING: typing.Final[dict[OperationsEnum, type[BaseOperation]]] = {
+    OperationsEnum.CREATE_TABLE: CreateTableOperation,
+    OperationsEnum.DROP_TABLE: DropTableOperation,
+    OperationsEnum.ALTER_COLUMN: AlterColumnOperation,
+    OperationsEnum.ADD_COLUMN: AddColumnOperation,
+    OperationsEnum.DROP_COLUMN: DropColumnOperation,
+    OperationsEnum.RENAME_COLUMN: RenameColumnOperation,
+    OperationsEnum.COPY_FROM: CopyFromOperation,
+    OperationsEnum.CREATE_INDEX: CreateIndexOperation,
+    OperationsEnum.DROP_INDEX: DropIndexOperation,
+}
+
+
+def operation_from_json_dict(
+    operation_data: dict[str, typing.Any],
+) -> BaseOperation:
+    try:
+        operation_type: typing.Final = OPERATIONS_MAPPING[
+            OperationsEnum[operation_data["operation"].upper()]
+        ]
+        return operation_type.from_json_dict(operation_data)
+    except (LookupError, AttributeError, ValueError) as exception:
+        raise MigrationCorruptionError(
+            f"Cannot parse migration operation: {operation_data}.",
+        ) from exception
@@ -9,6 +9,7 @@ from qaspen_migrations.operations.base import (
     CreateTableOperation,
     DropColumnOperation,
     DropTableOperation,
+    RenameColumnOperation,
 )
 
 
@@ -112,8 +113,29 @@ class OperationGenerator:
         self.__to_rollback_elements.append(
             AlterColumnOperation(
                 table_name,
-                alter_from_column_info,
                 alter_to_column_info,
+                alter_from_column_info,
+            ),
+        )
+
+    def __generate_rename_column(
+        self,
+        table_name: str,
+        rename_from_column_info: ColumnInfo,
+        rename_to_column_info: ColumnInfo,
+    ) -> None:
+        self.__to_migrate_elements.append(
+            RenameColumnOperation(
+                table_name,
+                rename_from_column_info.db_column_name,
+                rename_to_column_info.db_column_name,
+            ),
+        )
+        self.__to_rollback_elements.append(
+            RenameColumnOperation(
+                table_name,
+                rename_to_column_info.db_column_name,
+                rename_from_column_info.db_column_name,
             ),
         )
 
@@ -140,6 +162,17 @@ class OperationGenerator:
                 )
                 continue
 
+            # Columns are renamed first, so other operations
+            # can refer to them by their new names.
+            for (
+                rename_from_column,
+                rename_to_column,
+            ) in table_diff.to_rename_columns:
+                self.__generate_rename_column(
+                    schemed_table_name,
+                    rename_from_column,
+                    rename_to_column,
+                )
             for to_create_column in table_diff.to_add_columns:
                 self.__generate_add_column(
                     schemed_table_name,
@@ -160,4 +193,5 @@ class OperationGenerator:
                     alter_to_column,
                 )
 
-        return self.__to_migrate_elements, self.__to_rollback_elements
+        # Rollback undoes operations in the reverse order.
+        return self.__to_migrate_elements, self.__to_rollback_elements[::-1]
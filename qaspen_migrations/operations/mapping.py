@@ -19,11 +19,16 @@ IMPLEMENTER_ENGINE_MAPPING: typing.Final[
                 typing.Any,
                 typing.Any,
                 typing.Any,
+                typing.Any,
+                typing.Any,
+                typing.Any,
+                typing.Any,
             ]
         ],
     ]
 ] = {
     "PSQLPsycopg": PostgresOperationsImplementer,
+    "PSQLAsyncpg": PostgresOperationsImplementer,
 }
 
 
@@ -35,6 +40,10 @@ def map_operations_implementer(
     typing.Any,
     typing.Any,
     typing.Any,
+    typing.Any,
+    typing.Any,
+    typing.Any,
+    typing.Any,
 ]:
     try:
         return IMPLEMENTER_ENGINE_MAPPING[engine_type]()
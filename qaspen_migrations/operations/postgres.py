@@ -11,6 +11,10 @@ class PostgresOperationsImplementer(
         typing.Any,
         typing.Any,
         typing.Any,
+        typing.Any,
+        typing.Any,
+        typing.Any,
+        typing.Any,
     ],
 ):
     create_table_ddl = postgres.CreateTable
@@ -18,3 +22,7 @@ class PostgresOperationsImplementer(
     alter_column_table_ddl = postgres.AlterColumn
     add_column_ddl = postgres.AddColumn
     drop_column_ddl = postgres.DropColumn
+    rename_column_ddl = postgres.RenameColumn
+    copy_from_ddl = postgres.CopyFrom
+    create_index_ddl = postgres.CreateIndex
+    drop_index_ddl = postgres.DropIndex
@@ -1,17 +1,17 @@
 from __future__ import annotations
 import dataclasses
+import hashlib
+import json
 import typing
 
 from qaspen import columns
+from qaspen.columns.base import Column
 from qaspen.table.base_table import BaseTable  # noqa: TCH002
 
+from qaspen_migrations.exceptions import ColumnParsingError
 from qaspen_migrations.utils.column_repr import to_column_repr
 
 
-if typing.TYPE_CHECKING:
-    from qaspen.columns.base import Column
-
-
 @dataclasses.dataclass(slots=True, frozen=True)
 class ColumnInfo:
     main_column_type: type[Column[typing.Any]]
@@ -46,7 +46,7 @@ class ColumnInfo:
                 db_column_name=self.db_column_name,
                 is_null=self.is_null,
                 database_default=self.database_default,
-                inner_column=to_column_repr(
+                inner_column_repr=to_column_repr(
                     self.inner_column_type,
                     precision=self.precision,
                     scale=self.scale,
@@ -64,11 +64,95 @@ class ColumnInfo:
             max_length=self.max_length,
         )
 
+    def to_json_dict(self) -> dict[str, typing.Any]:
+        return {
+            "main_column_type": self.main_column_type.__name__,
+            "inner_column_type": (
+                self.inner_column_type.__name__
+                if self.inner_column_type is not None
+                else None
+            ),
+            "db_column_name": self.db_column_name,
+            "is_null": self.is_null,
+            "database_default": self.database_default,
+            "max_length": self.max_length,
+            "precision": self.precision,
+            "scale": self.scale,
+        }
+
+    @classmethod
+    def from_json_dict(
+        cls: type[ColumnInfo],
+        column_data: dict[str, typing.Any],
+    ) -> ColumnInfo:
+        inner_column_type_name: typing.Final = column_data.get(
+            "inner_column_type",
+        )
+        try:
+            return cls(
+                main_column_type=_column_type_from_name(
+                    column_data["main_column_type"],
+                ),
+                inner_column_type=(
+                    _column_type_from_name(inner_column_type_name)
+                    if inner_column_type_name is not None
+                    else None
+                ),
+                db_column_name=column_data["db_column_name"],
+                is_null=column_data["is_null"],
+                database_default=column_data.get("database_default"),
+                max_length=column_data.get("max_length"),
+                precision=column_data.get("precision"),
+                scale=column_data.get("scale"),
+            )
+        except LookupError as exception:
+            raise ColumnParsingError(
+                f"Column data is incomplete: {column_data}.",
+            ) from exception
+
     @property
     def is_array(self) -> bool:
         return issubclass(self.main_column_type, columns.ArrayColumn)
 
 
+def _column_type_from_name(column_type_name: str) -> type[Column[typing.Any]]:
+    column_type: typing.Final = getattr(columns, column_type_name, None)
+    if not isinstance(column_type, type) or not issubclass(
+        column_type,
+        Column,
+    ):
+        raise ColumnParsingError(f"Unknown column type '{column_type_name}'.")
+
+    return column_type
+
+
+def _columns_to_json(
+    columns_info: set[ColumnInfo],
+) -> list[dict[str, typing.Any]]:
+    return [
+        column_info.to_json_dict()
+        for column_info in sorted(
+            columns_info,
+            key=lambda column_info: column_info.db_column_name,
+        )
+    ]
+
+
+def _column_pairs_to_json(
+    column_pairs: set[tuple[ColumnInfo, ColumnInfo]],
+) -> list[dict[str, typing.Any]]:
+    return [
+        {
+            "from_column": from_column_info.to_json_dict(),
+            "to_column": to_column_info.to_json_dict(),
+        }
+        for from_column_info, to_column_info in sorted(
+            column_pairs,
+            key=lambda column_pair: column_pair[1].db_column_name,
+        )
+    ]
+
+
 @dataclasses.dataclass(slots=True, frozen=True)
 class TableDump:
     table: type[BaseTable]
@@ -85,6 +169,19 @@ class TableDump:
             table_column.db_column_name for table_column in self.table_columns
         }
 
+    def fingerprint(self) -> str:
+        table_columns_document: typing.Final = json.dumps(
+            [
+                table_column.to_json_dict()
+                for table_column in sorted(
+                    self.table_columns,
+                    key=lambda table_column: table_column.db_column_name,
+                )
+            ],
+            sort_keys=True,
+        )
+        return hashlib.sha256(table_columns_document.encode()).hexdigest()
+
 
 @dataclasses.dataclass(slots=True, frozen=True)
 class TableDiff:
@@ -98,14 +195,29 @@ class TableDiff:
     to_drop_columns: set[ColumnInfo] = dataclasses.field(
         default_factory=set,
     )
+    # Pairs like (from_column, to_column) of renamed columns.
+    to_rename_columns: set[tuple[ColumnInfo, ColumnInfo]] = dataclasses.field(
+        default_factory=set,
+    )
+    is_created_in_database: bool = True
+    is_defined_locally: bool = True
+
+    def to_json_dict(self) -> dict[str, typing.Any]:
+        return {
+            "table_name": self.table.schemed_original_table_name(),
+            "is_created_in_database": self.is_created_in_database,
+            "is_defined_locally": self.is_defined_locally,
+            "to_add_columns": _columns_to_json(self.to_add_columns),
+            "to_drop_columns": _columns_to_json(self.to_drop_columns),
+            "to_alter_columns": _column_pairs_to_json(self.to_alter_columns),
+            "to_rename_columns": _column_pairs_to_json(
+                self.to_rename_columns,
+            ),
+        }
 
     @property
     def should_create_table(self) -> bool:
-        return (
-            bool(self.to_add_columns)
-            and not bool(self.to_alter_columns)
-            and not bool(self.to_drop_columns)
-        )
+        return not self.is_created_in_database and self.is_defined_locally
 
     @property
     def should_skip_table(self) -> bool:
@@ -113,12 +225,9 @@ class TableDiff:
             not bool(self.to_add_columns)
             and not bool(self.to_alter_columns)
             and not bool(self.to_drop_columns)
+            and not bool(self.to_rename_columns)
         )
 
     @property
     def should_drop_table(self) -> bool:
-        return (
-            not bool(self.to_add_columns)
-            and not bool(self.to_alter_columns)
-            and bool(self.to_drop_columns)
-        )
+        return self.is_created_in_database and not self.is_defined_locally
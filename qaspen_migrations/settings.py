@@ -1,17 +1,32 @@
 from __future__ import annotations
 import dataclasses
-import pathlib
 import typing
 
 from qaspen import BaseTable, columns
 
 
 QASPEN_MIGRATIONS_TOML_KEY: typing.Final = "qaspen-migrations"
-QASPEN_MIGRATION_TEMPLATE_PATH: typing.Final = (
-    pathlib.Path(__file__).parent / "migrations"
-)
-QASPEN_MIGRATION_TEMPLATE_NAME: typing.Final = "template.j2"
 MIGRATION_CREATED_DATETIME_FORMAT: typing.Final = "%Y-%m-%d_%H:%M:%S"
+MIGRATION_WRITE_CHUNK_SIZE: typing.Final = 64 * 1024
+COPY_READ_CHUNK_SIZE: typing.Final = 64 * 1024
+# Catalog rows fetched at once while inspecting database.
+INSPECT_FETCH_SIZE: typing.Final = 1000
+# Seconds between polls of running statements progress.
+PROGRESS_POLL_INTERVAL: typing.Final = 1.0
+# Seconds between checks of tables modules in watch mode.
+WATCH_POLL_INTERVAL: typing.Final = 0.2
+PYTHON_MIGRATIONS_FORMAT: typing.Final = "python"
+JSON_MIGRATIONS_FORMAT: typing.Final = "json"
+COMPILED_MIGRATIONS_DIRECTORY: typing.Final = "__compiled__"
+TABLES_FINGERPRINTS_FILE: typing.Final = "__fingerprints__.json"
+TABLES_INDEX_FILE: typing.Final = "__tables__.json"
+TABLE_PATH_WILDCARDS: typing.Final = frozenset("*?[")
+# Table attribute mapping new column names to old ones.
+RENAMED_COLUMNS_ATTRIBUTE: typing.Final = "__renamed_columns__"
+MIGRATION_FILE_SUFFIXES: typing.Final = {
+    PYTHON_MIGRATIONS_FORMAT: ".py",
+    JSON_MIGRATIONS_FORMAT: ".json",
+}
 
 
 @dataclasses.dataclass(slots=True, frozen=True)
@@ -19,6 +34,9 @@ class QaspenMigrationsSettings:
     migrations_path: str
     engine_path: str
     tables: list[str] = dataclasses.field(default_factory=list)
+    migrations_format: str = PYTHON_MIGRATIONS_FORMAT
+    parallelism: int = 1
+    use_uvloop: bool = False
 
     def to_dict(self) -> dict[str, typing.Any]:
         return {
@@ -30,3 +48,23 @@ class QaspenMigrationsSettings:
 class QaspenMigrationTable(BaseTable):
     version = columns.VarCharColumn(max_length=32)
     created_at = columns.TimestampColumn(database_default="NOW()")
+
+
+class QaspenMigrationChecksumTable(BaseTable):
+    version = columns.VarCharColumn(max_length=32)
+    checksum = columns.VarCharColumn(max_length=64)
+    applied_at = columns.TimestampColumn(database_default="NOW()")
+
+
+class QaspenMigrationOperationTable(BaseTable):
+    # Non-transactional statements of applied migrations,
+    # kept to resume them after an interrupted run.
+    version = columns.VarCharColumn(max_length=32)
+    statement_position = columns.IntegerColumn()
+    statement = columns.TextColumn()
+    cleanup_statement = columns.TextColumn()
+    completion_check_statement = columns.TextColumn()
+    dependency_key = columns.VarCharColumn()
+    state = columns.VarCharColumn(max_length=16)
+    recorded_at = columns.TimestampColumn(database_default="NOW()")
+    updated_at = columns.TimestampColumn(database_default="NOW()")
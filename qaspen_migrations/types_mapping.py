@@ -8,6 +8,8 @@ if typing.TYPE_CHECKING:
     from qaspen.columns.base import Column
 
 
+# Keys are udt names database reports column types with,
+# so local and inspected columns are rendered the same way.
 POSTGRES_TYPE_MAPPING: typing.Final[dict[str, type[Column[typing.Any]]]] = {
     "int2": columns.SmallIntColumn,
     "int4": columns.IntegerColumn,
@@ -15,9 +17,9 @@ POSTGRES_TYPE_MAPPING: typing.Final[dict[str, type[Column[typing.Any]]]] = {
     "numeric": columns.DecimalColumn,
     "float4": columns.RealColumn,
     "float8": columns.DoublePrecisionColumn,
-    "boolean": columns.BooleanColumn,
+    "bool": columns.BooleanColumn,
     "varchar": columns.VarCharColumn,
-    "char": columns.CharColumn,
+    "bpchar": columns.CharColumn,
     "text": columns.TextColumn,
     "date": columns.DateColumn,
     "time": columns.TimeColumn,
@@ -29,3 +31,22 @@ POSTGRES_TYPE_MAPPING: typing.Final[dict[str, type[Column[typing.Any]]]] = {
     "jsonb": columns.JsonbColumn,
     "array": columns.ArrayColumn,
 }
+# Serial columns are integer columns with a sequence default.
+POSTGRES_SERIAL_TYPE_MAPPING: typing.Final[
+    dict[type[Column[typing.Any]], str]
+] = {
+    columns.SmallSerialColumn: "int2",
+    columns.SerialColumn: "int4",
+    columns.BigSerialColumn: "int8",
+}
+POSTGRES_REVERSE_TYPE_MAPPING: typing.Final[
+    dict[type[Column[typing.Any]], str]
+] = {
+    **{
+        column_type: sql_type
+        for sql_type, column_type in POSTGRES_TYPE_MAPPING.items()
+    },
+    # Inspected as `DecimalColumn`, both are the same sql type.
+    columns.NumericColumn: "numeric",
+    **POSTGRES_SERIAL_TYPE_MAPPING,
+}
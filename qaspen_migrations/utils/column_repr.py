@@ -1,5 +1,4 @@
 from __future__ import annotations
-import re
 import typing
 
 from qaspen.columns.base import Column
@@ -18,17 +17,18 @@ def prepare_string_value(column_info_value: typing.Any) -> str:
     return str(column_info_value)
 
 
-def unquote_inner_column(column_repr: str) -> str:
-    pattern = r'(inner_column=)(")([^"]+\([^"]*\))(")'
-    return re.sub(pattern, r"\1\3", column_repr, flags=re.DOTALL)
-
-
 def to_column_repr(
     column_type: type[Column[typing.Any]],
+    inner_column_repr: str | None = None,
     **column_kwargs: typing.Any,
 ) -> str:
-    return unquote_inner_column(
-        f"columns.{column_type.__name__}({to_string_kwargs(**column_kwargs)})",
+    column_arguments: typing.Final = [to_string_kwargs(**column_kwargs)]
+    if inner_column_repr is not None:
+        column_arguments.append(f"inner_column={inner_column_repr}")
+
+    return (
+        f"columns.{column_type.__name__}"
+        f"({', '.join(argument for argument in column_arguments if argument)})"
     )
 
 
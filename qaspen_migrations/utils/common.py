@@ -1,8 +1,14 @@
 from __future__ import annotations
-import asyncio
 import functools
+import hashlib
+import importlib.util
 import os
 import typing
+import urllib.parse
+import warnings
+
+import anyio
+import click
 
 
 if typing.TYPE_CHECKING:
@@ -10,6 +16,8 @@ if typing.TYPE_CHECKING:
 
 T = typing.TypeVar("T")
 
+CHECKSUM_READ_CHUNK_SIZE: typing.Final = 64 * 1024
+
 
 def convert_abs_path_to_relative(path_to_convert: str | None) -> str:
     if path_to_convert is None:
@@ -30,11 +38,63 @@ def convert_path_to_module(file_path: pathlib.Path) -> str:
     return str(file_path).strip(".py").replace("/", ".")
 
 
+def replace_url_database(connection_url: str, database_name: str) -> str:
+    return urllib.parse.urlunsplit(
+        urllib.parse.urlsplit(connection_url)._replace(
+            path=f"/{database_name}",
+        ),
+    )
+
+
+def calculate_file_checksum(file_path: pathlib.Path) -> str:
+    file_hash: typing.Final = hashlib.sha256()
+    with file_path.open("rb") as file_to_hash:
+        for file_chunk in iter(
+            functools.partial(file_to_hash.read, CHECKSUM_READ_CHUNK_SIZE),
+            b"",
+        ):
+            file_hash.update(file_chunk)
+
+    return file_hash.hexdigest()
+
+
+def is_uvloop_installed() -> bool:
+    return importlib.util.find_spec("uvloop") is not None
+
+
+def run_coroutine(
+    coroutine_function: typing.Callable[..., typing.Awaitable[T]],
+    *args: typing.Any,
+    use_uvloop: bool = False,
+    **kwargs: typing.Any,
+) -> T:
+    if use_uvloop and not is_uvloop_installed():
+        warnings.warn(
+            "uvloop is not installed, default event loop is used.",
+            stacklevel=2,
+        )
+        use_uvloop = False
+
+    return anyio.run(
+        functools.partial(coroutine_function, *args, **kwargs),
+        backend="asyncio",
+        backend_options={"use_uvloop": use_uvloop},
+    )
+
+
 def as_coroutine(
-    func: typing.Callable[..., typing.Any],
+    func: typing.Callable[..., typing.Awaitable[typing.Any]],
 ) -> typing.Callable[..., typing.Any]:
     @functools.wraps(func)
     def wrapper(*args: typing.Any, **kwargs: typing.Any) -> None:
-        asyncio.get_event_loop().run_until_complete(func(*args, **kwargs))
+        cli_options: typing.Final = click.get_current_context().find_object(
+            dict,
+        )
+        run_coroutine(
+            func,
+            *args,
+            use_uvloop=bool(cli_options and cli_options.get("use_uvloop")),
+            **kwargs,
+        )
 
     return wrapper
@@ -1,7 +1,12 @@
 from __future__ import annotations
 import dataclasses
+import fnmatch
 import importlib
+import importlib.machinery
+import importlib.util
+import json
 import pathlib
+import sys
 import typing
 
 import toml
@@ -13,12 +18,19 @@ from qaspen_migrations.exceptions import (
     MigrationCorruptionError,
 )
 from qaspen_migrations.migrations.base import BaseMigration
+from qaspen_migrations.migrations.declarative import DeclarativeMigration
 from qaspen_migrations.settings import (
+    JSON_MIGRATIONS_FORMAT,
+    MIGRATION_FILE_SUFFIXES,
     QASPEN_MIGRATIONS_TOML_KEY,
+    TABLE_PATH_WILDCARDS,
+    QaspenMigrationChecksumTable,
+    QaspenMigrationOperationTable,
     QaspenMigrationsSettings,
     QaspenMigrationTable,
 )
 from qaspen_migrations.utils.common import convert_path_to_module
+from qaspen_migrations.utils.tables_index import IndexedModule, TablesIndex
 
 
 T = typing.TypeVar("T")
@@ -64,46 +76,205 @@ def load_engine(
     )
 
 
+def find_tables_module_spec(
+    tables_module_path: str,
+) -> importlib.machinery.ModuleSpec:
+    try:
+        tables_module_spec: typing.Final = importlib.util.find_spec(
+            tables_module_path,
+        )
+    except (ImportError, ValueError) as exception:
+        raise ConfigurationError(
+            f"No tables module {tables_module_path} found.",
+        ) from exception
+    if tables_module_spec is None:
+        raise ConfigurationError(
+            f"No tables module {tables_module_path} found.",
+        )
+
+    return tables_module_spec
+
+
 @dataclasses.dataclass()
 class TableLoader:
     table_paths: list[str]
+    # Directory to keep tables index in, modules without
+    # tables are not imported while their files don't change.
+    migrations_path: str | None = None
     tables: list[type[BaseTable]] = dataclasses.field(
         init=False,
         default_factory=list,
     )
+    # Tables and modification times of every discovered
+    # module, used to reload only modules changed since.
+    modules_tables: dict[str, list[type[BaseTable]]] = dataclasses.field(
+        init=False,
+        default_factory=dict,
+    )
+    modules_mtimes: dict[str, int | None] = dataclasses.field(
+        init=False,
+        default_factory=dict,
+    )
 
+    @staticmethod
     def __load_tables_from_module(
-        self,
-        tables_file_path: str,
+        tables_module_path: str,
     ) -> list[type[BaseTable]]:
-        module_tables: typing.Final[list[type[BaseTable]]] = []
-        tables_module: typing.Final = importlib.import_module(tables_file_path)
-        for module_member in dir(tables_module):
-            tables_module_attribute = getattr(
-                tables_module,
-                module_member,
+        tables_module: typing.Final = importlib.import_module(
+            tables_module_path,
+        )
+        return [
+            tables_module_attribute
+            for tables_module_attribute in vars(tables_module).values()
+            if isinstance(tables_module_attribute, type)
+            and issubclass(tables_module_attribute, BaseTable)
+            and not tables_module_attribute._table_meta.abstract
+        ]
+
+    @staticmethod
+    def __iter_tables_modules(
+        table_path: str,
+    ) -> typing.Iterator[tuple[str, pathlib.Path | None]]:
+        root_module_parts: typing.Final[list[str]] = []
+        for module_part in table_path.split("."):
+            if TABLE_PATH_WILDCARDS.intersection(module_part):
+                break
+            root_module_parts.append(module_part)
+
+        root_module_path: typing.Final = ".".join(root_module_parts)
+        root_module_spec: typing.Final = find_tables_module_spec(
+            root_module_path,
+        )
+        if root_module_spec.submodule_search_locations is None:
+            yield root_module_path, (
+                pathlib.Path(root_module_spec.origin)
+                if root_module_spec.has_location and root_module_spec.origin
+                else None
             )
-            try:
-                if (
-                    issubclass(
-                        tables_module_attribute,
-                        BaseTable,
+            return
+
+        for module_location in root_module_spec.submodule_search_locations:
+            for module_file_path in sorted(
+                pathlib.Path(module_location).rglob("*.py"),
+            ):
+                module_parts = (
+                    module_file_path.relative_to(
+                        module_location,
                     )
-                    and not tables_module_attribute._table_meta.abstract
+                    .with_suffix("")
+                    .parts
+                )
+                if module_parts[-1] == "__init__":
+                    module_parts = module_parts[:-1]
+                if not all(
+                    module_part.isidentifier() for module_part in module_parts
                 ):
-                    module_tables.append(tables_module_attribute)
-            except TypeError:
-                continue
+                    continue
 
-        return module_tables
+                module_path = ".".join((root_module_path, *module_parts))
+                if len(root_module_parts) == len(
+                    table_path.split("."),
+                ) or fnmatch.fnmatchcase(module_path, table_path):
+                    yield module_path, module_file_path
 
     def load_tables(self) -> list[type[BaseTable]]:
-        tables: typing.Final = []
-        for model_path in self.table_paths:
-            tables.extend(self.__load_tables_from_module(model_path))
+        tables_index: typing.Final = (
+            TablesIndex(self.migrations_path)
+            if self.migrations_path is not None
+            else None
+        )
+        indexed_modules: typing.Final = (
+            tables_index.load_index() if tables_index is not None else {}
+        )
+        refreshed_modules: typing.Final[dict[str, IndexedModule]] = {}
+        for table_path in self.table_paths:
+            for module_path, module_file_path in self.__iter_tables_modules(
+                table_path,
+            ):
+                self.modules_mtimes[module_path] = (
+                    module_file_path.stat().st_mtime_ns
+                    if module_file_path is not None
+                    else None
+                )
+                indexed_module = indexed_modules.get(module_path)
+                if indexed_module is not None and module_file_path:
+                    indexed_module = indexed_module.refresh(module_file_path)
+                if (
+                    indexed_module is not None
+                    and not indexed_module.table_names
+                ):
+                    refreshed_modules[module_path] = indexed_module
+                    self.modules_tables[module_path] = []
+                    continue
+
+                module_tables = self.__load_tables_from_module(module_path)
+                self.modules_tables[module_path] = module_tables
+                if module_file_path is not None:
+                    refreshed_modules[
+                        module_path
+                    ] = IndexedModule.from_module_file(
+                        module_file_path,
+                        [table.__name__ for table in module_tables],
+                    )
+
+        if tables_index is not None:
+            tables_index.save_index(refreshed_modules)
 
-        tables.append(QaspenMigrationTable)
-        return tables
+        return self.collect_tables()
+
+    def reload_tables(self) -> list[type[BaseTable]] | None:
+        # Only modules changed since they were loaded last time
+        # are imported again, `None` means nothing has changed.
+        reloaded_modules_tables: typing.Final[
+            dict[str, list[type[BaseTable]]]
+        ] = {}
+        for table_path in self.table_paths:
+            for module_path, module_file_path in self.__iter_tables_modules(
+                table_path,
+            ):
+                module_mtime_ns = (
+                    module_file_path.stat().st_mtime_ns
+                    if module_file_path is not None
+                    else None
+                )
+                if (
+                    module_path in self.modules_tables
+                    and self.modules_mtimes.get(module_path) == module_mtime_ns
+                ):
+                    reloaded_modules_tables[module_path] = self.modules_tables[
+                        module_path
+                    ]
+                    continue
+
+                # Broken module is not imported again
+                # until it is changed once more.
+                self.modules_mtimes[module_path] = module_mtime_ns
+                loaded_module = sys.modules.get(module_path)
+                if loaded_module is not None:
+                    importlib.reload(loaded_module)
+                reloaded_modules_tables[
+                    module_path
+                ] = self.__load_tables_from_module(module_path)
+
+        if reloaded_modules_tables == self.modules_tables:
+            return None
+
+        self.modules_tables = reloaded_modules_tables
+        return self.collect_tables()
+
+    def collect_tables(self) -> list[type[BaseTable]]:
+        # Dict keeps discovery order and drops tables matched
+        # by several table paths or re-exported by other modules.
+        return [
+            *dict.fromkeys(
+                table
+                for module_tables in self.modules_tables.values()
+                for table in module_tables
+            ),
+            QaspenMigrationTable,
+            QaspenMigrationChecksumTable,
+            QaspenMigrationOperationTable,
+        ]
 
 
 @dataclasses.dataclass
@@ -134,21 +305,63 @@ class MigrationLoader:
 
         return typing.cast(BaseMigration, migration_instace)
 
-    def load_migrations(self) -> list[BaseMigration]:
-        loaded_migrations: typing.Final = []
+    def parse_declarative_migration(
+        self,
+        migration_file_path: pathlib.Path,
+    ) -> BaseMigration:
+        try:
+            migration_document: typing.Final = json.loads(
+                migration_file_path.read_bytes(),
+            )
+        except ValueError as exc:
+            raise MigrationCorruptionError(
+                f"Migration document {migration_file_path} is not valid JSON.",
+            ) from exc
+
+        return DeclarativeMigration(self.engine_type, migration_document)
+
+    def load_migration(
+        self,
+        migration_file_path: pathlib.Path,
+    ) -> BaseMigration:
+        if (
+            migration_file_path.suffix
+            == MIGRATION_FILE_SUFFIXES[JSON_MIGRATIONS_FORMAT]
+        ):
+            migration = self.parse_declarative_migration(migration_file_path)
+        else:
+            migration = self.parse_migration(
+                convert_path_to_module(
+                    migration_file_path,
+                ),
+            )
+
+        migration.migration_path = migration_file_path
+        return migration
+
+    @staticmethod
+    def version_from_migration_path(migration_file_path: pathlib.Path) -> str:
+        return migration_file_path.stem.rsplit("_", 1)[-1]
+
+    def iter_migration_paths(self) -> typing.Iterator[pathlib.Path]:
         base_migrations_path: typing.Final = pathlib.Path(self.migrations_path)
         for migration_file_path in base_migrations_path.glob(
             "*",
         ):
             if migration_file_path.name.startswith("__"):
                 continue
+            # Migrations directory can also hold bulk load data files.
+            if (
+                not migration_file_path.is_file()
+                or migration_file_path.suffix
+                not in MIGRATION_FILE_SUFFIXES.values()
+            ):
+                continue
 
-            loaded_migrations.append(
-                self.parse_migration(
-                    convert_path_to_module(
-                        migration_file_path,
-                    ),
-                ),
-            )
+            yield migration_file_path
 
-        return loaded_migrations
+    def load_migrations(self) -> list[BaseMigration]:
+        return [
+            self.load_migration(migration_file_path)
+            for migration_file_path in self.iter_migration_paths()
+        ]
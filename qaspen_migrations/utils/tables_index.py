@@ -0,0 +1,97 @@
+from __future__ import annotations
+import contextlib
+import dataclasses
+import json
+import pathlib
+import typing
+
+from qaspen_migrations.settings import TABLES_INDEX_FILE
+from qaspen_migrations.utils.common import calculate_file_checksum
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class IndexedModule:
+    mtime_ns: int
+    checksum: str
+    table_names: list[str]
+
+    def to_json_dict(self) -> dict[str, typing.Any]:
+        return {
+            field.name: getattr(self, field.name)
+            for field in dataclasses.fields(self)
+        }
+
+    @classmethod
+    def from_json_dict(
+        cls: type[IndexedModule],
+        indexed_data: dict[str, typing.Any],
+    ) -> IndexedModule | None:
+        try:
+            return cls(**indexed_data)
+        except TypeError:
+            return None
+
+    @classmethod
+    def from_module_file(
+        cls: type[IndexedModule],
+        module_path: pathlib.Path,
+        table_names: list[str],
+    ) -> IndexedModule:
+        return cls(
+            mtime_ns=module_path.stat().st_mtime_ns,
+            checksum=calculate_file_checksum(module_path),
+            table_names=table_names,
+        )
+
+    def refresh(self, module_path: pathlib.Path) -> IndexedModule | None:
+        module_mtime_ns: typing.Final = module_path.stat().st_mtime_ns
+        if module_mtime_ns == self.mtime_ns:
+            return self
+
+        # File can be touched without changes, e.g. by a checkout,
+        # then only its hash tells whether it must be imported again.
+        if calculate_file_checksum(module_path) != self.checksum:
+            return None
+
+        return dataclasses.replace(self, mtime_ns=module_mtime_ns)
+
+
+@dataclasses.dataclass
+class TablesIndex:
+    migrations_path: str
+
+    @property
+    def index_path(self) -> pathlib.Path:
+        return pathlib.Path(self.migrations_path) / TABLES_INDEX_FILE
+
+    def load_index(self) -> dict[str, IndexedModule]:
+        if not self.index_path.exists():
+            return {}
+
+        try:
+            index_document: typing.Final = json.loads(
+                self.index_path.read_bytes(),
+            )
+        except ValueError:
+            return {}
+
+        tables_index: typing.Final = {}
+        for module_name, indexed_data in index_document.items():
+            indexed_module = IndexedModule.from_json_dict(indexed_data)
+            if indexed_module is not None:
+                tables_index[module_name] = indexed_module
+
+        return tables_index
+
+    def save_index(self, tables_index: dict[str, IndexedModule]) -> None:
+        # Index is only a speed up, read-only migrations
+        # directory must not break tables loading.
+        with contextlib.suppress(OSError):
+            self.index_path.write_text(
+                json.dumps(
+                    {
+                        module_name: indexed_module.to_json_dict()
+                        for module_name, indexed_module in tables_index.items()
+                    },
+                ),
+            )
@@ -0,0 +1,69 @@
+from __future__ import annotations
+import json
+import typing
+
+import pytest
+
+from qaspen_migrations.exceptions import MigrationCorruptionError
+from qaspen_migrations.migrations.compiler import (
+    CompiledMigration,
+    CompiledStatement,
+    MigrationsCompiler,
+    calculate_migration_checksum,
+)
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+def test_path_checksum_includes_compiled_copy_sources(
+    tmp_path: pathlib.Path,
+) -> None:
+    # Migration module can't be imported, checksum must not need it.
+    migration_path: typing.Final = tmp_path / "2024-01-01_00:00:00_seed.py"
+    migration_path.write_text("raise RuntimeError")
+    (tmp_path / "users.csv").write_text("id\n1\n")
+    migrations_compiler: typing.Final = MigrationsCompiler(str(tmp_path))
+    migrations_compiler.compiled_migrations_path.mkdir()
+    migrations_compiler.compiled_migration_path(migration_path).write_text(
+        json.dumps(
+            CompiledMigration(
+                version="seed",
+                checksum=None,
+                migrate_statements=[
+                    CompiledStatement(
+                        "COPY users FROM STDIN",
+                        copy_source_path="users.csv",
+                    ),
+                ],
+                rollback_statements=[],
+            ).to_json_dict(),
+        ),
+    )
+
+    path_checksum: typing.Final = migrations_compiler.calculate_path_checksum(
+        migration_path,
+    )
+    assert path_checksum == calculate_migration_checksum(
+        migration_path,
+        ["users.csv"],
+    )
+
+    (tmp_path / "users.csv").write_text("id\n2\n")
+    assert (
+        migrations_compiler.calculate_path_checksum(migration_path)
+        != path_checksum
+    )
+
+
+def test_path_checksum_requires_compiled_migration(
+    tmp_path: pathlib.Path,
+) -> None:
+    migration_path: typing.Final = tmp_path / "2024-01-01_00:00:00_seed.py"
+    migration_path.write_text("raise RuntimeError")
+
+    with pytest.raises(MigrationCorruptionError):
+        MigrationsCompiler(str(tmp_path)).calculate_path_checksum(
+            migration_path,
+        )
@@ -0,0 +1,179 @@
+from __future__ import annotations
+import dataclasses
+import typing
+
+import pytest
+from qaspen import columns
+
+from qaspen_migrations.ddl.base import CopyFormatEnum, TypeChangePathEnum
+from qaspen_migrations.ddl.postgres import AlterColumn, CopyFrom, CreateIndex
+from qaspen_migrations.schema import ColumnInfo
+
+
+if typing.TYPE_CHECKING:
+    from qaspen.columns.base import Column
+
+
+def make_column_info(
+    column_type: type[Column[typing.Any]],
+    **column_kwargs: typing.Any,
+) -> ColumnInfo:
+    return dataclasses.replace(
+        ColumnInfo(
+            main_column_type=column_type,
+            inner_column_type=None,
+            db_column_name="value",
+            is_null=True,
+            database_default=None,
+            max_length=None,
+            precision=None,
+            scale=None,
+        ),
+        **column_kwargs,
+    )
+
+
+@pytest.mark.parametrize(
+    ("from_column_info", "to_column_info", "type_change_path"),
+    [
+        (
+            make_column_info(columns.VarCharColumn, max_length=20),
+            make_column_info(columns.VarCharColumn, max_length=50),
+            TypeChangePathEnum.METADATA_ONLY,
+        ),
+        (
+            make_column_info(columns.VarCharColumn, max_length=20),
+            make_column_info(columns.TextColumn),
+            TypeChangePathEnum.METADATA_ONLY,
+        ),
+        (
+            make_column_info(columns.VarCharColumn, max_length=50),
+            make_column_info(columns.VarCharColumn, max_length=20),
+            TypeChangePathEnum.REWRITE,
+        ),
+        (
+            make_column_info(columns.IntegerColumn),
+            make_column_info(columns.BigIntColumn),
+            TypeChangePathEnum.REWRITE,
+        ),
+        (
+            make_column_info(columns.NumericColumn, precision=10, scale=2),
+            make_column_info(columns.NumericColumn, precision=12, scale=2),
+            TypeChangePathEnum.METADATA_ONLY,
+        ),
+        (
+            make_column_info(columns.NumericColumn, precision=10, scale=2),
+            make_column_info(columns.NumericColumn, precision=12, scale=4),
+            TypeChangePathEnum.REWRITE,
+        ),
+        (
+            make_column_info(columns.IntegerColumn),
+            make_column_info(columns.IntegerColumn, is_null=False),
+            None,
+        ),
+    ],
+)
+def test_alter_column_type_change_path(
+    from_column_info: ColumnInfo,
+    to_column_info: ColumnInfo,
+    type_change_path: TypeChangePathEnum | None,
+) -> None:
+    assert (
+        AlterColumn(
+            "public.values",
+            from_column_info,
+            to_column_info,
+        ).type_change_path
+        == type_change_path
+    )
+
+
+@pytest.mark.parametrize(
+    ("from_column_info", "to_column_info", "alter_data_type"),
+    [
+        (
+            make_column_info(columns.VarCharColumn, max_length=50),
+            make_column_info(columns.VarCharColumn, max_length=20),
+            "ALTER COLUMN value TYPE VARCHAR(20)",
+        ),
+        (
+            make_column_info(
+                columns.ArrayColumn,
+                inner_column_type=columns.VarCharColumn,
+                max_length=50,
+            ),
+            make_column_info(
+                columns.ArrayColumn,
+                inner_column_type=columns.VarCharColumn,
+                max_length=20,
+            ),
+            "ALTER COLUMN value TYPE VARCHAR(20)[]",
+        ),
+        (
+            make_column_info(columns.IntegerColumn),
+            make_column_info(columns.TextColumn),
+            "ALTER COLUMN value TYPE TEXT USING value::TEXT",
+        ),
+    ],
+)
+def test_alter_column_type_cast(
+    from_column_info: ColumnInfo,
+    to_column_info: ColumnInfo,
+    alter_data_type: str,
+) -> None:
+    assert (
+        AlterColumn(
+            "public.values",
+            from_column_info,
+            to_column_info,
+        )
+        .to_database_expression()
+        .endswith(f"{alter_data_type};")
+    )
+
+
+@pytest.mark.parametrize(
+    ("source_format", "database_expression"),
+    [
+        (
+            CopyFormatEnum.CSV,
+            "COPY public.values (id, name) "
+            "FROM STDIN WITH (FORMAT csv, HEADER true);",
+        ),
+        (
+            CopyFormatEnum.BINARY,
+            "COPY public.values (id, name) FROM STDIN WITH (FORMAT binary);",
+        ),
+    ],
+)
+def test_copy_from_database_expression(
+    source_format: CopyFormatEnum,
+    database_expression: str,
+) -> None:
+    assert (
+        CopyFrom(
+            "public.values",
+            "values.csv",
+            ["id", "name"],
+            source_format,
+        ).to_database_expression()
+        == database_expression
+    )
+
+
+def test_create_index_cleanup_expression() -> None:
+    create_index: typing.Final = CreateIndex(
+        "public.values",
+        "values_name_key",
+        ["name"],
+        is_unique=True,
+    )
+    assert create_index.to_database_expression() == (
+        "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS "
+        "values_name_key ON public.values (name);"
+    )
+    assert create_index.with_table_schema(
+        "tenant",
+    ).to_cleanup_expression() == (
+        "DROP INDEX CONCURRENTLY IF EXISTS tenant.values_name_key;"
+    )
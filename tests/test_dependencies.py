@@ -0,0 +1,21 @@
+from qaspen_migrations.migrations.compiler import CompiledStatement
+from qaspen_migrations.migrations.dependencies import (
+    group_independent_statements,
+)
+
+
+def test_group_independent_statements() -> None:
+    create_users = CompiledStatement("CREATE users", "public.users")
+    create_items = CompiledStatement("CREATE items", "public.items")
+    alter_users = CompiledStatement("ALTER users", "public.users")
+    barrier = CompiledStatement("SELECT 1")
+    alter_items = CompiledStatement("ALTER items", "public.items")
+
+    assert group_independent_statements(
+        [create_users, create_items, alter_users, barrier, alter_items],
+    ) == [
+        [create_users, create_items],
+        [alter_users],
+        [barrier],
+        [alter_items],
+    ]
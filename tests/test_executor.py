@@ -0,0 +1,80 @@
+from __future__ import annotations
+import dataclasses
+import typing
+
+import pytest
+from qaspen_psycopg.engine import PsycopgEngine
+
+from qaspen_migrations.ddl.postgres import CreateIndex
+from qaspen_migrations.migrations.compiler import (
+    MigrationsCompiler,
+    VersionedStatement,
+)
+from qaspen_migrations.migrations.executor import MigrationsExecutor
+from qaspen_migrations.migrations.store import OperationStateEnum
+
+
+pytestmark = [pytest.mark.anyio]
+
+
+@dataclasses.dataclass
+class FakeCursor:
+    row: tuple[typing.Any, ...] | None
+
+    async def fetchone(self) -> tuple[typing.Any, ...] | None:
+        return self.row
+
+
+@dataclasses.dataclass
+class FakeConnection:
+    is_index_valid: bool
+    executed_statements: list[str] = dataclasses.field(default_factory=list)
+
+    async def execute(
+        self,
+        statement: str,
+        parameters: list[typing.Any] | None = None,
+    ) -> FakeCursor:
+        self.executed_statements.append(statement)
+        return FakeCursor((self.is_index_valid,))
+
+
+def make_index_operation() -> VersionedStatement:
+    return VersionedStatement(
+        "index",
+        MigrationsCompiler.compile_ddl_element(
+            CreateIndex("public.users", "users_name_idx", ["name"]),
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    ("is_index_valid", "is_index_rebuilt"),
+    [(True, False), (False, True)],
+)
+async def test_resume_completed_index_build(
+    is_index_valid: bool,
+    is_index_rebuilt: bool,
+) -> None:
+    # Index was built, but the run was interrupted before it was recorded.
+    index_operation: typing.Final = make_index_operation()
+    connection: typing.Final = FakeConnection(is_index_valid)
+
+    await MigrationsExecutor(
+        PsycopgEngine("postgresql://postgres@localhost/postgres"),
+    ).resume_operation(
+        connection,
+        index_operation,
+        OperationStateEnum.RUNNING,
+    )
+
+    compiled_statement: typing.Final = index_operation.compiled_statement
+    assert connection.executed_statements[0] == (
+        compiled_statement.completion_check_statement
+    )
+    assert (
+        compiled_statement.statement in connection.executed_statements
+    ) is is_index_rebuilt
+    assert (
+        compiled_statement.cleanup_statement in connection.executed_statements
+    ) is is_index_rebuilt
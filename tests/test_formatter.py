@@ -0,0 +1,70 @@
+from qaspen import columns
+
+from qaspen_migrations.migrations.formatter import MigrationFormatter
+from qaspen_migrations.operations.base import (
+    AddColumnOperation,
+    DropTableOperation,
+)
+from qaspen_migrations.schema import ColumnInfo
+
+
+EXPECTED_MIGRATION: str = "\n".join(  # noqa: FLY002
+    [
+        "from __future__ import annotations",
+        "import typing",
+        "",
+        "from qaspen import columns",
+        "",
+        "from qaspen_migrations.migrations.base import BaseMigration",
+        "",
+        "if typing.TYPE_CHECKING:",
+        "    from qaspen_migrations.ddl.base import BaseDDLElement",
+        "",
+        "",
+        "class Migration(BaseMigration):",
+        '    version: str = "abcdef0123"',
+        '    previous_version: str | None = "0123abcdef"',
+        '    created_datetime: str = "2024-01-02_03:04:05"',
+        "",
+        "",
+        "    def migrate(self) -> list[BaseDDLElement]:",
+        "        return [",
+        "            self.operations.add_column(",
+        '            "public.users",',
+        '            columns.ArrayColumn(db_column_name="tags", '
+        "is_null=False, inner_column=columns.VarCharColumn(max_length=20)),",
+        "        ),",
+        "            ",
+        "        ]",
+        "",
+        "    def rollback(self) -> list[BaseDDLElement]:",
+        "        return [",
+        '            self.operations.drop_table("public.users"),',
+        "            ",
+        "        ]",
+    ],
+)
+
+
+def test_migration_formatter_output() -> None:
+    column_info = ColumnInfo(
+        main_column_type=columns.ArrayColumn,
+        inner_column_type=columns.VarCharColumn,
+        db_column_name="tags",
+        is_null=False,
+        database_default=None,
+        max_length=20,
+        precision=None,
+        scale=None,
+    )
+    migration_formatter = MigrationFormatter(
+        version="abcdef0123",
+        previous_version="0123abcdef",
+        created_datetime="2024-01-02_03:04:05",
+        to_migrate_operations=[
+            AddColumnOperation("public.users", column_info),
+        ],
+        to_rollback_operations=[DropTableOperation("public.users")],
+    )
+
+    assert "".join(migration_formatter.iter_chunks()) == EXPECTED_MIGRATION
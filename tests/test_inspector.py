@@ -0,0 +1,211 @@
+from __future__ import annotations
+import contextlib
+import dataclasses
+import hashlib
+import typing
+
+import pytest
+from qaspen import BaseTable, columns
+from qaspen_psycopg.engine import PsycopgEngine
+
+from qaspen_migrations.inspector.postgres import (
+    AsyncpgPostgresInspector,
+    PostgresInspector,
+)
+from qaspen_migrations.schema import ColumnInfo
+
+
+if typing.TYPE_CHECKING:
+    from qaspen.columns.base import Column
+
+
+class User(BaseTable, table_name="users"):
+    name = columns.VarCharColumn(max_length=20)
+
+
+class Item(BaseTable, table_name="items", table_schema="shop"):
+    price = columns.NumericColumn(precision=10, scale=2)
+
+
+class Invoice(BaseTable, table_name="invoices"):
+    id = columns.SerialColumn()
+    total = columns.NumericColumn(precision=10, scale=2)
+
+
+@dataclasses.dataclass
+class FakeAsyncpgConnection:
+    column_rows: list[dict[str, typing.Any]]
+    cursor_arguments: list[typing.Any] = dataclasses.field(
+        default_factory=list,
+    )
+
+    @contextlib.asynccontextmanager
+    async def transaction(self) -> typing.AsyncIterator[None]:
+        yield
+
+    async def cursor(
+        self,
+        query: str,
+        *arguments: typing.Any,
+        prefetch: int,
+    ) -> typing.AsyncIterator[dict[str, typing.Any]]:
+        self.cursor_arguments.extend(arguments)
+        for column_row in self.column_rows:
+            yield column_row
+
+
+@dataclasses.dataclass
+class FakeAsyncpgEngine:
+    connection: FakeAsyncpgConnection
+
+    async def create_connection_pool(self) -> FakeAsyncpgEngine:
+        return self
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> typing.AsyncIterator[FakeAsyncpgConnection]:
+        yield self.connection
+
+    async def stop_connection_pool(self) -> None:
+        pass
+
+
+def make_inspector() -> PostgresInspector:
+    return PostgresInspector(
+        PsycopgEngine("postgresql://postgres@localhost/postgres"),
+        [],
+    )
+
+
+@pytest.mark.parametrize(
+    ("column_type", "udt_name"),
+    [
+        (columns.BooleanColumn, "bool"),
+        (columns.CharColumn, "bpchar"),
+        (columns.IntegerColumn, "int4"),
+    ],
+)
+def test_fingerprint_row_uses_udt_names(
+    column_type: type[Column[typing.Any]],
+    udt_name: str,
+) -> None:
+    postgres_inspector: typing.Final = make_inspector()
+    inspected_column_info: typing.Final = (
+        postgres_inspector.database_column_to_column_info(
+            {
+                "db_column_name": "value",
+                "sql_type": udt_name,
+                "is_null": "YES",
+            },
+        )
+    )
+    local_column_info: typing.Final = ColumnInfo(
+        main_column_type=column_type,
+        inner_column_type=None,
+        db_column_name="value",
+        is_null=True,
+        database_default=None,
+        max_length=None,
+        precision=None,
+        scale=None,
+    )
+
+    assert inspected_column_info.main_column_type is column_type
+    assert (
+        postgres_inspector.column_info_to_fingerprint_row(
+            local_column_info,
+        )
+        == f"value|{udt_name}|t||||"
+    )
+
+
+def test_serial_and_numeric_columns_fingerprint() -> None:
+    # Rows fingerprint query renders for `invoices` created as
+    # `id SERIAL PRIMARY KEY, total NUMERIC(10, 2)`.
+    database_fingerprint_rows: typing.Final = (
+        "id|int4|f|nextval|||",
+        "total|numeric|t|||10|2",
+    )
+
+    assert PostgresInspector(
+        PsycopgEngine("postgresql://postgres@localhost/postgres"),
+        [Invoice],
+    ).fingerprint_local_state() == {
+        "public.invoices": hashlib.md5(
+            "\n".join(database_fingerprint_rows).encode(),
+            usedforsecurity=False,
+        ).hexdigest(),
+    }
+
+
+@pytest.mark.anyio()
+async def test_asyncpg_inspector_unnests_requested_tables() -> None:
+    connection: typing.Final = FakeAsyncpgConnection(
+        [
+            {
+                "table_position": 0,
+                "db_column_name": "name",
+                "sql_type": "varchar",
+                "is_null": "YES",
+                "database_default": None,
+                "precision": None,
+                "scale": None,
+                "max_length": 20,
+            },
+            {
+                "table_position": 1,
+                "db_column_name": "price",
+                "sql_type": "numeric",
+                "is_null": "NO",
+                "database_default": None,
+                "precision": 10,
+                "scale": 2,
+                "max_length": None,
+            },
+        ],
+    )
+
+    database_dump: typing.Final = await AsyncpgPostgresInspector(
+        FakeAsyncpgEngine(connection),  # type: ignore[arg-type]
+        [User, Item],
+    ).inspect_database()
+
+    assert connection.cursor_arguments == [
+        [0, 1],
+        ["public", "shop"],
+        ["users", "items"],
+    ]
+    assert [
+        (table_dump.table, table_dump.table_columns)
+        for table_dump in database_dump
+    ] == [
+        (
+            User,
+            {
+                ColumnInfo(
+                    main_column_type=columns.VarCharColumn,
+                    inner_column_type=None,
+                    db_column_name="name",
+                    is_null=True,
+                    database_default=None,
+                    max_length=20,
+                    precision=None,
+                    scale=None,
+                ),
+            },
+        ),
+        (
+            Item,
+            {
+                ColumnInfo(
+                    main_column_type=columns.DecimalColumn,
+                    inner_column_type=None,
+                    db_column_name="price",
+                    is_null=False,
+                    database_default=None,
+                    max_length=None,
+                    precision=10,
+                    scale=2,
+                ),
+            },
+        ),
+    ]
@@ -0,0 +1,55 @@
+from __future__ import annotations
+import typing
+
+from qaspen_migrations.settings import (
+    QaspenMigrationChecksumTable,
+    QaspenMigrationOperationTable,
+    QaspenMigrationTable,
+)
+from qaspen_migrations.utils.loaders import TableLoader
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+    import pytest
+
+
+USERS_MODULE: typing.Final = """from qaspen import BaseTable, columns
+
+
+class User(BaseTable, table_name="users"):
+    name = columns.VarCharColumn(max_length=20)
+"""
+
+
+def test_load_re_exported_tables(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    tables_package = tmp_path / "re_exported_tables"
+    tables_package.mkdir()
+    (tables_package / "__init__.py").write_text("")
+    (tables_package / "users.py").write_text(USERS_MODULE)
+    (tables_package / "tables.py").write_text(
+        "from re_exported_tables.users import User  # noqa: F401\n",
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    from re_exported_tables.users import User  # type: ignore[import-not-found]
+
+    service_tables = [
+        QaspenMigrationTable,
+        QaspenMigrationChecksumTable,
+        QaspenMigrationOperationTable,
+    ]
+    assert TableLoader(["re_exported_tables.tables"]).load_tables() == [
+        User,
+        *service_tables,
+    ]
+    # Table found both where it's defined and where
+    # it's re-exported is loaded only once.
+    assert TableLoader(["re_exported_tables"]).load_tables() == [
+        User,
+        *service_tables,
+    ]
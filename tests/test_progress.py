@@ -0,0 +1,83 @@
+from __future__ import annotations
+import dataclasses
+import datetime
+import typing
+
+import pytest
+
+from qaspen_migrations.migrations.progress import ProgressMonitor
+
+
+pytestmark = [pytest.mark.anyio]
+
+
+QUERY_START: typing.Final = datetime.datetime(
+    2024,
+    1,
+    1,
+    tzinfo=datetime.timezone.utc,
+)
+SCAN_PHASE: typing.Final = "building index: scanning table"
+SORT_PHASE: typing.Final = "building index: loading tuples in tree"
+
+
+@dataclasses.dataclass
+class FakeCursor:
+    rows: list[tuple[typing.Any, ...]]
+
+    async def fetchall(self) -> list[tuple[typing.Any, ...]]:
+        return self.rows
+
+
+@dataclasses.dataclass
+class FakeConnection:
+    polled_rows: list[tuple[typing.Any, ...]] = dataclasses.field(
+        default_factory=list,
+    )
+
+    async def execute(
+        self,
+        statement: str,
+        parameters: list[typing.Any],
+    ) -> FakeCursor:
+        return FakeCursor(self.polled_rows)
+
+
+async def test_phase_finish_is_estimated_within_phase() -> None:
+    progress_monitor: typing.Final = ProgressMonitor(
+        None,  # type: ignore[arg-type]
+        progress_callback=lambda _: None,
+    )
+    progress_monitor.track(1, "index")
+    connection: typing.Final = FakeConnection()
+
+    async def poll_estimated_finish(
+        polled_seconds: int,
+        phase: str,
+        blocks_done: int,
+        blocks_total: int,
+    ) -> datetime.datetime | None:
+        connection.polled_rows = [
+            (
+                1,
+                "CREATE INDEX CONCURRENTLY ...",
+                QUERY_START,
+                QUERY_START + datetime.timedelta(seconds=polled_seconds),
+                phase,
+                blocks_done,
+                blocks_total,
+            ),
+        ]
+        (statement_progress,) = await progress_monitor.poll(connection)
+        return statement_progress.estimated_phase_finish
+
+    # Phase rate is unknown until it's polled twice.
+    assert await poll_estimated_finish(100, SCAN_PHASE, 50, 100) is None
+    assert await poll_estimated_finish(110, SCAN_PHASE, 60, 100) == (
+        QUERY_START + datetime.timedelta(seconds=150)
+    )
+    # Rate of the previous phase doesn't carry over.
+    assert await poll_estimated_finish(120, SORT_PHASE, 10, 200) is None
+    assert await poll_estimated_finish(130, SORT_PHASE, 30, 200) == (
+        QUERY_START + datetime.timedelta(seconds=215)
+    )
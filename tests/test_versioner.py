@@ -0,0 +1,96 @@
+from __future__ import annotations
+import dataclasses
+import typing
+
+import pytest
+
+from qaspen_migrations.exceptions import MigrationVersionError
+from qaspen_migrations.migrations.versioner import MigrationsVersioner
+
+
+if typing.TYPE_CHECKING:
+    from qaspen_migrations.ddl.base import BaseDDLElement
+
+
+@dataclasses.dataclass
+class FakeMigration:
+    version: str
+    previous_version: str | None
+    created_datetime: str
+    merged_versions: tuple[str, ...] = ()
+
+    def migrate(self) -> list[BaseDDLElement]:
+        return []
+
+    def rollback(self) -> list[BaseDDLElement]:
+        return []
+
+
+@dataclasses.dataclass
+class FakeMigrationLoader:
+    migrations: list[FakeMigration]
+
+    def load_migrations(self) -> list[FakeMigration]:
+        return self.migrations
+
+
+def make_versioner(migrations: list[FakeMigration]) -> MigrationsVersioner:
+    return MigrationsVersioner(
+        FakeMigrationLoader(migrations),  # type: ignore[arg-type]
+    )
+
+
+def test_branches_must_be_merged() -> None:
+    migrations_versioner = make_versioner(
+        [
+            FakeMigration("root", None, "2024-01-01_00:00:00"),
+            FakeMigration("late", "root", "2024-01-03_00:00:00"),
+            FakeMigration("early", "root", "2024-01-02_00:00:00"),
+        ],
+    )
+
+    assert migrations_versioner.get_heads_versions() == ["early", "late"]
+    with pytest.raises(MigrationVersionError):
+        migrations_versioner.get_latest_local_migration_version()
+
+
+def make_merged_versioner() -> MigrationsVersioner:
+    return make_versioner(
+        [
+            FakeMigration(
+                "merge",
+                "late",
+                "2024-01-04_00:00:00",
+                merged_versions=("early",),
+            ),
+            FakeMigration("late", "root", "2024-01-03_00:00:00"),
+            FakeMigration("early", "root", "2024-01-02_00:00:00"),
+            FakeMigration("root", None, "2024-01-01_00:00:00"),
+        ],
+    )
+
+
+def test_pending_migrations_skip_applied_branches() -> None:
+    # Merge failed after both branches were applied,
+    # version points to the branch applied last.
+    migrations_versioner = make_merged_versioner()
+
+    assert [
+        migration.version
+        for migration in migrations_versioner.get_migrations_after_version(
+            "late",
+            {"root", "early", "late"},
+        )
+    ] == ["merge"]
+
+
+def test_rollback_migrations_are_graph_difference() -> None:
+    migrations_versioner = make_merged_versioner()
+
+    assert [
+        migration.version
+        for migration in migrations_versioner.get_migrations_to_rollback(
+            "merge",
+            "early",
+        )
+    ] == ["merge", "late"]
@@ -0,0 +1,92 @@
+from __future__ import annotations
+import asyncio
+import dataclasses
+import typing
+
+import pytest
+
+from qaspen_migrations.migrations.watchdog import (
+    STATE_CHANGE_WAIT_START,
+    LockWatchdog,
+)
+from qaspen_migrations.migrations.watchers import BaseBackendsWatcher
+
+
+pytestmark = [pytest.mark.anyio]
+
+
+@dataclasses.dataclass
+class FakeCursor:
+    rows: list[tuple[typing.Any, ...]]
+
+    async def fetchone(self) -> tuple[typing.Any, ...]:
+        return self.rows[0]
+
+    async def fetchall(self) -> list[tuple[typing.Any, ...]]:
+        return self.rows
+
+
+@dataclasses.dataclass
+class FakeConnection:
+    server_version: int
+    executed_statements: list[str] = dataclasses.field(default_factory=list)
+
+    async def __aenter__(self) -> FakeConnection:
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        pass
+
+    async def set_autocommit(self, autocommit: bool) -> None:
+        pass
+
+    async def execute(
+        self,
+        statement: str,
+        parameters: list[typing.Any] | None = None,
+    ) -> FakeCursor:
+        self.executed_statements.append(statement)
+        return FakeCursor([(self.server_version,)] if not parameters else [])
+
+
+@dataclasses.dataclass
+class FakeEngine:
+    fake_connection: FakeConnection
+
+    async def connection(self) -> FakeConnection:
+        return self.fake_connection
+
+
+@dataclasses.dataclass
+class BrokenWatcher(BaseBackendsWatcher):
+    async def inspect_backends(self, connection: typing.Any) -> None:
+        raise RuntimeError("Backends can't be inspected.")
+
+
+async def test_failed_watcher_cancels_watched_task() -> None:
+    broken_watcher: typing.Final = BrokenWatcher(
+        FakeEngine(FakeConnection(160000)),  # type: ignore[arg-type]
+        poll_interval=0,
+    )
+    broken_watcher.track(1, "version")
+
+    with pytest.raises(RuntimeError, match="can't be inspected"):
+        async with broken_watcher.watching():
+            await asyncio.sleep(60)
+
+
+async def test_watchdog_falls_back_to_state_change() -> None:
+    # `pg_locks.waitstart` is unavailable before PostgreSQL 14.
+    connection: typing.Final = FakeConnection(130000)
+    lock_watchdog: typing.Final = LockWatchdog(
+        FakeEngine(connection),  # type: ignore[arg-type]
+        poll_interval=0,
+        max_blocked_sessions=1,
+    )
+    lock_watchdog.track(1, "version")
+
+    async with lock_watchdog.watching():
+        await asyncio.sleep(0.01)
+
+    assert STATE_CHANGE_WAIT_START in connection.executed_statements[-1]
+    assert "waitstart" not in connection.executed_statements[-1]